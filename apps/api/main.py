@@ -1,5 +1,10 @@
 # apps/api/main.py
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+from core import metrics
 
 app = FastAPI(title="Feedback API")
 
@@ -7,10 +12,46 @@ app = FastAPI(title="Feedback API")
 def health():
     return {"ok": True}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus 스크레이프용. METRICS_ENABLED=false면 HELP/TYPE 줄만 나온다."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def _route_label(request: Request) -> str:
+    """
+    경로 파라미터별로 시계열이 늘어나지 않도록 실제 URL 대신 매칭된 라우트 템플릿을 라벨로 사용
+    (/search/similar/42 → /search/similar/{pg_id}). 매칭되지 않은 경로(404)는 하나로 묶는다.
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    if not metrics.enabled():
+        return await call_next(request)
+    t0 = time.perf_counter()
+    status = 500   # 처리되지 않은 예외로 빠져나가도 500으로 기록
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.API_REQUEST_SECONDS.observe(
+            time.perf_counter() - t0,
+            method=request.method,
+            route=_route_label(request),
+            status=status,
+        )
+
+# 라우터별로 따로 감싸서, 한쪽 의존성 문제(모델/LLM 등)가 다른 라우터·헬스에 영향 주지 않도록 함
 try:
     from apps.api.routers.search import router as search_router
-    from apps.api.routers.insights import router as insights_router
     app.include_router(search_router, prefix="/search", tags=["search"])
+except Exception:
+    pass
+
+try:
+    from apps.api.routers.insights import router as insights_router
     app.include_router(insights_router, prefix="/insights", tags=["insights"])
 except Exception:
     pass
@@ -0,0 +1,97 @@
+# apps/api/routers/insights.py
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from qdrant_client import models
+
+from infra import qdrant
+from workers.topic_cluster import load_clusters
+
+router = APIRouter()
+
+# 버킷마다 facet 집계 1회라 요청 하나가 만들 수 있는 버킷 수/기간을 제한
+MAX_BUCKETS = 366
+MAX_SPAN_DAYS = 366 * 5
+
+
+def _parse_date(s: Optional[str], default: date, name: str) -> date:
+    if not s:
+        return default
+    try:
+        return datetime.fromisoformat(s).date()
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name}: invalid date {s!r} (expected YYYY-MM-DD)")
+
+def time_buckets(date_from: date, date_to: date, bucket: str) -> List[tuple[date, date]]:
+    """[date_from, date_to] 구간을 day/week/month 단위 [start, end) 구간 목록으로 자름."""
+    if bucket == "week":
+        start = date_from - timedelta(days=date_from.weekday())   # 월요일 시작
+    elif bucket == "month":
+        start = date_from.replace(day=1)
+    else:
+        start = date_from
+    out = []
+    while start <= date_to:
+        if bucket == "week":
+            end = start + timedelta(days=7)
+        elif bucket == "month":
+            end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            end = start + timedelta(days=1)
+        out.append((start, end))
+        start = end
+    return out
+
+
+@router.get("/topics/clusters")
+def topic_clusters():
+    """토픽 클러스터 목록 (라벨/크기/대표 제목)."""
+    meta, clusters = load_clusters()
+    if not clusters:
+        raise HTTPException(status_code=404, detail="topic cluster model not found (run workers.topic_cluster full)")
+    items = [{"cluster_id": c, **info} for c, info in sorted(clusters.items(), key=lambda kv: -kv[1]["size"])]
+    return {"meta": meta, "clusters": items}
+
+@router.get("/topics")
+def topic_trends(
+    bucket: Literal["day", "week", "month"] = Query("week"),
+    date_from: Optional[str] = Query(None, description="기본: date_to 기준 8주 전"),
+    date_to: Optional[str] = Query(None, description="기본: 오늘"),
+    category: Optional[str] = Query(None),
+    top_n: int = Query(10, ge=1, le=100),
+    exact: bool = Query(False, description="정확 집계 (느림)"),
+):
+    """
+    시간 버킷별 토픽(cluster_id) 건수 — "이번 주 고객들이 뭘 불만으로 말하나".
+    버킷마다 Qdrant facet 집계 1회 (cluster_id, updated_at payload index 사용).
+    """
+    d_to = _parse_date(date_to, date.today(), "date_to")
+    d_from = _parse_date(date_from, d_to - timedelta(weeks=8), "date_from")
+    if d_from > d_to:
+        raise HTTPException(status_code=422, detail="date_from must be on or before date_to")
+    if (d_to - d_from).days > MAX_SPAN_DAYS:
+        raise HTTPException(status_code=422, detail=f"date range too long (max {MAX_SPAN_DAYS} days)")
+    buckets = time_buckets(d_from, d_to, bucket)
+    if len(buckets) > MAX_BUCKETS:
+        raise HTTPException(status_code=422, detail=f"too many {bucket} buckets: {len(buckets)} (max {MAX_BUCKETS}, use a coarser bucket)")
+    _, clusters = load_clusters()
+
+    series: List[Dict] = []
+    for start, end in buckets:
+        must: List[models.Condition] = [models.FieldCondition(
+            key="updated_at", range=models.DatetimeRange(gte=start.isoformat(), lt=end.isoformat())
+        )]
+        if category:
+            must.append(models.FieldCondition(key="category", match=models.MatchValue(value=category)))
+        counts = qdrant.facet_counts("cluster_id", filters=models.Filter(must=must), limit=top_n, exact=exact)
+        series.append({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "counts": [
+                {"cluster_id": c, "label": clusters.get(int(c), {}).get("label", ""), "count": n}
+                for c, n in counts
+            ],
+        })
+    return {"bucket": bucket, "date_from": d_from.isoformat(), "date_to": d_to.isoformat(), "series": series}
@@ -0,0 +1,234 @@
+# apps/api/routers/search.py
+from __future__ import annotations
+from typing import Iterator, List, Dict, Optional
+import json
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from qdrant_client import models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from core import metrics
+from core.config import settings
+from infra import qdrant
+from workers.embedder import embed_one, embed_batch
+
+router = APIRouter()
+
+# 컬렉션은 요청마다 settings.QDRANT_COLLECTION을 읽어 넘긴다
+# (infra 함수 기본값은 import 시점에 고정되므로, 테스트/벤치가 설정만 바꿔 다른 컬렉션을 쓸 수 있도록)
+
+
+# ------------------------------------------------------------
+# 공통 필터 (텍스트 검색 / 유사 검색 모두 동일하게 사용)
+# ------------------------------------------------------------
+class SearchFilters(BaseModel):
+    category: Optional[str] = None
+    source: Optional[str] = None        # 'llm' or 'db'
+    date_from: Optional[str] = None     # updated_at 하한 (예: "2024-05-01")
+    date_to: Optional[str] = None       # updated_at 상한
+
+def filters_from_query(
+    category: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+) -> SearchFilters:
+    """GET 쿼리스트링 → SearchFilters (FastAPI Depends용)."""
+    return SearchFilters(category=category, source=source, date_from=date_from, date_to=date_to)
+
+def build_filter(f: SearchFilters) -> Optional[models.Filter]:
+    """SearchFilters → Qdrant Filter. 조건이 하나도 없으면 None."""
+    must: List[models.Condition] = []
+    if f.category:
+        must.append(models.FieldCondition(key="category", match=models.MatchValue(value=f.category)))
+    if f.source:
+        must.append(models.FieldCondition(key="source", match=models.MatchValue(value=f.source)))
+    if f.date_from or f.date_to:
+        must.append(models.FieldCondition(
+            key="updated_at",
+            range=models.DatetimeRange(gte=f.date_from, lte=f.date_to),
+        ))
+    return models.Filter(must=must) if must else None
+
+def to_hits(points) -> List[Dict]:
+    """ScoredPoint 리스트 → 응답용 dict 리스트."""
+    return [{"id": p.id, "score": p.score, "payload": p.payload} for p in points]
+
+
+# ------------------------------------------------------------
+# 텍스트 검색: 쿼리 임베딩 → Top-K
+# ------------------------------------------------------------
+@router.get("")
+def search_text(
+    q: str = Query(..., min_length=1),
+    top_k: int = Query(5, ge=1, le=100),
+    collapse: bool = Query(False, description="중복 클러스터(dup_cluster_id)당 1건만 반환"),
+    f: SearchFilters = Depends(filters_from_query),
+):
+    with metrics.stage(metrics.API_STAGE_SECONDS, route="/search", stage="embed"):
+        vec = embed_one(q)
+    with metrics.stage(metrics.API_STAGE_SECONDS, route="/search", stage="qdrant"):
+        points = qdrant.search_points(query_vector=vec, filters=build_filter(f), top_k=top_k, collapse=collapse,
+                                      collection_name=settings.QDRANT_COLLECTION)
+    return {"query": q, "hits": to_hits(points)}
+
+
+# ------------------------------------------------------------
+# 유사 검색: 저장된 벡터 재사용 (임베딩 모델 호출 없음)
+# ------------------------------------------------------------
+class SimilarBatchRequest(SearchFilters):
+    ids: List[int] = Field(..., min_length=1)
+    top_k: int = Field(5, ge=1, le=100)
+
+class RecommendRequest(SearchFilters):
+    positive: List[int] = Field(..., min_length=1)
+    negative: List[int] = Field(default_factory=list)
+    top_k: int = Field(5, ge=1, le=100)
+
+def _not_found_kind(e: Exception) -> Optional[str]:
+    """
+    Qdrant 오류가 not found면 "point" / "collection", 그 외(잘못된 필터, 5xx 등)는 None.
+    원격 Qdrant는 UnexpectedResponse(404), local/numpy 모드는 ValueError("Point ... is not found" / "Collection ... not found").
+    """
+    if isinstance(e, UnexpectedResponse):
+        if e.status_code != 404:
+            return None
+    elif not (isinstance(e, ValueError) and "not found" in str(e).lower()):
+        return None
+    return "point" if re.search(r"\bpoint\b", str(e), re.IGNORECASE) else "collection"
+
+def _not_found(e: Exception) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"{_not_found_kind(e)} not found: {e}")
+
+def _with_dup_fallback(fn, *id_lists: List[int]):
+    """
+    fn(*id_lists) 실행. point not found면 중복 제거로 삭제된 id를 대표 id로 바꿔 한 번 더 시도
+    (ingest가 중복 행은 벡터 없이 대표 클러스터에만 기록하므로, 그 pg_id로도 유사 검색이 되도록).
+    not found가 아닌 오류는 그대로 다시 raise.
+    """
+    try:
+        return fn(*id_lists)
+    except (UnexpectedResponse, ValueError) as e:
+        if _not_found_kind(e) != "point":   # 컬렉션이 없거나 다른 오류면 별칭 조회 없이 바로
+            if _not_found_kind(e) is None:
+                raise
+            raise _not_found(e)
+        first = e
+    try:
+        resolved = [qdrant.resolve_point_ids(ids, collection_name=settings.QDRANT_COLLECTION) for ids in id_lists]
+    except (UnexpectedResponse, ValueError) as e:
+        if _not_found_kind(e) is None:
+            raise
+        raise _not_found(first)
+    if resolved == [list(ids) for ids in id_lists]:
+        raise _not_found(first)
+    try:
+        return fn(*resolved)
+    except (UnexpectedResponse, ValueError) as e:
+        if _not_found_kind(e) is None:
+            raise
+        raise _not_found(e)
+
+@router.get("/similar/{pg_id}")
+def search_similar(
+    pg_id: int,
+    top_k: int = Query(5, ge=1, le=100),
+    collapse: bool = Query(False, description="중복 클러스터(dup_cluster_id)당 1건만 반환"),
+    f: SearchFilters = Depends(filters_from_query),
+):
+    points = _with_dup_fallback(
+        lambda ids: qdrant.search_similar(ids[0], filters=build_filter(f), top_k=top_k, collapse=collapse,
+                                    collection_name=settings.QDRANT_COLLECTION),
+        [pg_id],
+    )
+    return {"pg_id": pg_id, "hits": to_hits(points)}
+
+@router.post("/similar/batch")
+def search_similar_batch(req: SimilarBatchRequest):
+    """id 여러 개에 대한 유사 검색을 한 번의 Qdrant 왕복으로 처리."""
+    results = _with_dup_fallback(
+        lambda ids: qdrant.search_similar_batch(ids, filters=build_filter(req), top_k=req.top_k,
+                                          collection_name=settings.QDRANT_COLLECTION),
+        req.ids,
+    )
+    return {"results": [{"pg_id": pid, "hits": to_hits(pts)} for pid, pts in zip(req.ids, results)]}
+
+@router.post("/similar/recommend")
+def search_recommend(req: RecommendRequest):
+    """positive/negative 예시 기반 추천 검색."""
+    points = _with_dup_fallback(
+        lambda pos, neg: qdrant.recommend_points(pos, neg, filters=build_filter(req), top_k=req.top_k,
+                                                collection_name=settings.QDRANT_COLLECTION),
+        req.positive, req.negative,
+    )
+    return {"positive": req.positive, "negative": req.negative, "hits": to_hits(points)}
+
+
+# ------------------------------------------------------------
+# 배치 검색: 쿼리 N개 → embed_batch 1회 + query_batch_points 1회
+# ------------------------------------------------------------
+class BatchSearchRequest(SearchFilters):
+    queries: List[str] = Field(..., min_length=1, max_length=1000)
+    top_k: int = Field(5, ge=1, le=100)
+
+@router.post("/batch")
+def search_batch(req: BatchSearchRequest):
+    """여러 텍스트 질의를 한 요청으로 처리 (필터는 모든 질의에 공통 적용). 입력 순서대로 결과 반환."""
+    with metrics.stage(metrics.API_STAGE_SECONDS, route="/search/batch", stage="embed"):
+        vecs = embed_batch(req.queries)
+    with metrics.stage(metrics.API_STAGE_SECONDS, route="/search/batch", stage="qdrant"):
+        results = qdrant.search_batch(vecs, filters=build_filter(req), top_k=req.top_k, collection_name=settings.QDRANT_COLLECTION)
+    return {"results": [{"query": q, "hits": to_hits(pts)} for q, pts in zip(req.queries, results)]}
+
+
+# ------------------------------------------------------------
+# 대량 내보내기: 필터(+선택적 질의)에 맞는 포인트를 NDJSON으로 스트리밍
+# ------------------------------------------------------------
+class ExportRequest(SearchFilters):
+    q: Optional[str] = None                 # 있으면 유사도 순, 없으면 id 순 전체
+    limit: int = Field(10000, ge=1, le=100000, description="q가 있을 때 최대 건수")
+    score_threshold: Optional[float] = None
+    fields: Optional[List[str]] = None      # payload 키 일부만 (없으면 전체)
+    with_vectors: bool = False
+    page_size: int = Field(1000, ge=1, le=10000)
+
+EXPORT_CHUNK_LINES = 256   # 줄마다 청크를 보내면 전송 오버헤드가 커서 이만큼 모아서 내보냄
+
+def _ndjson(points, with_score: bool) -> Iterator[bytes]:
+    """포인트 iterator → NDJSON 청크. 페이지 단위로 받아 바로 내보내므로 결과 크기와 무관하게 메모리 일정."""
+    buf: List[str] = []
+    for p in points:
+        row = {"id": p.id, "payload": p.payload}
+        if with_score:
+            row["score"] = p.score
+        if p.vector is not None:
+            row["vector"] = qdrant.full_vector(p)
+        buf.append(json.dumps(row, ensure_ascii=False, default=str))
+        if len(buf) >= EXPORT_CHUNK_LINES:
+            yield ("\n".join(buf) + "\n").encode("utf-8")
+            buf.clear()
+    if buf:
+        yield ("\n".join(buf) + "\n").encode("utf-8")
+
+@router.post("/export")
+def search_export(req: ExportRequest):
+    """
+    q 없이: 필터에 맞는 전체 포인트를 scroll로 id 순 스트리밍.
+    q 있음: 유사도 순 상위 limit개(또는 score_threshold 이상)를 페이지로 스트리밍.
+    """
+    flt = build_filter(req)
+    with_payload = req.fields if req.fields else True
+    if req.q:
+        points = qdrant.iter_query_points(
+            embed_one(req.q), filters=flt, limit=req.limit, score_threshold=req.score_threshold,
+            page_size=req.page_size, collection_name=settings.QDRANT_COLLECTION, with_payload=with_payload, with_vectors=req.with_vectors,
+        )
+    else:
+        points = qdrant.iter_points(
+            settings.QDRANT_COLLECTION, flt=flt, page_size=req.page_size,
+            with_payload=with_payload, with_vectors=req.with_vectors,
+        )
+    return StreamingResponse(_ndjson(points, with_score=bool(req.q)), media_type="application/x-ndjson")
@@ -0,0 +1,114 @@
+# === 질의 1,000개: 개별 GET /search x1000 vs POST /search/batch, 그리고 /search/export 스트리밍 처리량·메모리 ===
+# 실행 (인프로세스 ASGI, 스텁 임베더 + numpy 백엔드 + 합성 피드백):
+#   python -m benchmarks.bench_batch_search --n 20000 --queries 1000 [--backend numpy|local|remote]
+#   인프로세스 모드는 전용 컬렉션(bench_batch_search)에 적재하고 끝나면 지운다 (운영 컬렉션은 건드리지 않음).
+# 실행 중인 서버 대상 (실제 임베딩 모델/Qdrant, 컬렉션은 이미 적재돼 있어야 함):
+#   python -m benchmarks.bench_batch_search --url http://127.0.0.1:8000 --queries 1000
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import time
+import tracemalloc
+
+import httpx
+
+from core.config import settings
+from infra import qdrant
+from benchmarks.synthetic import HashingEmbedder, feedback_rows, queries
+
+COLLECTION = "bench_batch_search"
+
+
+def populate(n: int, embedder: HashingEmbedder) -> None:
+    rows = feedback_rows(n, dup_rate=0.0)
+    vecs = embedder.encode(f"{r['title']}\n{r['body']}" for r in rows)
+    qdrant.delete_collection(COLLECTION)
+    with contextlib.redirect_stdout(io.StringIO()):
+        qdrant.initialize_qdrant(COLLECTION)
+    qdrant.client.upload_collection(
+        COLLECTION, vectors=qdrant.storage_vectors(vecs), ids=[r["id"] for r in rows],
+        payload=({"pg_id": r["id"], "title": r["title"], "category": r["category"],
+                  "updated_at": r["updated_at"].isoformat()} for r in rows),
+    )
+
+def in_process_client(embedder: HashingEmbedder):
+    """스텁 임베더로 바꾼 라우터를 띄운 ASGI 클라이언트 (모델 다운로드 없이 API 경로 전체 측정)."""
+    from fastapi.testclient import TestClient
+    from apps.api.routers import search
+    search.embed_one = lambda text: embedder.encode([text])[0].tolist()
+    search.embed_batch = embedder.embed_batch
+    from apps.api.main import app
+    return TestClient(app)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="실행 중인 API 주소 (없으면 인프로세스 + 합성 데이터)")
+    ap.add_argument("--backend", choices=["numpy", "local", "remote"], default="numpy", help="인프로세스 모드 Qdrant 백엔드")
+    ap.add_argument("--n", type=int, default=20000, help="인프로세스 모드 합성 포인트 수")
+    ap.add_argument("--queries", type=int, default=1000)
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--batch-size", type=int, default=1000, help="/search/batch 한 요청당 질의 수")
+    args = ap.parse_args()
+
+    embedder = HashingEmbedder(qdrant.VECTOR_SIZE)
+    if args.url:
+        run(httpx.Client(base_url=args.url, timeout=600.0), None, args)
+        return
+    if args.backend != settings.QDRANT_BACKEND:
+        qdrant.client = qdrant.create_client(args.backend)
+    saved = settings.QDRANT_COLLECTION
+    try:
+        settings.QDRANT_COLLECTION = COLLECTION   # 검색 라우터는 요청마다 이 설정값으로 컬렉션을 고름
+        populate(args.n, embedder)
+        run(in_process_client(embedder), args.n, args)
+    finally:
+        settings.QDRANT_COLLECTION = saved
+        qdrant.delete_collection(COLLECTION)
+
+def run(client, n, args) -> None:
+    qs = queries(args.queries)
+
+    # 워밍업 (모델 lazy-load / 첫 요청 비용 제외)
+    client.get("/search", params={"q": qs[0], "top_k": args.top_k}).raise_for_status()
+
+    t0 = time.perf_counter()
+    single = []
+    for q in qs:
+        r = client.get("/search", params={"q": q, "top_k": args.top_k})
+        r.raise_for_status()
+        single.append([round(h["score"], 4) for h in r.json()["hits"]])
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = []
+    for i in range(0, len(qs), args.batch_size):
+        r = client.post("/search/batch", json={"queries": qs[i:i + args.batch_size], "top_k": args.top_k})
+        r.raise_for_status()
+        batched += [[round(h["score"], 4) for h in res["hits"]] for res in r.json()["results"]]
+    t_batch = time.perf_counter() - t0
+    # 합성 데이터는 같은 문장이 많아 동점 순서가 달라질 수 있으므로 id 대신 점수 목록으로 비교
+    same = sum(a == b for a, b in zip(single, batched)) / len(qs)
+
+    print(f"n={n or '-'} queries={len(qs)} top_k={args.top_k} batch_size={args.batch_size}")
+    print(f"{'individual GET /search':<28} {t_single:8.2f}s  {len(qs) / t_single:9.1f} q/s")
+    print(f"{'POST /search/batch':<28} {t_batch:8.2f}s  {len(qs) / t_batch:9.1f} q/s  (x{t_single / t_batch:.1f}, 동일 결과 {same:.3f})")
+
+    # export: 전체 스트리밍 처리량 + 클라이언트가 줄 단위로 소비할 때 서버 쪽 파이썬 힙 피크
+    for label, body in (("export all (scroll)", {}), ("export q limit=5000", {"q": qs[0], "limit": 5000})):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        lines = 0
+        with client.stream("POST", "/search/export", json=body) as r:
+            r.raise_for_status()
+            for _ in r.iter_lines():
+                lines += 1
+        dt = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mem = f"peak heap {peak / 2**20:6.1f} MB" if not args.url else ""
+        print(f"{label:<28} {dt:8.2f}s  {lines / dt:9.0f} rows/s  rows={lines}  {mem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# === 토픽 클러스터링 CPU 시간 vs 코퍼스 크기 (합성 데이터, Qdrant/모델 불필요) ===
+# 실행: python -m benchmarks.bench_clustering --sizes 10000 50000 100000 --k 30
+from __future__ import annotations
+import argparse
+import time
+
+import numpy as np
+
+from workers.clustering import MiniBatchKMeans
+
+
+def synthetic_vectors(n: int, dim: int, n_topics: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """토픽 중심 주변에 흩어진 단위 벡터 (임베딩과 같은 L2 정규화 float32)와 정답 토픽."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    topics = rng.integers(n_topics, size=n)
+    x = centers[topics] + 0.8 * rng.standard_normal((n, dim)).astype(np.float32)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    return x, topics
+
+def purity(labels: np.ndarray, truth: np.ndarray) -> float:
+    """클러스터별 최다 정답 토픽 비율의 가중 평균."""
+    total = 0
+    for c in np.unique(labels):
+        total += np.bincount(truth[labels == c]).max()
+    return total / len(labels)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    ap.add_argument("--dim", type=int, default=1024)
+    ap.add_argument("--k", type=int, default=30)
+    args = ap.parse_args()
+
+    print(f"dim={args.dim} k={args.k}")
+    print(f"{'n':>8} {'fit(s)':>8} {'assign(s)':>10} {'incr 10%(s)':>12} {'purity':>7}")
+    for n in args.sizes:
+        x, truth = synthetic_vectors(n, args.dim, args.k)
+
+        t0 = time.perf_counter()
+        km = MiniBatchKMeans(n_clusters=args.k).fit(x)
+        t_fit = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        labels, _ = km.predict(x)
+        t_assign = time.perf_counter() - t0
+
+        new = x[: max(1, n // 10)]
+        t0 = time.perf_counter()
+        km.predict(new)
+        km.partial_fit(new)
+        t_incr = time.perf_counter() - t0
+
+        print(f"{n:>8} {t_fit:>8.2f} {t_assign:>10.2f} {t_incr:>12.2f} {purity(labels, truth):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# === 단일 1024차원 레이아웃 vs 압축 벡터(full + compact) 2단계 검색: 메모리 / 지연시간 / recall@k ===
+# 실행 (기본 numpy 백엔드, 합성 데이터):
+#   python -m benchmarks.bench_compact --n 50000 --dims 256 384 --oversample 2 4 8
+#   python -m benchmarks.bench_compact --snapshot snapshots/feedback_current --backend remote
+# numpy 백엔드는 두 단계 모두 정확 검색이라 지연시간은 "스캔 차원 축소" 효과만, remote는 HNSW 포함 실제 값.
+# 메모리는 포인트당 RAM 상주 벡터 + HNSW 링크(레벨0 기준 m*2개 x 4바이트) 추정치.
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from core.config import settings
+from infra import qdrant
+from benchmarks.bench_recall import recall_at_k
+from workers import compact
+
+COLLECTION = "bench_compact"
+HNSW_M = 16
+
+
+def load_vectors(args) -> np.ndarray:
+    if args.snapshot:
+        from workers.snapshot import load_snapshot
+        return np.asarray(load_snapshot(args.snapshot).vectors)
+    from benchmarks.bench_clustering import synthetic_vectors
+    return synthetic_vectors(args.n, qdrant.VECTOR_SIZE, n_topics=200)[0]
+
+def ram_bytes_per_point(compact_dim: int | None) -> int:
+    """단일: full 벡터 + full HNSW. 압축: compact 벡터 + compact HNSW (full은 on_disk, HNSW 없음)."""
+    dim = compact_dim or qdrant.VECTOR_SIZE
+    return dim * 4 + HNSW_M * 2 * 4
+
+def build(vectors: np.ndarray) -> None:
+    qdrant.client.delete_collection(COLLECTION)
+    with contextlib.redirect_stdout(io.StringIO()):
+        qdrant.initialize_qdrant(COLLECTION)
+    qdrant.client.upload_collection(COLLECTION, vectors=qdrant.storage_vectors(vectors),
+                                    ids=range(1, len(vectors) + 1), batch_size=512, wait=True)
+
+def run_queries(queries: np.ndarray, k: int) -> tuple[List[List[int]], List[float]]:
+    ids, ms = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        hits = qdrant.search_points(q.tolist(), top_k=k, collection_name=COLLECTION)
+        ms.append((time.perf_counter() - t0) * 1000.0)
+        ids.append([h.id for h in hits])
+    return ids, ms
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--snapshot", help="workers.snapshot으로 내보낸 디렉터리 (없으면 합성 데이터)")
+    ap.add_argument("--backend", choices=["numpy", "local", "remote"], default="numpy")
+    ap.add_argument("--n", type=int, default=50_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--mode", choices=["pca", "truncate"], default="pca")
+    ap.add_argument("--dims", type=int, nargs="+", default=[256, 384])
+    ap.add_argument("--oversample", type=float, nargs="+", default=[2, 4, 8])
+    args = ap.parse_args()
+
+    if args.backend != settings.QDRANT_BACKEND:
+        qdrant.client = qdrant.create_client(args.backend)
+
+    vectors = load_vectors(args)
+    n = len(vectors)
+    rng = np.random.default_rng(0)
+    base = vectors[rng.choice(n, size=args.queries, replace=False)]
+    queries = base + 0.05 * rng.standard_normal(base.shape).astype(np.float32)
+
+    # 정답: 1024차원 정확 top-k
+    qn = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    truth = (np.argsort(-(qn @ vectors.T), axis=1)[:, : args.k] + 1).tolist()
+
+    rows: List[Dict] = []
+    planner = settings.PLANNER_ENABLED
+    settings.PLANNER_ENABLED = False   # 작은 n에서 플래너가 정확 검색을 골라 2단계 경로를 우회하지 않도록
+    try:
+        settings.COMPACT_VECTOR = None
+        build(vectors)
+        ids, ms = run_queries(queries, args.k)
+        rows.append({"layout": "single 1024", "oversample": "-", "recall": recall_at_k(ids, truth, args.k),
+                     "p50": np.percentile(ms, 50), "p99": np.percentile(ms, 99), "ram": ram_bytes_per_point(None)})
+
+        for dim in args.dims:
+            settings.COMPACT_VECTOR, settings.COMPACT_DIM = args.mode, dim
+            t0 = time.perf_counter()
+            proj = (compact.CompactProjector.fit_pca(vectors, dim) if args.mode == "pca"
+                    else compact.CompactProjector.truncation(dim))
+            t_fit = time.perf_counter() - t0
+            compact.set_projector(proj)
+            build(vectors)
+            for os_ in args.oversample:
+                settings.COMPACT_OVERSAMPLE = os_
+                ids, ms = run_queries(queries, args.k)
+                rows.append({"layout": f"{args.mode} {dim} (fit {t_fit:.1f}s, var {proj.explained:.2f})", "oversample": f"x{os_:g}",
+                             "recall": recall_at_k(ids, truth, args.k),
+                             "p50": np.percentile(ms, 50), "p99": np.percentile(ms, 99), "ram": ram_bytes_per_point(dim)})
+    finally:
+        qdrant.client.delete_collection(COLLECTION)
+        settings.COMPACT_VECTOR = None
+        settings.PLANNER_ENABLED = planner
+        compact.set_projector(None)
+
+    print(f"backend={args.backend} n={n} queries={len(queries)} k={args.k}")
+    print(f"{'layout':<36} {'over':>5} {'recall@' + str(args.k):>9} {'p50 ms':>8} {'p99 ms':>8} {'RAM B/pt':>9} {'RAM MB/1M':>10}")
+    for r in rows:
+        print(f"{r['layout']:<36} {r['oversample']:>5} {r['recall']:>9.3f} {r['p50']:>8.2f} {r['p99']:>8.2f} "
+              f"{r['ram']:>9} {r['ram'] * 1e6 / 2**20:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
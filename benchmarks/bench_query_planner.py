@@ -0,0 +1,100 @@
+# === 필터 선택도별 검색 계획 비교: 기본 HNSW vs 항상 정확 검색 vs 항상 HNSW(ef 조정) vs 쿼리 플래너 ===
+# 실행:
+#   python -m benchmarks.bench_query_planner --backend remote --n 200000 --selectivity 0.001 0.01 0.05 0.2 1
+#   python -m benchmarks.bench_query_planner              (numpy 백엔드: 계획 선택/카운트 캐시 오버헤드만 확인)
+# numpy/local 백엔드는 search_params와 무관하게 항상 정확 검색이라 recall은 모두 1.0 — 지연시간/recall 차이는 remote에서만 의미 있음.
+# 필터는 payload shard(0~999 균등 정수)에 대한 range 조건으로 선택도를 조절한다.
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import time
+from typing import Dict, List
+
+import numpy as np
+from qdrant_client import models
+
+from core.config import settings
+from infra import qdrant, query_planner
+from benchmarks.bench_clustering import synthetic_vectors
+
+COLLECTION = "bench_planner"
+SHARDS = 1000
+
+# 전략 이름 → (PLANNER_ENABLED, PLANNER_EXACT_THRESHOLD)
+STRATEGIES = {
+    "default hnsw": (False, settings.PLANNER_EXACT_THRESHOLD),
+    "always exact": (True, 10**12),
+    "always hnsw+ef": (True, -1),
+    "planner": (True, settings.PLANNER_EXACT_THRESHOLD),
+}
+
+
+def build(vectors: np.ndarray, shards: np.ndarray) -> None:
+    qdrant.delete_collection(COLLECTION)
+    with contextlib.redirect_stdout(io.StringIO()):
+        qdrant.initialize_qdrant(COLLECTION)
+    qdrant.client.create_payload_index(COLLECTION, field_name="shard", field_schema=models.PayloadSchemaType.INTEGER)
+    qdrant.client.upload_collection(COLLECTION, vectors=qdrant.storage_vectors(vectors), ids=range(1, len(vectors) + 1),
+                                    payload=({"shard": int(s)} for s in shards), batch_size=512, wait=True)
+
+def run(queries: np.ndarray, flt, k: int) -> tuple[List[List[int]], List[float]]:
+    ids, ms = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        hits = qdrant.search_points(q.tolist(), filters=flt, top_k=k, collection_name=COLLECTION)
+        ms.append((time.perf_counter() - t0) * 1000.0)
+        ids.append([h.id for h in hits])
+    return ids, ms
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=["numpy", "local", "remote"], default="numpy")
+    ap.add_argument("--n", type=int, default=50_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--selectivity", type=float, nargs="+", default=[0.001, 0.01, 0.05, 0.2, 1.0])
+    args = ap.parse_args()
+
+    if args.backend != settings.QDRANT_BACKEND:
+        qdrant.client = qdrant.create_client(args.backend)
+
+    vectors, _ = synthetic_vectors(args.n, qdrant.VECTOR_SIZE, n_topics=200)
+    rng = np.random.default_rng(0)
+    shards = rng.integers(SHARDS, size=args.n)
+    base = vectors[rng.choice(args.n, size=args.queries, replace=False)]
+    queries = base + 0.05 * rng.standard_normal(base.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    all_scores = queries @ vectors.T
+
+    rows: List[Dict] = []
+    saved = (settings.PLANNER_ENABLED, settings.PLANNER_EXACT_THRESHOLD)
+    try:
+        build(vectors, shards)
+        for sel in args.selectivity:
+            cut = max(1, round(sel * SHARDS))
+            flt = None if cut >= SHARDS else models.Filter(
+                must=[models.FieldCondition(key="shard", range=models.Range(lt=cut))])
+            s = all_scores if flt is None else np.where((shards < cut)[None, :], all_scores, -np.inf)
+            kth = -np.partition(-s, args.k - 1, axis=1)[:, args.k - 1]
+            for name, (enabled, threshold) in STRATEGIES.items():
+                settings.PLANNER_ENABLED, settings.PLANNER_EXACT_THRESHOLD = enabled, threshold
+                query_planner.invalidate(COLLECTION)
+                plan = qdrant._plan(flt, args.k, COLLECTION)
+                ids, ms = run(queries, flt, args.k)
+                # 동점 허용 recall: 반환 포인트의 정답 점수가 정확 k등 점수 이상이면 맞은 것
+                hits = [sum(s[qi, i - 1] >= kth[qi] - 1e-5 for i in got) / args.k for qi, got in enumerate(ids)]
+                rows.append({"sel": sel, "matching": int((shards < cut).sum()), "strategy": name, "plan": plan.describe(),
+                             "recall": float(np.mean(hits)), "p50": np.percentile(ms, 50), "p99": np.percentile(ms, 99)})
+    finally:
+        settings.PLANNER_ENABLED, settings.PLANNER_EXACT_THRESHOLD = saved
+        qdrant.delete_collection(COLLECTION)
+
+    print(f"backend={args.backend} n={args.n} queries={len(queries)} k={args.k} exact_threshold={saved[1]}")
+    print(f"{'selectivity':>11} {'matching':>9}  {'strategy':<15} {'recall@' + str(args.k):>9} {'p50 ms':>8} {'p99 ms':>8}  plan")
+    for r in rows:
+        print(f"{r['sel']:>11.3%} {r['matching']:>9}  {r['strategy']:<15} {r['recall']:>9.3f} {r['p50']:>8.2f} {r['p99']:>8.2f}  {r['plan']}")
+
+
+if __name__ == "__main__":
+    main()
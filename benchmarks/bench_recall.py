@@ -0,0 +1,111 @@
+# === HNSW / 양자화 설정별 recall@k — NumPy 브루트포스 백엔드를 정답(오라클)으로 사용 ===
+# 실행 (설정된 QDRANT_BACKEND 대상, 보통 remote):
+#   python -m benchmarks.bench_recall --n 20000 --m 16 --ef-construct 100 --ef 32 64 128 256
+#   python -m benchmarks.bench_recall --snapshot snapshots/feedback_current --quantization int8
+# local 백엔드는 내부적으로 정확 검색이라 recall이 항상 1.0 (파이프라인 확인용).
+from __future__ import annotations
+import argparse
+import time
+from typing import List, Sequence
+
+import numpy as np
+from qdrant_client import models
+
+from core.config import settings
+from infra import qdrant
+from infra.numpy_store import NumpyVectorStore
+
+ORACLE_COLLECTION = "recall_oracle"
+
+
+def recall_at_k(approx: Sequence[Sequence[int]], exact: Sequence[Sequence[int]], k: int) -> float:
+    """쿼리별 |approx[:k] ∩ exact[:k]| / k 의 평균."""
+    hits = [len(set(a[:k]) & set(e[:k])) / k for a, e in zip(approx, exact)]
+    return float(np.mean(hits)) if hits else 0.0
+
+def load_vectors(args) -> np.ndarray:
+    if args.snapshot:
+        from workers.snapshot import load_snapshot
+        return load_snapshot(args.snapshot).vectors
+    from benchmarks.bench_clustering import synthetic_vectors
+    return synthetic_vectors(args.n, args.dim, n_topics=50)[0]
+
+def wait_indexed(collection_name: str, timeout: float = 600.0) -> None:
+    """원격 Qdrant는 HNSW 인덱싱이 비동기라 GREEN이 될 때까지 대기."""
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < timeout:
+        info = qdrant.client.get_collection(collection_name)
+        if info.status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(1.0)
+
+def exact_topk(oracle: NumpyVectorStore, queries: np.ndarray, k: int) -> List[List[int]]:
+    reqs = [models.QueryRequest(query=q.tolist(), limit=k) for q in queries]
+    return [[p.id for p in r.points] for r in oracle.query_batch_points(ORACLE_COLLECTION, requests=reqs)]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--snapshot", help="workers.snapshot으로 내보낸 디렉터리 (없으면 합성 데이터)")
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--dim", type=int, default=qdrant.VECTOR_SIZE)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--m", type=int, default=16)
+    ap.add_argument("--ef-construct", type=int, default=100)
+    ap.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    ap.add_argument("--quantization", choices=["none", "int8"], default="none")
+    ap.add_argument("--collection", default=f"{settings.QDRANT_COLLECTION}_recall")
+    ap.add_argument("--keep", action="store_true", help="끝나고 대상 컬렉션 유지")
+    args = ap.parse_args()
+
+    vectors = load_vectors(args)
+    n, dim = vectors.shape
+    rng = np.random.default_rng(0)
+    # 코퍼스 점 주변을 살짝 흔든 쿼리 (자기 자신이 1등이 되지 않도록)
+    base = vectors[rng.choice(n, size=args.queries, replace=False)]
+    queries = base + 0.05 * rng.standard_normal(base.shape).astype(np.float32)
+
+    # 1) 정답: NumPy 정확 검색
+    oracle = NumpyVectorStore()
+    oracle.create_collection(ORACLE_COLLECTION, vectors_config=models.VectorParams(size=dim, distance=qdrant.DISTANCE_METRIC))
+    oracle.upload_collection(ORACLE_COLLECTION, vectors=vectors, ids=range(1, n + 1))
+    t0 = time.perf_counter()
+    truth = exact_topk(oracle, queries, args.k)
+    t_exact = (time.perf_counter() - t0) * 1000.0 / len(queries)
+
+    # 2) 대상: 설정된 백엔드에 HNSW/양자화 파라미터로 컬렉션 생성
+    quant = None
+    if args.quantization == "int8":
+        quant = models.ScalarQuantization(scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True))
+    qdrant.client.delete_collection(args.collection)
+    qdrant.client.create_collection(
+        collection_name=args.collection,
+        vectors_config=models.VectorParams(size=dim, distance=qdrant.DISTANCE_METRIC),
+        hnsw_config=models.HnswConfigDiff(m=args.m, ef_construct=args.ef_construct),
+        quantization_config=quant,
+    )
+    qdrant.client.upload_collection(args.collection, vectors=vectors, ids=range(1, n + 1), batch_size=512, wait=True)
+    wait_indexed(args.collection)
+
+    print(f"backend={settings.QDRANT_BACKEND} n={n} dim={dim} queries={len(queries)} k={args.k} "
+          f"m={args.m} ef_construct={args.ef_construct} quantization={args.quantization}")
+    print(f"{'exact (numpy)':<16} recall@{args.k}=1.000  {t_exact:7.2f} ms/query")
+    try:
+        for ef in args.ef:
+            params = models.SearchParams(
+                hnsw_ef=ef,
+                quantization=models.QuantizationSearchParams(rescore=True) if quant else None,
+            )
+            reqs = [models.QueryRequest(query=q.tolist(), limit=args.k, params=params) for q in queries]
+            t0 = time.perf_counter()
+            res = qdrant.client.query_batch_points(args.collection, requests=reqs)
+            ms = (time.perf_counter() - t0) * 1000.0 / len(queries)
+            approx = [[p.id for p in r.points] for r in res]
+            print(f"{'hnsw_ef=' + str(ef):<16} recall@{args.k}={recall_at_k(approx, truth, args.k):.3f}  {ms:7.2f} ms/query")
+    finally:
+        if not args.keep:
+            qdrant.client.delete_collection(args.collection)
+
+
+if __name__ == "__main__":
+    main()
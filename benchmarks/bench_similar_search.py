@@ -0,0 +1,65 @@
+# === 텍스트 검색(embed_one + search_points) vs 저장 벡터 유사 검색(search_similar) 지연시간 비교 ===
+# 실행: python -m benchmarks.bench_similar_search --n 50
+from __future__ import annotations
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from core.config import settings
+from infra import qdrant
+from workers.embedder import embed_one
+
+
+def _measure(fn: Callable[[], object], n: int) -> List[float]:
+    """fn을 n번 호출하며 각 호출 시간(ms)을 기록."""
+    out: List[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000.0)
+    return out
+
+def _summary(name: str, ms: List[float]) -> None:
+    ms_sorted = sorted(ms)
+    p50 = statistics.median(ms_sorted)
+    p95 = ms_sorted[min(len(ms_sorted) - 1, int(len(ms_sorted) * 0.95))]
+    print(f"{name:<28} n={len(ms):<4} p50={p50:8.2f}ms  p95={p95:8.2f}ms  mean={statistics.fmean(ms):8.2f}ms")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=50, help="샘플 포인트 수")
+    ap.add_argument("--top-k", type=int, default=10)
+    ap.add_argument("--collection", default=settings.QDRANT_COLLECTION)
+    args = ap.parse_args()
+
+    points, _ = qdrant.scroll_points(args.collection, limit=args.n)
+    assert points, f"'{args.collection}' 컬렉션에 포인트가 없습니다."
+    samples = [(p.id, p.payload.get("title") or "") for p in points]
+
+    # 모델 lazy-load 비용이 첫 측정에 섞이지 않도록 워밍업
+    embed_one("워밍업")
+    qdrant.search_similar(samples[0][0], top_k=args.top_k, collection_name=args.collection)
+
+    it = iter(samples)
+    text_ms = _measure(
+        lambda: qdrant.search_points(embed_one(next(it)[1]), top_k=args.top_k, collection_name=args.collection),
+        len(samples),
+    )
+    it = iter(samples)
+    sim_ms = _measure(
+        lambda: qdrant.search_similar(next(it)[0], top_k=args.top_k, collection_name=args.collection),
+        len(samples),
+    )
+    t0 = time.perf_counter()
+    qdrant.search_similar_batch([pid for pid, _ in samples], top_k=args.top_k, collection_name=args.collection)
+    batch_ms = (time.perf_counter() - t0) * 1000.0
+
+    print(f"collection={args.collection} top_k={args.top_k}")
+    _summary("text (embed_one+search)", text_ms)
+    _summary("similar (by point id)", sim_ms)
+    print(f"{'similar batch (1 round trip)':<28} n={len(samples):<4} total={batch_ms:8.2f}ms  per-id={batch_ms / len(samples):8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# === 오프라인 성능 벤치마크 스위트 + 베이스라인 대비 회귀 판정 ===
+# 모델/PG/Qdrant Cloud 없이 실행 (스텁 임베더 + 합성 한국어 피드백 + numpy/local 백엔드).
+#
+#   python -m benchmarks.suite run --out bench_results/baseline.json          # 기준값 저장
+#   python -m benchmarks.suite run --out bench_results/current.json
+#   python -m benchmarks.suite compare bench_results/baseline.json bench_results/current.json --threshold 0.1
+#
+# compare는 회귀(기준 대비 threshold 이상 나빠진 항목)나 baseline에 있는데 current에 없는 항목이 하나라도 있으면
+# 종료 코드 1 (측정이 빠진 채 통과하지 않도록, 의도적으로 뺀 경우에만 --allow-missing).
+# 같은 머신·같은 옵션으로 만든 결과끼리만 비교할 것 (meta에 환경 정보가 같이 기록됨).
+from __future__ import annotations
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from qdrant_client import models
+
+from core.config import settings
+from infra import qdrant
+from benchmarks.synthetic import FakePG, HashingEmbedder, feedback_rows, queries
+
+COLLECTION = "bench_suite"
+UPSERT_BATCH = 256
+EMBED_BATCH = 64
+
+
+def _result(value: float, unit: str, better: str) -> Dict:
+    return {"value": float(value), "unit": unit, "better": better}
+
+def _median_of(repeat: int, fn: Callable[[], float]) -> float:
+    """fn()이 돌려준 값(throughput 등)의 repeat회 중앙값."""
+    return statistics.median(fn() for _ in range(repeat))
+
+def _percentile(ms: List[float], q: float) -> float:
+    return float(np.percentile(np.asarray(ms), q))
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def _points(rows: List[Dict], vecs: np.ndarray) -> List[models.PointStruct]:
+    return [
+        models.PointStruct(
+            id=r["id"],
+            vector=v.tolist(),
+            payload={"pg_id": r["id"], "title": r["title"], "category": r["category"], "updated_at": r["updated_at"].isoformat()},
+        )
+        for r, v in zip(rows, vecs)
+    ]
+
+def _recreate(name: str) -> None:
+    qdrant.client.delete_collection(name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        qdrant.initialize_qdrant(name)
+
+
+# ------------------------------------------------------------
+# 개별 측정
+# ------------------------------------------------------------
+def bench_embed(embed: Callable[[List[str]], object], texts: List[str], repeat: int) -> Dict:
+    def once():
+        t0 = time.perf_counter()
+        for i in range(0, len(texts), EMBED_BATCH):
+            embed(texts[i:i + EMBED_BATCH])
+        return len(texts) / (time.perf_counter() - t0)
+    return {"embed.texts_per_s": _result(_median_of(repeat, once), "texts/s", "higher")}
+
+def bench_upsert(points: List[models.PointStruct], repeat: int) -> Dict:
+    def once():
+        _recreate(COLLECTION)
+        t0 = time.perf_counter()
+        for i in range(0, len(points), UPSERT_BATCH):
+            qdrant.upsert_points(points[i:i + UPSERT_BATCH], collection_name=COLLECTION)
+        return len(points) / (time.perf_counter() - t0)
+    return {"upsert.points_per_s": _result(_median_of(repeat, once), "points/s", "higher")}
+
+def bench_ingest(rows: List[Dict], embed: Callable, repeat: int) -> Dict:
+    """
+    workers.ingest_pg_to_qdrant.run() 전체 경로 (중복 제거 → LLM 스텁 → 임베딩 → upsert).
+    conn/embed를 넘기므로 psycopg2·sentence-transformers 없이도 실행된다 (둘 다 실제로 쓸 때만 import).
+    """
+    from workers import ingest_pg_to_qdrant
+    name = f"{COLLECTION}_ingest"
+    def once():
+        qdrant.client.delete_collection(name)
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest_pg_to_qdrant.run(conn=FakePG(rows), embed=embed, collection_name=name)
+        return len(rows) / (time.perf_counter() - t0)
+    try:
+        return {"ingest.rows_per_s": _result(_median_of(repeat, once), "rows/s", "higher")}
+    finally:
+        qdrant.client.delete_collection(name)
+
+def bench_search(qvecs: np.ndarray, k: int, concurrency: List[int]) -> Dict:
+    """동시 요청 수별 search_points 지연시간 p50/p99와 처리량. COLLECTION이 채워져 있어야 함."""
+    def one(v):
+        t0 = time.perf_counter()
+        qdrant.search_points(v, top_k=k, collection_name=COLLECTION)
+        return (time.perf_counter() - t0) * 1000.0
+
+    vecs = [v.tolist() for v in qvecs]
+    for v in vecs[:10]:   # 워밍업
+        one(v)
+    out: Dict = {}
+    for c in concurrency:
+        with ThreadPoolExecutor(max_workers=c) as pool:
+            t0 = time.perf_counter()
+            ms = list(pool.map(one, vecs))
+            wall = time.perf_counter() - t0
+        out[f"search.c{c}.p50_ms"] = _result(_percentile(ms, 50), "ms", "lower")
+        out[f"search.c{c}.p99_ms"] = _result(_percentile(ms, 99), "ms", "lower")
+        out[f"search.c{c}.qps"] = _result(len(vecs) / wall, "queries/s", "higher")
+    return out
+
+def bench_recall(rows: List[Dict], vecs: np.ndarray, qvecs: np.ndarray, k: int) -> Dict:
+    """
+    search_points 결과 vs NumPy 정확 top-k (필터 없음 / category 필터).
+    합성 데이터에는 중복(동점)이 많아 id 집합 비교는 동점 순서에 좌우되므로,
+    반환 포인트의 실제 점수가 정확 k등 점수 이상이면 맞은 것으로 센다.
+    """
+    row_of = {r["id"]: i for i, r in enumerate(rows)}
+    cats = np.asarray([r["category"] for r in rows])
+    scores = qvecs @ vecs.T
+    out: Dict = {}
+    for label, cat in (("all", None), ("filtered", rows[0]["category"])):
+        flt = None
+        s = scores
+        if cat is not None:
+            flt = models.Filter(must=[models.FieldCondition(key="category", match=models.MatchValue(value=cat))])
+            s = np.where(cats[None, :] == cat, scores, -np.inf)
+        kth = -np.partition(-s, k - 1, axis=1)[:, k - 1]
+        hits = []
+        for qi, q in enumerate(qvecs):
+            got = qdrant.search_points(q.tolist(), filters=flt, top_k=k, collection_name=COLLECTION)
+            hits.append(sum(s[qi, row_of[p.id]] >= kth[qi] - 1e-5 for p in got) / k)
+        out[f"recall.{label}.at_{k}"] = _result(float(np.mean(hits)), "ratio", "higher")
+    return out
+
+
+# ------------------------------------------------------------
+# run / compare
+# ------------------------------------------------------------
+def run(args) -> Dict:
+    if args.backend != settings.QDRANT_BACKEND:
+        qdrant.client = qdrant.create_client(args.backend)
+
+    if args.embedder == "kure":
+        from workers.embedder import embed_batch as embed
+    else:
+        embed = HashingEmbedder(qdrant.VECTOR_SIZE).embed_batch
+
+    rows = feedback_rows(args.n, dup_rate=args.dup_rate, seed=args.seed)
+    texts = [f"{r['title']}\n{r['body']}" for r in rows]
+    qtexts = queries(args.queries, seed=args.seed + 1)
+
+    results: Dict = {}
+    t_all = time.perf_counter()
+    results.update(bench_embed(embed, texts[: args.embed_n], args.repeat))
+
+    vecs = np.asarray(embed(texts), dtype=np.float32)
+    qvecs = np.asarray(embed(qtexts), dtype=np.float32)
+    results.update(bench_upsert(_points(rows, vecs), args.repeat))
+    results.update(bench_ingest(rows, embed, args.repeat))
+    try:
+        results.update(bench_search(qvecs, args.k, args.concurrency))
+        results.update(bench_recall(rows, vecs, qvecs[: args.recall_queries], args.k))
+    finally:
+        qdrant.client.delete_collection(COLLECTION)
+
+    return {
+        "meta": {
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "git": _git_rev(),
+            "backend": args.backend,
+            "embedder": args.embedder,
+            "n": args.n, "dim": qdrant.VECTOR_SIZE, "queries": args.queries, "k": args.k,
+            "dup_rate": args.dup_rate, "seed": args.seed, "repeat": args.repeat,
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": f"{platform.system()} {platform.machine()}",
+            "elapsed_s": round(time.perf_counter() - t_all, 2),
+        },
+        "results": results,
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float, overrides: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    baseline 대비 current 항목별 상대 변화. better 방향으로 threshold 이상 나빠지면 regression.
+    overrides: 지표 이름 → 개별 허용치 (지연시간 p99처럼 흔들림이 큰 항목용).
+    """
+    overrides = overrides or {}
+    base, cur = baseline["results"], current["results"]
+    rows = []
+    for name in sorted(set(base) | set(cur)):
+        if name not in cur:
+            rows.append({"name": name, "status": "missing"})
+            continue
+        if name not in base:
+            rows.append({"name": name, "status": "new", "current": cur[name]["value"]})
+            continue
+        b, c = base[name]["value"], cur[name]["value"]
+        change = (c - b) / b if b else 0.0
+        worse = -change if base[name]["better"] == "higher" else change
+        limit = overrides.get(name, threshold)
+        status = "regression" if worse > limit else ("improved" if worse < -limit else "ok")
+        rows.append({"name": name, "status": status, "baseline": b, "current": c, "change": change, "unit": base[name]["unit"]})
+    return rows
+
+def gate(rows: List[Dict], allow_missing: bool = False) -> List[str]:
+    """회귀 게이트 실패 항목: regression, 그리고 allow_missing이 아니면 missing(baseline에만 있는 지표)도."""
+    bad = {"regression"} if allow_missing else {"regression", "missing"}
+    return [f"{r['name']} ({r['status']})" for r in rows if r["status"] in bad]
+
+def _print_compare(rows: List[Dict]) -> None:
+    print(f"{'metric':<28} {'baseline':>12} {'current':>12} {'change':>8}  status")
+    for r in rows:
+        if "baseline" in r:
+            print(f"{r['name']:<28} {r['baseline']:>12.3f} {r['current']:>12.3f} {r['change'] * 100:>7.1f}%  {r['status']}")
+        else:
+            print(f"{r['name']:<28} {'':>12} {r.get('current', float('nan')):>12.3f} {'':>8}  {r['status']}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="벤치마크 실행 후 JSON 저장")
+    r.add_argument("--out", default="bench_results/current.json")
+    r.add_argument("--backend", choices=["numpy", "local", "remote"], default="numpy")
+    r.add_argument("--embedder", choices=["stub", "kure"], default="stub", help="kure는 실제 모델 (다운로드/GPU 필요)")
+    r.add_argument("--n", type=int, default=5000, help="합성 피드백 행 수")
+    r.add_argument("--embed-n", type=int, default=2000, help="임베딩 처리량 측정에 쓸 텍스트 수")
+    r.add_argument("--queries", type=int, default=500)
+    r.add_argument("--recall-queries", type=int, default=100)
+    r.add_argument("--k", type=int, default=10)
+    r.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    r.add_argument("--dup-rate", type=float, default=0.1)
+    r.add_argument("--repeat", type=int, default=3, help="처리량 항목은 repeat회 중앙값")
+    r.add_argument("--seed", type=int, default=0)
+
+    c = sub.add_parser("compare", help="baseline 대비 회귀 판정 (회귀 있으면 exit 1)")
+    c.add_argument("baseline")
+    c.add_argument("current")
+    c.add_argument("--threshold", type=float, default=0.10, help="허용 악화 비율 (0.10 = 10%%)")
+    c.add_argument("--allow", action="append", default=[], metavar="METRIC=FRAC", help="지표별 허용치, 예: search.c16.p99_ms=0.3")
+    c.add_argument("--allow-missing", action="store_true", help="baseline에만 있는 지표(missing)를 실패로 보지 않음")
+
+    args = ap.parse_args()
+    if args.cmd == "run":
+        out = run(args)
+        path = Path(args.out)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
+        for name, res in out["results"].items():
+            print(f"{name:<28} {res['value']:>12.3f} {res['unit']}")
+        print(f"saved → {path}")
+    else:
+        overrides = {k: float(v) for k, v in (a.split("=", 1) for a in args.allow)}
+        load = lambda p: json.loads(Path(p).read_text(encoding="utf-8"))
+        rows = compare(load(args.baseline), load(args.current), args.threshold, overrides)
+        _print_compare(rows)
+        failed = gate(rows, args.allow_missing)
+        if failed:
+            print(f"FAIL: {', '.join(failed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# === 오프라인 벤치마크용 합성 한국어 피드백 + 스텁 임베더 + 인메모리 PG 대역 ===
+# 모델/DB/클라우드 없이 ingest·검색 경로를 재현 가능하게 돌리기 위한 것 (seed가 같으면 데이터도 같음).
+from __future__ import annotations
+import datetime as dt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from workers.dedup import shingles
+
+CATEGORIES: Dict[str, List[str]] = {
+    "배송": [
+        "{product} 주문했는데 {days}일째 배송이 안 와요",
+        "배송 조회하면 {days}일째 같은 위치에 멈춰 있습니다",
+        "{product} 택배 박스가 찢어진 채로 도착했어요",
+        "배송 기사님이 문 앞이 아니라 경비실에 두고 가셨어요",
+    ],
+    "결제": [
+        "{product} 결제했는데 {amount}원이 두 번 청구됐어요",
+        "카드 결제 오류가 나는데 돈은 빠져나갔습니다",
+        "쿠폰 적용이 안 돼서 {amount}원을 더 냈어요",
+        "환불 요청한 지 {days}일 지났는데 아직 입금이 안 됐습니다",
+    ],
+    "앱 오류": [
+        "앱 업데이트 후 {screen} 화면에서 계속 튕겨요",
+        "{screen} 화면 로딩이 너무 느립니다",
+        "로그인하면 {screen} 화면이 하얗게 나와요",
+        "알림을 눌러도 {screen} 화면으로 안 넘어가요",
+    ],
+    "회원": [
+        "비밀번호 재설정 메일이 안 와요",
+        "회원 탈퇴를 하려는데 메뉴를 못 찾겠어요",
+        "적립금 {amount}원이 사라졌어요",
+        "본인 인증이 계속 실패합니다",
+    ],
+    "상품 품질": [
+        "{product} 사이즈가 상세페이지랑 달라요",
+        "{product} 색상이 사진과 완전히 다릅니다",
+        "{product} 받자마자 고장났어요",
+        "{product} 냄새가 심해서 못 쓰겠어요",
+    ],
+    "고객센터": [
+        "상담원 연결까지 {days}0분 넘게 기다렸어요",
+        "챗봇이 같은 답만 반복합니다",
+        "문의 남긴 지 {days}일째 답변이 없어요",
+        "전화 상담 시간이 너무 짧아요",
+    ],
+}
+PRODUCTS = ["무선 이어폰", "운동화", "전기포트", "노트북 가방", "블루투스 스피커", "겨울 패딩", "텀블러", "공기청정기", "키보드", "선크림"]
+SCREENS = ["장바구니", "주문 내역", "마이페이지", "결제", "검색", "홈"]
+TAILS = ["", " 빨리 확인 부탁드립니다.", " 너무 불편해요.", " 한두 번이 아니에요.", " 해결 방법 알려주세요.", " 다시는 안 살 것 같아요."]
+
+
+def _fill(rng: np.random.Generator, template: str) -> str:
+    return template.format(
+        product=PRODUCTS[rng.integers(len(PRODUCTS))],
+        screen=SCREENS[rng.integers(len(SCREENS))],
+        days=int(rng.integers(2, 15)),
+        amount=int(rng.integers(1, 100)) * 1000,
+    )
+
+def feedback_rows(n: int, dup_rate: float = 0.1, seed: int = 0, start: Optional[dt.datetime] = None) -> List[Dict]:
+    """
+    search_corpus 행과 같은 모양(id/title/body/category/updated_at)의 합성 피드백 n건.
+    dup_rate 비율은 이전 행을 그대로(또는 공백·문장부호만 바꿔) 다시 쓴 중복.
+    """
+    rng = np.random.default_rng(seed)
+    start = start or dt.datetime(2024, 5, 1, tzinfo=dt.timezone(dt.timedelta(hours=9)))
+    cats = list(CATEGORIES)
+    rows: List[Dict] = []
+    for i in range(1, n + 1):
+        if rows and rng.random() < dup_rate:
+            src = rows[int(rng.integers(len(rows)))]
+            title, body, cat = src["title"], src["body"].replace(" ", "  ") + "!", src["category"]
+        else:
+            cat = cats[int(rng.integers(len(cats)))]
+            templates = CATEGORIES[cat]
+            body = _fill(rng, templates[int(rng.integers(len(templates)))]) + TAILS[int(rng.integers(len(TAILS)))]
+            title = f"[{cat}] " + body.split(" ")[0] + " 관련 문의"
+        rows.append({
+            "id": i,
+            "title": title,
+            "body": body,
+            "category": cat,
+            "updated_at": start + dt.timedelta(minutes=int(rng.integers(0, 90 * 24 * 60))),
+        })
+    return rows
+
+def queries(n: int, seed: int = 1) -> List[str]:
+    """검색 벤치마크용 짧은 질의."""
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        cat = list(CATEGORIES)[int(rng.integers(len(CATEGORIES)))]
+        t = CATEGORIES[cat][int(rng.integers(len(CATEGORIES[cat])))]
+        out.append(_fill(rng, t))
+    return out
+
+
+class HashingEmbedder:
+    """
+    문자 3-gram 해시를 부호 있는 버킷에 더한 뒤 L2 정규화 (feature hashing).
+    KURE 대신 쓰는 결정적 스텁: 글자가 많이 겹치는 문장일수록 코사인이 높아서 recall/중복 판정이 의미 있게 나온다.
+    """
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, t in enumerate(texts):
+            h = np.asarray(shingles(t), dtype=np.uint32)
+            sign = np.where(h & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(out[i], (h >> 1) % self.dim, sign)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        out /= np.maximum(norms, 1e-12)
+        return out
+
+    def embed_batch(self, texts: Iterable[str]) -> List[List[float]]:
+        """workers.embedder.embed_batch와 같은 시그니처."""
+        return self.encode(texts).tolist()
+
+
+class FakePG:
+    """
+    ingest 워커가 쓰는 SQL 4종(SQL_FETCH / HAS_LLM / PUT_LLM / commit)만 흉내 내는 인메모리 연결.
+    workers.ingest_pg_to_qdrant.run(conn=FakePG(rows))로 넘긴다.
+    """
+    def __init__(self, rows: List[Dict]):
+        self.rows = sorted(rows, key=lambda r: r["id"])
+        self.ids = np.asarray([r["id"] for r in self.rows])
+        self.llm_outputs: Dict[int, Tuple[str, str]] = {}
+
+    def cursor(self, cursor_factory=None):
+        return _FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+class _FakeCursor:
+    def __init__(self, db: FakePG):
+        self.db = db
+        self._result: List = []
+
+    def execute(self, sql: str, args: Tuple):
+        if "search_corpus" in sql:
+            last_id, limit = args
+            lo = int(np.searchsorted(self.db.ids, last_id, side="right"))
+            self._result = self.db.rows[lo:lo + limit]
+        elif sql.lstrip().upper().startswith("INSERT"):
+            self.db.llm_outputs.setdefault(args[0], (args[1], args[2]))
+            self._result = []
+        else:
+            hit = self.db.llm_outputs.get(args[0])
+            self._result = [{"normalized": hit[0], "llm_version": hit[1]}] if hit else []
+
+    def fetchall(self):
+        return list(self._result)
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def close(self):
+        pass
+
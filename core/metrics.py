@@ -0,0 +1,232 @@
+# core/metrics.py
+"""
+핫패스 메트릭/트레이싱 (Prometheus 텍스트 포맷 카운터·히스토그램 + 선택적 OpenTelemetry span).
+
+- METRICS_ENABLED=false(기본)면 stage()/inc()/observe()가 바로 반환 → 오버헤드는 함수 호출 1회 수준
+- METRICS_OTEL=true이고 opentelemetry-api가 설치돼 있으면 stage()마다 span도 생성
+- API는 GET /metrics, 워커는 maybe_dump()로 주기적으로 파일/표준출력에 덤프
+
+사용:
+    from core import metrics
+    with metrics.stage(metrics.QDRANT_SECONDS, op="search"):
+        ...
+    metrics.QDRANT_POINTS.inc(len(points), op="upsert")
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from core.config import settings
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:   # 선택 의존성
+    _otel_trace = None
+
+_enabled: bool = settings.METRICS_ENABLED
+_tracer = _otel_trace.get_tracer("feedback") if (_otel_trace is not None and settings.METRICS_OTEL) else None
+_NOOP = nullcontext()
+
+# 지연시간 버킷(초): 1ms ~ 30s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+
+def enabled() -> bool:
+    return _enabled
+
+def enable(on: bool = True) -> None:
+    """런타임에 켜고 끄기 (테스트/벤치마크용)."""
+    global _enabled
+    _enabled = on
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = f"feedback_{name}"
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, value: float = 1.0, **labels) -> None:
+        if not _enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.labelnames, k)} {v:g}" for k, v in sorted(self._values.items())]
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # label key → [버킷별 개수(+Inf 포함), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not _enabled:
+            return
+        key = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += value
+            s[2] += 1
+
+    def count(self, **labels) -> int:
+        s = self._series.get(self._key(labels))
+        return s[2] if s else 0
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, (counts, total, n) in sorted(self._series.items()):
+            acc = 0
+            for le, c in zip(list(self.buckets) + ["+Inf"], counts):
+                acc += c
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, ('le', f'{le:g}' if le != '+Inf' else le))} {acc}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {total:.6f}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {n}")
+        return lines
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+class _Stage:
+    """with 블록 시간을 히스토그램에 기록하고, OTel이 켜져 있으면 같은 이름의 span을 연다."""
+    __slots__ = ("hist", "labels", "span_name", "t0", "_span_cm")
+
+    def __init__(self, hist: Histogram, span_name: Optional[str], labels: Dict[str, str]):
+        self.hist = hist
+        self.labels = labels
+        self.span_name = span_name
+        self._span_cm = None
+
+    def __enter__(self):
+        if _tracer is not None:
+            name = self.span_name or "/".join([self.hist.name, *map(str, self.labels.values())])
+            self._span_cm = _tracer.start_as_current_span(name, attributes={k: str(v) for k, v in self.labels.items()})
+            self._span_cm.__enter__()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.hist.observe(time.perf_counter() - self.t0, **self.labels)
+        if self._span_cm is not None:
+            self._span_cm.__exit__(exc_type, exc, tb)
+        return False
+
+def stage(hist: Histogram, span: Optional[str] = None, **labels):
+    """비활성화 상태면 공용 nullcontext를 돌려줘서 할당/시간측정 비용이 없다."""
+    if not _enabled:
+        return _NOOP
+    return _Stage(hist, span, labels)
+
+
+REGISTRY: List[_Metric] = []
+
+def render() -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    out: List[str] = []
+    for m in REGISTRY:
+        out.append(f"# HELP {m.name} {m.help}")
+        out.append(f"# TYPE {m.name} {m.kind}")
+        out.extend(m.render())
+    return "\n".join(out) + "\n"
+
+def reset() -> None:
+    for m in REGISTRY:
+        m.reset()
+
+
+_last_dump = time.monotonic()
+
+def maybe_dump(force: bool = False) -> bool:
+    """
+    워커용 주기 덤프. METRICS_DUMP_INTERVAL초가 지났으면 METRICS_DUMP_PATH에 덮어쓰기
+    (node_exporter textfile collector 형식), 경로가 없으면 표준출력.
+    """
+    global _last_dump
+    if not _enabled:
+        return False
+    now = time.monotonic()
+    if not force and now - _last_dump < settings.METRICS_DUMP_INTERVAL:
+        return False
+    _last_dump = now
+    text = render()
+    if settings.METRICS_DUMP_PATH:
+        path = Path(settings.METRICS_DUMP_PATH)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)   # 수집기가 반쯤 쓴 파일을 읽지 않도록 rename으로 교체
+    else:
+        print(text, end="")
+    return True
+
+
+# ------------------------------------------------------------
+# 메트릭 정의
+# ------------------------------------------------------------
+EMBED_SECONDS = Histogram("embed_seconds", "임베딩 호출 시간(초)", ["fn"])
+EMBED_BATCH_SIZE = Histogram("embed_batch_size", "embed_batch 입력 텍스트 수", buckets=SIZE_BUCKETS)
+EMBED_TEXTS = Counter("embed_texts_total", "임베딩한 텍스트 수")
+EMBED_TOKENS = Counter("embed_tokens_total", "임베딩 입력 토큰 수 (max_seq_length 절단 후)")
+
+QDRANT_SECONDS = Histogram("qdrant_op_seconds", "벡터 저장소 호출 시간(초)", ["op"])
+QDRANT_POINTS = Counter("qdrant_points_total", "요청/반환 포인트 수", ["op"])
+QDRANT_BYTES = Counter("qdrant_request_bytes_total", "요청 벡터+payload 추정 바이트", ["op"])
+QUERY_PLANS = Counter("query_plan_total", "쿼리 플래너가 고른 검색 계획 수", ["plan"])
+
+INGEST_STAGE_SECONDS = Histogram("ingest_stage_seconds", "ingest 단계별 시간(초)", ["stage"])
+INGEST_ROWS = Counter("ingest_rows_total", "ingest 처리 행 수", ["result"])
+
+API_REQUEST_SECONDS = Histogram("api_request_seconds", "API 요청 처리 시간(초)", ["method", "route", "status"])
+API_STAGE_SECONDS = Histogram("api_stage_seconds", "API 핸들러 내부 단계 시간(초)", ["route", "stage"])
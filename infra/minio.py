@@ -0,0 +1,100 @@
+from __future__ import annotations
+from datetime import timedelta
+from pathlib import Path
+import shutil
+
+from minio import Minio
+
+from core.config import settings
+
+# 멀티파트 업로드 파트 크기 (MinIO/S3 최소 5MiB)
+PART_SIZE = 64 * 1024 * 1024
+
+# 클라이언트 초기화
+# MINIO_ENDPOINT가 없으면 client는 None이고, get_object_store()가 로컬 파일시스템 대체 저장소를 돌려준다.
+# (엔드포인트가 있는데 생성에 실패한 경우는 get_object_store()가 ValueError)
+client: Minio | None = None
+if settings.MINIO_ENDPOINT:
+    try:
+        client = Minio(
+            settings.MINIO_ENDPOINT,
+            access_key=settings.MINIO_ACCESS_KEY,
+            secret_key=settings.MINIO_SECRET_KEY,
+            secure=settings.MINIO_SECURE,
+        )
+        print(f"MinIO 클라이언트 설정 완료: {settings.MINIO_ENDPOINT}")
+    except Exception as e:
+        print(f"MinIO 클라이언트 설정에 실패했습니다: {e}")
+
+
+class MinioObjectStore:
+    """MinIO 버킷 하나에 대한 업/다운로드 래퍼."""
+    def __init__(self, minio_client: Minio, bucket: str = settings.MINIO_BUCKET):
+        self.client = minio_client
+        self.bucket = bucket
+
+    def ensure_bucket(self) -> None:
+        """버킷이 없으면 생성."""
+        if not self.client.bucket_exists(bucket_name=self.bucket):
+            self.client.make_bucket(bucket_name=self.bucket)
+
+    def upload_file(self, object_name: str, file_path: str | Path) -> None:
+        """파일 업로드. PART_SIZE 단위 멀티파트로 스트리밍되므로 큰 파일도 메모리에 올리지 않는다."""
+        self.client.fput_object(
+            bucket_name=self.bucket,
+            object_name=object_name,
+            file_path=str(file_path),
+            part_size=PART_SIZE,
+        )
+
+    def download_file(self, object_name: str, file_path: str | Path) -> None:
+        self.client.fget_object(bucket_name=self.bucket, object_name=object_name, file_path=str(file_path))
+
+    def list_objects(self, prefix: str = "") -> list[str]:
+        return [o.object_name for o in self.client.list_objects(bucket_name=self.bucket, prefix=prefix, recursive=True)]
+
+    def presigned_url(self, object_name: str, expires_seconds: int = 3600) -> str:
+        return self.client.presigned_get_object(
+            bucket_name=self.bucket, object_name=object_name, expires=timedelta(seconds=expires_seconds)
+        )
+
+
+class LocalObjectStore:
+    """
+    MinIO 대체용 로컬 파일시스템 저장소 (테스트/오프라인용).
+    {root}/{bucket}/{object_name} 경로에 파일을 복사한다. MinioObjectStore와 같은 메서드를 제공.
+    """
+    def __init__(self, root: str | Path = settings.MINIO_LOCAL_DIR, bucket: str = settings.MINIO_BUCKET):
+        self.root = Path(root) / bucket
+        self.bucket = bucket
+
+    def ensure_bucket(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def upload_file(self, object_name: str, file_path: str | Path) -> None:
+        dst = self.root / object_name
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(file_path, dst)
+
+    def download_file(self, object_name: str, file_path: str | Path) -> None:
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.root / object_name, file_path)
+
+    def list_objects(self, prefix: str = "") -> list[str]:
+        if not self.root.exists():
+            return []
+        names = [p.relative_to(self.root).as_posix() for p in self.root.rglob("*") if p.is_file()]
+        return sorted(n for n in names if n.startswith(prefix))
+
+    def presigned_url(self, object_name: str, expires_seconds: int = 3600) -> str:
+        return (self.root / object_name).resolve().as_uri()
+
+
+def get_object_store(bucket: str = settings.MINIO_BUCKET) -> MinioObjectStore | LocalObjectStore:
+    """설정에 따라 MinIO 또는 로컬 대체 저장소를 반환 (버킷 보장 포함)."""
+    if settings.MINIO_ENDPOINT and client is None:
+        # 엔드포인트를 지정했는데 로컬 디렉터리에 조용히 쌓이면 스냅샷이 사라진 것처럼 보이므로 실패시킨다
+        raise ValueError(f"MINIO_ENDPOINT={settings.MINIO_ENDPOINT}가 설정됐지만 MinIO 클라이언트 생성에 실패했습니다.")
+    store = MinioObjectStore(client, bucket) if client is not None else LocalObjectStore(bucket=bucket)
+    store.ensure_bucket()
+    return store
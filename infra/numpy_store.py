@@ -0,0 +1,673 @@
+# infra/numpy_store.py
+"""
+순수 NumPy 브루트포스 벡터 저장소 (QDRANT_BACKEND=numpy).
+
+infra/qdrant.py 래퍼와 워커들이 쓰는 QdrantClient 메서드 일부를 같은 시그니처·같은 반환 타입
+(qdrant_client.models)으로 구현해서, `infra.qdrant.client` 자리에 그대로 끼워 쓸 수 있다.
+
+    create_collection / get_collection / collection_exists / delete_collection / create_payload_index
+    upsert / upload_collection / retrieve / delete / count / scroll
+    set_payload / batch_update_points(SetPayload) / facet
+    query_points / query_batch_points / query_points_groups
+      (query: 벡터, point id, NearestQuery, RecommendQuery(average_vector), using=이름 있는 벡터, prefetch)
+
+용도
+- 테스트 대역: Qdrant Cloud 없이 test_qdrant.py 등을 빠르고 결정적으로 실행
+- 정확 검색 오라클: 전체 내적(블록 행렬곱) + argpartition top-k → HNSW/양자화 설정의 recall@k 기준값
+
+필터는 payload를 키별 컬럼(범주형 코드 / 숫자 / 날짜 epoch)으로 캐시해서 벡터화 평가한다.
+지원 조건: FieldCondition(match value/any/except, range, datetime range), HasId, IsEmpty, IsNull,
+중첩 Filter(must / should / must_not).
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from qdrant_client import models
+from qdrant_client.http import models as rest
+
+# 점수 계산 시 한 번에 곱하는 저장 벡터 행 수 (queries x block 점수 행렬만 메모리에 올라감)
+SEARCH_BLOCK = 65536
+
+_DEFAULT = ""     # 이름 없는 단일 벡터 (vectors_config=VectorParams)
+_MISSING = -1     # 값 없음 / None / 빈 리스트
+_MULTI = -2       # 리스트 값 (원소 단위 매칭이 필요해 느린 경로로 평가)
+
+
+def _to_epoch(v: Any) -> float:
+    """RFC3339 / 'YYYY-MM-DD HH:MM:SS' / datetime → UTC epoch 초. 해석 불가면 NaN."""
+    if isinstance(v, datetime):
+        dt = v
+    elif isinstance(v, str):
+        try:
+            dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
+        except ValueError:
+            return np.nan
+    else:
+        return np.nan
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def _get_path(payload: Dict, key: str) -> Any:
+    """'a.b' 형태의 중첩 키 조회."""
+    cur: Any = payload
+    for part in key.split("."):
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(part)
+    return cur
+
+
+class _Column:
+    """payload 한 키의 컬럼 캐시. 쓰기 발생 시 컬렉션 단위로 통째로 무효화된다."""
+    def __init__(self, values: List[Any]):
+        self.values = values
+        self.vocab: Dict[Any, int] = {}
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, v in enumerate(values):
+            if v is None or v == []:
+                codes[i] = _MISSING
+            elif isinstance(v, list):
+                codes[i] = _MULTI
+            else:
+                try:
+                    codes[i] = self.vocab.setdefault(v, len(self.vocab))
+                except TypeError:   # dict 등 해시 불가 값
+                    codes[i] = _MULTI
+        self.codes = codes
+        self._num: Optional[np.ndarray] = None
+        self._dt: Optional[np.ndarray] = None
+
+    @property
+    def num(self) -> np.ndarray:
+        if self._num is None:
+            self._num = np.array(
+                [float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan for v in self.values],
+                dtype=np.float64,
+            )
+        return self._num
+
+    @property
+    def dt(self) -> np.ndarray:
+        if self._dt is None:
+            self._dt = np.array([_to_epoch(v) for v in self.values], dtype=np.float64)
+        return self._dt
+
+    def match_any(self, wanted: Sequence[Any]) -> np.ndarray:
+        codes = [self.vocab[w] for w in wanted if _hashable(w) and w in self.vocab]
+        mask = np.isin(self.codes, codes) if codes else np.zeros(len(self.codes), dtype=bool)
+        multi = np.flatnonzero(self.codes == _MULTI)
+        if len(multi):
+            ws = list(wanted)
+            for i in multi:
+                v = self.values[i]
+                mask[i] = any(x in ws for x in v) if isinstance(v, list) else v in ws
+        return mask
+
+def _hashable(v: Any) -> bool:
+    try:
+        hash(v)
+        return True
+    except TypeError:
+        return False
+
+
+@dataclass
+class _Space:
+    """이름 있는 벡터 하나(또는 이름 없는 단일 벡터)의 저장 배열. 행 번호는 컬렉션 공통."""
+    dim: int
+    distance: models.Distance
+    vectors: np.ndarray = None
+
+    def __post_init__(self):
+        self.vectors = np.empty((0, self.dim), dtype=np.float32)
+
+    def prepare(self, vecs) -> np.ndarray:
+        vecs = np.asarray(vecs, dtype=np.float32).reshape(-1, self.dim)
+        if self.distance == models.Distance.COSINE:
+            norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vecs = vecs / norms
+        return vecs
+
+
+@dataclass
+class _Collection:
+    spaces: Dict[str, _Space]
+    ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    payloads: List[Dict] = field(default_factory=list)
+    size: int = 0
+    row_of: Dict[int, int] = field(default_factory=dict)
+    columns: Dict[str, _Column] = field(default_factory=dict)
+    _id_order: Optional[np.ndarray] = None
+
+    @property
+    def named(self) -> bool:
+        return _DEFAULT not in self.spaces
+
+    def space(self, using: Optional[str]) -> _Space:
+        sp = self.spaces.get(using or _DEFAULT)
+        if sp is None:
+            raise ValueError(f"Wrong input: Vector with name `{using or _DEFAULT}` is not configured in this collection")
+        return sp
+
+    # --- 쓰기 ---
+    def _invalidate(self):
+        self.columns.clear()
+        self._id_order = None
+
+    def _reserve(self, n: int):
+        cap = len(self.ids)
+        if self.size + n <= cap:
+            return
+        new_cap = max(self.size + n, cap * 2, 1024)
+        ids = np.empty(new_cap, dtype=np.int64)
+        ids[:self.size] = self.ids[:self.size]
+        self.ids = ids
+        for sp in self.spaces.values():
+            vecs = np.empty((new_cap, sp.dim), dtype=np.float32)
+            vecs[:self.size] = sp.vectors[:self.size]
+            sp.vectors = vecs
+
+    def upsert(self, ids: Sequence[int], vecs: Dict[str, np.ndarray], payloads: Sequence[Optional[Dict]]):
+        """vecs: 벡터 이름 → (n, dim). 설정된 벡터는 모두 있어야 한다."""
+        missing = set(self.spaces) - set(vecs)
+        if missing:
+            raise ValueError(f"numpy backend: 벡터 누락 {sorted(missing)}")
+        prepared = {name: self.spaces[name].prepare(v) for name, v in vecs.items()}
+        self._reserve(len(ids))
+        for i, (pid, p) in enumerate(zip(ids, payloads)):
+            pid = int(pid)
+            row = self.row_of.get(pid)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.row_of[pid] = row
+                self.ids[row] = pid
+                self.payloads.append(dict(p or {}))
+            else:
+                self.payloads[row] = dict(p or {})
+            for name, v in prepared.items():
+                self.spaces[name].vectors[row] = v[i]
+        self._invalidate()
+
+    def delete(self, ids: Iterable[int]):
+        """swap-remove: 지울 행 자리에 마지막 행을 옮겨 배열을 연속으로 유지."""
+        for pid in ids:
+            row = self.row_of.pop(int(pid), None)
+            if row is None:
+                continue
+            last = self.size - 1
+            if row != last:
+                moved = int(self.ids[last])
+                self.ids[row] = moved
+                for sp in self.spaces.values():
+                    sp.vectors[row] = sp.vectors[last]
+                self.payloads[row] = self.payloads[last]
+                self.row_of[moved] = row
+            self.payloads.pop()
+            self.size -= 1
+        self._invalidate()
+
+    def vector_view(self, row: int, with_vectors):
+        """Record.vector 모양: 단일 벡터면 list, 이름 있는 벡터면 {이름: list} (with_vectors가 이름 목록이면 그것만)."""
+        if not with_vectors:
+            return None
+        if not self.named:
+            return self.spaces[_DEFAULT].vectors[row].tolist()
+        names = with_vectors if isinstance(with_vectors, list) else list(self.spaces)
+        return {n: self.spaces[n].vectors[row].tolist() for n in names if n in self.spaces}
+
+    def set_payload(self, payload: Dict, ids: Iterable[int]):
+        for pid in ids:
+            row = self.row_of.get(int(pid))
+            if row is not None:
+                self.payloads[row].update(payload)
+        self._invalidate()
+
+    # --- 읽기 ---
+    @property
+    def live_ids(self) -> np.ndarray:
+        return self.ids[:self.size]
+
+    def id_order(self) -> np.ndarray:
+        """id 오름차순 행 순서 (scroll용, 쓰기 전까지 캐시)."""
+        if self._id_order is None:
+            self._id_order = np.argsort(self.live_ids, kind="stable")
+        return self._id_order
+
+    def column(self, key: str) -> _Column:
+        col = self.columns.get(key)
+        if col is None:
+            col = self.columns[key] = _Column([_get_path(p, key) for p in self.payloads])
+        return col
+
+    def mask(self, flt: Optional[models.Filter]) -> np.ndarray:
+        if flt is None:
+            return np.ones(self.size, dtype=bool)
+        return self._eval_filter(flt)
+
+    def _eval_filter(self, flt: models.Filter) -> np.ndarray:
+        n = self.size
+        out = np.ones(n, dtype=bool)
+        for c in _as_list(flt.must):
+            out &= self._eval(c)
+        should = _as_list(flt.should)
+        if should:
+            any_ = np.zeros(n, dtype=bool)
+            for c in should:
+                any_ |= self._eval(c)
+            out &= any_
+        for c in _as_list(flt.must_not):
+            out &= ~self._eval(c)
+        return out
+
+    def _eval(self, cond) -> np.ndarray:
+        if isinstance(cond, models.Filter):
+            return self._eval_filter(cond)
+        if isinstance(cond, models.HasIdCondition):
+            return np.isin(self.live_ids, np.asarray([int(i) for i in cond.has_id], dtype=np.int64))
+        if isinstance(cond, models.IsEmptyCondition):
+            return self.column(cond.is_empty.key).codes == _MISSING
+        if isinstance(cond, models.IsNullCondition):
+            col = self.column(cond.is_null.key)
+            return np.array([v is None for v in col.values], dtype=bool) & (col.codes == _MISSING)
+        if isinstance(cond, models.FieldCondition):
+            return self._eval_field(cond)
+        raise NotImplementedError(f"numpy backend: 지원하지 않는 조건 {type(cond).__name__}")
+
+    def _eval_field(self, cond: models.FieldCondition) -> np.ndarray:
+        col = self.column(cond.key)
+        out = np.ones(self.size, dtype=bool)
+        m = cond.match
+        if isinstance(m, models.MatchValue):
+            out &= col.match_any([m.value])
+        elif isinstance(m, models.MatchAny):
+            out &= col.match_any(m.any)
+        elif isinstance(m, models.MatchExcept):
+            out &= ~col.match_any(m.except_) & (col.codes != _MISSING)
+        elif m is not None:
+            raise NotImplementedError(f"numpy backend: 지원하지 않는 match {type(m).__name__}")
+        r = cond.range
+        if r is not None:
+            if isinstance(r, models.DatetimeRange):
+                arr = col.dt
+                bounds = [_to_epoch(b) if b is not None else None for b in (r.gt, r.gte, r.lt, r.lte)]
+            else:
+                arr = col.num
+                bounds = [r.gt, r.gte, r.lt, r.lte]
+            gt, gte, lt, lte = bounds
+            with np.errstate(invalid="ignore"):
+                out &= ~np.isnan(arr)
+                if gt is not None:
+                    out &= arr > gt
+                if gte is not None:
+                    out &= arr >= gte
+                if lt is not None:
+                    out &= arr < lt
+                if lte is not None:
+                    out &= arr <= lte
+        return out
+
+
+def _as_list(x) -> list:
+    if x is None:
+        return []
+    return x if isinstance(x, list) else [x]
+
+def _payload_view(payload: Dict, with_payload) -> Optional[Dict]:
+    if with_payload is True:
+        return dict(payload)
+    if with_payload is False or with_payload is None:
+        return None
+    if isinstance(with_payload, list):
+        return {k: payload[k] for k in with_payload if k in payload}
+    return dict(payload)
+
+
+class NumpyVectorStore:
+    """QdrantClient 호환 인메모리 정확 검색 저장소 (프로세스 로컬, 스레드 안전 X)."""
+
+    def __init__(self, search_block: int = SEARCH_BLOCK):
+        self._cols: Dict[str, _Collection] = {}
+        self.search_block = search_block
+
+    # ------------------------------------------------------------
+    # 컬렉션
+    # ------------------------------------------------------------
+    def _col(self, name: str) -> _Collection:
+        col = self._cols.get(name)
+        if col is None:
+            raise ValueError(f"Collection {name} not found")
+        return col
+
+    def collection_exists(self, collection_name: str, **kwargs) -> bool:
+        return collection_name in self._cols
+
+    def create_collection(self, collection_name: str, vectors_config, **kwargs) -> bool:
+        """vectors_config: VectorParams(이름 없는 단일 벡터) 또는 {이름: VectorParams}. on_disk/hnsw_config 등은 무시."""
+        if collection_name in self._cols:
+            raise ValueError(f"Collection {collection_name} already exists")
+        configs = vectors_config if isinstance(vectors_config, dict) else {_DEFAULT: vectors_config}
+        self._cols[collection_name] = _Collection(
+            spaces={name: _Space(dim=vp.size, distance=vp.distance) for name, vp in configs.items()}
+        )
+        return True
+
+    def recreate_collection(self, collection_name: str, vectors_config, **kwargs) -> bool:
+        self.delete_collection(collection_name)
+        return self.create_collection(collection_name, vectors_config)
+
+    def delete_collection(self, collection_name: str, **kwargs) -> bool:
+        return self._cols.pop(collection_name, None) is not None
+
+    def get_collection(self, collection_name: str, **kwargs) -> rest.CollectionInfo:
+        col = self._col(collection_name)
+        return rest.CollectionInfo(
+            status=rest.CollectionStatus.GREEN,
+            optimizer_status=rest.OptimizersStatusOneOf.OK,
+            points_count=col.size,
+            indexed_vectors_count=0,
+            segments_count=1,
+            payload_schema={},
+            config=rest.CollectionConfig(
+                params=rest.CollectionParams(vectors=_vectors_params(col)),
+                hnsw_config=rest.HnswConfig(m=0, ef_construct=0, full_scan_threshold=0),
+                optimizer_config=rest.OptimizersConfig(
+                    deleted_threshold=0.2, vacuum_min_vector_number=1000, default_segment_number=0,
+                    flush_interval_sec=5,
+                ),
+            ),
+        )
+
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema=None, **kwargs):
+        """필터는 항상 컬럼 캐시로 평가하므로 별도 인덱스가 필요 없다 (호환용 no-op)."""
+        self._col(collection_name)
+        return rest.UpdateResult(operation_id=0, status=rest.UpdateStatus.COMPLETED)
+
+    # ------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------
+    def upsert(self, collection_name: str, points: Sequence[models.PointStruct], wait: bool = True, **kwargs):
+        col = self._col(collection_name)
+        if points:
+            col.upsert([p.id for p in points], _by_name([p.vector for p in points]), [p.payload for p in points])
+        return rest.UpdateResult(operation_id=0, status=rest.UpdateStatus.COMPLETED)
+
+    def upload_collection(self, collection_name: str, vectors, payload: Optional[Iterable[Dict]] = None,
+                          ids: Optional[Iterable[int]] = None, batch_size: int = 64, **kwargs) -> None:
+        """vectors: (n, dim) 배열, {이름: (n, dim) 배열}, 또는 포인트별 벡터(list / {이름: list})의 iterable."""
+        col = self._col(collection_name)
+        if isinstance(vectors, dict):
+            vecs = {name: np.asarray(v, dtype=np.float32) for name, v in vectors.items()}
+        elif isinstance(vectors, np.ndarray):
+            vecs = {_DEFAULT: vectors}
+        else:
+            vecs = _by_name(list(vectors))
+        n = len(next(iter(vecs.values())))
+        id_list = [int(i) for i in ids] if ids is not None else list(range(n))
+        pl = list(payload) if payload is not None else [None] * n
+        col.upsert(id_list, vecs, pl)
+
+    def delete(self, collection_name: str, points_selector, wait: bool = True, **kwargs):
+        col = self._col(collection_name)
+        if isinstance(points_selector, models.PointIdsList):
+            ids = points_selector.points
+        elif isinstance(points_selector, models.FilterSelector):
+            ids = col.live_ids[col.mask(points_selector.filter)].tolist()
+        else:
+            ids = list(points_selector)
+        col.delete(ids)
+        return rest.UpdateResult(operation_id=0, status=rest.UpdateStatus.COMPLETED)
+
+    def set_payload(self, collection_name: str, payload: Dict, points, wait: bool = True, **kwargs):
+        col = self._col(collection_name)
+        if isinstance(points, models.Filter):
+            points = col.live_ids[col.mask(points)].tolist()
+        col.set_payload(payload, points)
+        return rest.UpdateResult(operation_id=0, status=rest.UpdateStatus.COMPLETED)
+
+    def batch_update_points(self, collection_name: str, update_operations: Sequence, wait: bool = True, **kwargs):
+        for op in update_operations:
+            if isinstance(op, models.SetPayloadOperation):
+                self.set_payload(collection_name, op.set_payload.payload, op.set_payload.points)
+            else:
+                raise NotImplementedError(f"numpy backend: 지원하지 않는 연산 {type(op).__name__}")
+        return [rest.UpdateResult(operation_id=0, status=rest.UpdateStatus.COMPLETED) for _ in update_operations]
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    def _record(self, col: _Collection, row: int, with_payload=True, with_vectors=False) -> rest.Record:
+        return rest.Record(
+            id=int(col.ids[row]),
+            payload=_payload_view(col.payloads[row], with_payload),
+            vector=col.vector_view(row, with_vectors),
+        )
+
+    def retrieve(self, collection_name: str, ids: Sequence[int], with_payload=True, with_vectors=False, **kwargs) -> List[rest.Record]:
+        col = self._col(collection_name)
+        rows = [col.row_of[int(i)] for i in ids if int(i) in col.row_of]
+        return [self._record(col, r, with_payload, with_vectors) for r in rows]
+
+    def count(self, collection_name: str, count_filter: Optional[models.Filter] = None, exact: bool = True, **kwargs) -> rest.CountResult:
+        col = self._col(collection_name)
+        return rest.CountResult(count=int(col.mask(count_filter).sum()))
+
+    def scroll(self, collection_name: str, scroll_filter: Optional[models.Filter] = None, limit: int = 10,
+               offset: Optional[int] = None, with_payload=True, with_vectors=False, **kwargs) -> Tuple[List[rest.Record], Optional[int]]:
+        """id 오름차순 페이지. next_offset은 다음 페이지 첫 id (Qdrant와 동일한 의미)."""
+        col = self._col(collection_name)
+        order = col.id_order()
+        sorted_ids = col.live_ids[order]
+        start = 0 if offset is None else int(np.searchsorted(sorted_ids, int(offset), side="left"))
+        rows = order[start:][col.mask(scroll_filter)[order[start:]]]
+        page = rows[:limit]
+        next_offset = int(col.ids[rows[limit]]) if len(rows) > limit else None
+        return [self._record(col, int(r), with_payload, with_vectors) for r in page], next_offset
+
+    def facet(self, collection_name: str, key: str, facet_filter: Optional[models.Filter] = None, limit: int = 10,
+              exact: bool = False, **kwargs) -> rest.FacetResponse:
+        col = self._col(collection_name)
+        c = col.column(key)
+        codes = c.codes[col.mask(facet_filter)]
+        codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(c.vocab)) if len(codes) else np.zeros(len(c.vocab), dtype=np.int64)
+        values = list(c.vocab.keys())
+        top = sorted((i for i in range(len(values)) if counts[i] > 0), key=lambda i: (-counts[i], str(values[i])))[:limit]
+        return rest.FacetResponse(hits=[rest.FacetValueHit(value=values[i], count=int(counts[i])) for i in top])
+
+    # ------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------
+    def _resolve_query(self, col: _Collection, query, using: Optional[str] = None) -> Tuple[np.ndarray, List[int]]:
+        """query → (정규화된 쿼리 벡터, 결과에서 제외할 id 목록). using 벡터 공간 기준."""
+        sp = col.space(using)
+        if isinstance(query, models.NearestQuery):
+            query = query.nearest
+        if isinstance(query, models.RecommendQuery):
+            rec = query.recommend
+            strategy = rec.strategy or models.RecommendStrategy.AVERAGE_VECTOR
+            if strategy != models.RecommendStrategy.AVERAGE_VECTOR:
+                raise NotImplementedError("numpy backend: recommend는 average_vector 전략만 지원")
+            pos = [self._example_vector(col, sp, e) for e in rec.positive or []]
+            neg = [self._example_vector(col, sp, e) for e in rec.negative or []]
+            # Qdrant average_vector: avg(pos) + (avg(pos) - avg(neg))
+            avg_pos = np.mean(pos, axis=0)
+            vec = avg_pos + (avg_pos - np.mean(neg, axis=0)) if neg else avg_pos
+            exclude = [int(e) for e in list(rec.positive or []) + list(rec.negative or []) if _is_id(e)]
+            return sp.prepare(vec)[0], exclude
+        if _is_id(query):
+            return self._example_vector(col, sp, query), [int(query)]
+        return sp.prepare(np.asarray(query, dtype=np.float32))[0], []
+
+    def _example_vector(self, col: _Collection, sp: _Space, example) -> np.ndarray:
+        if _is_id(example):
+            row = col.row_of.get(int(example))
+            if row is None:
+                raise ValueError(f"Point {example} is not found in the collection")
+            return sp.vectors[row]
+        return sp.prepare(np.asarray(example, dtype=np.float32))[0]
+
+    def _scores(self, col: _Collection, sp: _Space, q: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """q: (m, d), rows: 후보 행 → (m, len(rows)) 점수. 높을수록 가까움 (euclid는 음수 거리)."""
+        out = np.empty((len(q), len(rows)), dtype=np.float32)
+        contiguous = len(rows) == col.size   # 필터가 전부 통과면 fancy index 복사 없이 슬라이스
+        for s in range(0, len(rows), self.search_block):
+            e = min(s + self.search_block, len(rows))
+            block = sp.vectors[s:e] if contiguous else sp.vectors[rows[s:e]]
+            if sp.distance == models.Distance.EUCLID:
+                d2 = (q * q).sum(1)[:, None] - 2.0 * (q @ block.T) + (block * block).sum(1)[None, :]
+                out[:, s:s + len(block)] = -np.sqrt(np.maximum(d2, 0.0))
+            else:
+                out[:, s:s + len(block)] = q @ block.T
+        return out
+
+    def _prefetch_rows(self, col: _Collection, prefetch) -> Optional[np.ndarray]:
+        """
+        prefetch(단일 또는 목록) → 후보 행 집합 (목록이면 합집합). 없으면 None(전체).
+        각 단계는 자신의 query/using/filter/limit로 정확 top-k를 뽑고, 중첩 prefetch가 있으면 그 후보 안에서만 고른다.
+        """
+        if prefetch is None:
+            return None
+        stages = prefetch if isinstance(prefetch, list) else [prefetch]
+        rows = []
+        for pf in stages:
+            if pf.query is None:
+                raise NotImplementedError("numpy backend: query 없는 prefetch(fusion 등)는 지원하지 않음")
+            sp = col.space(pf.using)
+            q, exclude = self._resolve_query(col, pf.query, pf.using)
+            r, _ = self._top_rows(col, sp, q, pf.filter, pf.limit or 10, 0, exclude,
+                                  pf.score_threshold, self._prefetch_rows(col, pf.prefetch))
+            rows.append(r)
+        return np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+
+    def _top_rows(self, col: _Collection, sp: _Space, q: np.ndarray, flt, limit: int, offset: int = 0,
+                  exclude: Sequence[int] = (), score_threshold: Optional[float] = None,
+                  candidates: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """단일 쿼리 정확 top-k: (행 번호, 점수) 점수 내림차순. candidates가 있으면 그 행들 안에서만."""
+        mask = col.mask(flt)
+        if candidates is not None:
+            restrict = np.zeros(col.size, dtype=bool)
+            restrict[candidates] = True
+            mask &= restrict
+        for pid in exclude:
+            row = col.row_of.get(pid)
+            if row is not None:
+                mask[row] = False
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return rows, np.empty(0, dtype=np.float32)
+        scores = self._scores(col, sp, q[None, :], rows)[0]
+        k = min(limit + offset, len(rows))
+        part = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        part = part[np.argsort(-scores[part], kind="stable")][offset:]
+        if score_threshold is not None:
+            # euclid 점수는 음수 거리로 들고 있으므로 임계(최대 거리)도 부호를 뒤집어 비교
+            thr = -score_threshold if sp.distance == models.Distance.EUCLID else score_threshold
+            part = part[scores[part] >= thr]
+        return rows[part], scores[part]
+
+    def _scored(self, col: _Collection, sp: _Space, rows: np.ndarray, scores: np.ndarray, with_payload=True, with_vectors=False) -> List[rest.ScoredPoint]:
+        sign = -1.0 if sp.distance == models.Distance.EUCLID else 1.0
+        return [
+            rest.ScoredPoint(
+                id=int(col.ids[r]), version=0, score=float(sign * s),
+                payload=_payload_view(col.payloads[r], with_payload),
+                vector=col.vector_view(r, with_vectors),
+            )
+            for r, s in zip(rows, scores)
+        ]
+
+    def query_points(self, collection_name: str, query=None, using: Optional[str] = None, prefetch=None,
+                     query_filter: Optional[models.Filter] = None, limit: int = 10, offset: Optional[int] = None,
+                     with_payload=True, with_vectors=False, score_threshold: Optional[float] = None,
+                     search_params=None, **kwargs) -> rest.QueryResponse:
+        col = self._col(collection_name)
+        sp = col.space(using)
+        q, exclude = self._resolve_query(col, query, using)
+        rows, scores = self._top_rows(col, sp, q, query_filter, limit, offset or 0, exclude, score_threshold,
+                                      self._prefetch_rows(col, prefetch))
+        return rest.QueryResponse(points=self._scored(col, sp, rows, scores, with_payload, with_vectors))
+
+    def query_batch_points(self, collection_name: str, requests: Sequence[models.QueryRequest], **kwargs) -> List[rest.QueryResponse]:
+        col = self._col(collection_name)
+        # 같은 벡터 공간의 필터 없는 단순 벡터 쿼리들은 한 번의 (m x n) 행렬곱으로 묶어서 처리
+        plain: Dict[str, List[int]] = {}
+        for i, r in enumerate(requests):
+            if (r.filter is None and r.prefetch is None and not r.offset and r.score_threshold is None
+                    and not _is_id(r.query) and not isinstance(r.query, (models.RecommendQuery, models.NearestQuery))):
+                plain.setdefault(r.using or _DEFAULT, []).append(i)
+        out: List[Optional[rest.QueryResponse]] = [None] * len(requests)
+        for using, idx in plain.items():
+            if not col.size:
+                break
+            sp = col.space(using)
+            q = sp.prepare(np.asarray([requests[i].query for i in idx], dtype=np.float32))
+            all_rows = np.arange(col.size)
+            scores = self._scores(col, sp, q, all_rows)
+            for j, i in enumerate(idx):
+                r = requests[i]
+                k = min(r.limit or 10, col.size)
+                part = np.argpartition(-scores[j], k - 1)[:k] if k < col.size else all_rows
+                part = part[np.argsort(-scores[j][part], kind="stable")]
+                out[i] = rest.QueryResponse(points=self._scored(
+                    col, sp, part, scores[j][part], r.with_payload if r.with_payload is not None else False,
+                    r.with_vector or False,
+                ))
+        for i, r in enumerate(requests):
+            if out[i] is None:
+                out[i] = self.query_points(
+                    collection_name, query=r.query, using=r.using, prefetch=r.prefetch, query_filter=r.filter,
+                    limit=r.limit or 10, offset=r.offset,
+                    with_payload=r.with_payload if r.with_payload is not None else False,
+                    with_vectors=r.with_vector or False, score_threshold=r.score_threshold,
+                )
+        return out
+
+    def query_points_groups(self, collection_name: str, group_by: str, query=None, using: Optional[str] = None, prefetch=None,
+                            query_filter: Optional[models.Filter] = None, limit: int = 10, group_size: int = 3,
+                            with_payload=True, with_vectors=False, **kwargs) -> rest.GroupsResult:
+        col = self._col(collection_name)
+        sp = col.space(using)
+        q, exclude = self._resolve_query(col, query, using)
+        # 그룹 키가 있는 포인트만 대상 (Qdrant와 동일)
+        has_key = models.Filter(must_not=[models.IsEmptyCondition(is_empty=models.PayloadField(key=group_by))])
+        flt = models.Filter(must=[query_filter, has_key]) if query_filter is not None else has_key
+        rows, scores = self._top_rows(col, sp, q, flt, col.size, 0, exclude, None, self._prefetch_rows(col, prefetch))
+        groups: Dict[Any, List[int]] = {}
+        order: List[Any] = []
+        for idx, r in enumerate(rows):
+            key = _get_path(col.payloads[r], group_by)
+            if key not in groups:
+                if len(order) >= limit:
+                    continue
+                groups[key] = []
+                order.append(key)
+            if len(groups[key]) < group_size:
+                groups[key].append(idx)
+        return rest.GroupsResult(groups=[
+            rest.PointGroup(id=k, hits=self._scored(col, sp, rows[groups[k]], scores[groups[k]], with_payload, with_vectors))
+            for k in order
+        ])
+
+    # QdrantClient와 같은 방식으로 close 호출이 와도 문제없도록
+    def close(self, **kwargs) -> None:
+        pass
+
+
+def _is_id(x) -> bool:
+    return isinstance(x, (int, np.integer)) and not isinstance(x, bool)
+
+def _by_name(vectors: List) -> Dict[str, np.ndarray]:
+    """포인트별 벡터 목록(list 또는 {이름: list}) → {이름: (n, dim) 배열}."""
+    if vectors and isinstance(vectors[0], dict):
+        return {name: np.asarray([v[name] for v in vectors], dtype=np.float32) for name in vectors[0]}
+    return {_DEFAULT: np.asarray(vectors, dtype=np.float32)}
+
+def _vectors_params(col: _Collection):
+    params = {name: rest.VectorParams(size=sp.dim, distance=sp.distance) for name, sp in col.spaces.items()}
+    return params[_DEFAULT] if not col.named else params
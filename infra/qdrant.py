@@ -1,39 +1,146 @@
+import json
+import math
+import numpy as np
 from qdrant_client import QdrantClient, models
 
 # pydantic-setting 라이브러리를 통해 .env 파일을 읽어오는 설정 객체
 from core.config import settings
+from core import metrics
+from infra.numpy_store import NumpyVectorStore
+from infra import query_planner
+
+def create_client(backend: str = settings.QDRANT_BACKEND):
+    """
+    벡터 저장소 클라이언트 생성. 아래 래퍼 함수들은 백엔드와 무관하게 같은 client 인터페이스를 사용한다.
+    - remote: Qdrant Cloud/서버 (QDRANT_URL, QDRANT_API_KEY)
+    - local : qdrant-client 내장 로컬 모드 (QDRANT_PATH 없으면 메모리)
+    - numpy : infra/numpy_store.py 브루트포스 정확 검색 (테스트 대역 / recall 기준값)
+    """
+    if backend == "remote":
+        if not settings.QDRANT_URL:
+            raise ValueError("QDRANT_BACKEND=remote에는 QDRANT_URL이 필요합니다.")
+        return QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY, timeout=120.0)
+    if backend == "local":
+        return QdrantClient(path=settings.QDRANT_PATH) if settings.QDRANT_PATH else QdrantClient(location=":memory:")
+    if backend == "numpy":
+        return NumpyVectorStore()
+    raise ValueError(f"알 수 없는 QDRANT_BACKEND: {backend}")
 
 # 클라이언트 초기화
-# settings 객체가 .env 파일에서 QDRANT_URL과 QDRANT_API_KEY를 자동으로 읽어온다.
+# settings 객체가 .env 파일에서 QDRANT_BACKEND / QDRANT_URL / QDRANT_API_KEY를 자동으로 읽어온다.
 try:
-    client = QdrantClient(
-        url=settings.QDRANT_URL,
-        api_key=settings.QDRANT_API_KEY,
-        timeout=120.0,
-    )
-    print("Qdrant Cloud에 성공적으로 연결됐습니다.")
+    client = create_client()
+    print(f"Qdrant 클라이언트 준비 완료 (backend={settings.QDRANT_BACKEND})")
 except Exception as e:
-    print(f"Qdrant Cloud 연결에 실패했습니다: {e}")
+    print(f"Qdrant 연결에 실패했습니다: {e}")
 
 # 상수 정의
 VECTOR_SIZE = 1024  # KURE-v1 모델의 벡터 차원(1024)
 DISTANCE_METRIC = models.Distance.COSINE # 벡터 유사도 계산 방식(코사인 유사도로 진행)
 
+# 압축 벡터 레이아웃(COMPACT_VECTOR 설정 시)의 이름 있는 벡터
+FULL_VECTOR = "full"        # 1024차원 원본: on_disk + HNSW 없음 (후보 재정렬에만 사용)
+COMPACT_VECTOR = "compact"  # COMPACT_DIM차원 투영: HNSW 탐색용
+
+def vectors_config():
+    """COMPACT_VECTOR가 없으면 기존 이름 없는 단일 벡터, 있으면 full + compact."""
+    if not settings.COMPACT_VECTOR:
+        return models.VectorParams(size=VECTOR_SIZE, distance=DISTANCE_METRIC)
+    return {
+        FULL_VECTOR: models.VectorParams(
+            size=VECTOR_SIZE, distance=DISTANCE_METRIC, on_disk=True, hnsw_config=models.HnswConfigDiff(m=0),
+        ),
+        COMPACT_VECTOR: models.VectorParams(size=settings.COMPACT_DIM, distance=DISTANCE_METRIC),
+    }
+
+def _projector():
+    from workers.compact import get_projector   # 압축 레이아웃일 때만 필요 (PCA 모델 지연 로드)
+    return get_projector()
+
+def storage_vectors(full):
+    """(n, 1024) 임베딩 → upload_collection용 벡터. 압축 레이아웃이면 {full, compact} 이름별 배열."""
+    full = np.asarray(full, dtype=np.float32)
+    if not settings.COMPACT_VECTOR:
+        return full
+    return {FULL_VECTOR: full, COMPACT_VECTOR: _projector().transform(full)}
+
+def point_vectors(full: list[list[float]]) -> list:
+    """임베딩 목록 → PointStruct.vector 목록 (압축 레이아웃이 아니면 입력 그대로)."""
+    if not settings.COMPACT_VECTOR:
+        return full
+    stored = storage_vectors(full)
+    return [{name: v[i].tolist() for name, v in stored.items()} for i in range(len(full))]
+
+def full_vector(record) -> list[float]:
+    """scroll/retrieve 결과에서 1024차원 원본 벡터 (레이아웃 무관)."""
+    v = record.vector
+    return v[FULL_VECTOR] if isinstance(v, dict) else v
+
+def _two_stage(query, filters: models.Filter, top_k: int, ef: int | None = None) -> dict:
+    """
+    압축 레이아웃이면 compact 벡터로 top_k*COMPACT_OVERSAMPLE개 후보를 뽑고(prefetch) full 벡터로 재정렬.
+    point id / RecommendQuery는 서버가 각 단계의 using 벡터로 그대로 해석하므로 투영하지 않는다.
+    (qdrant-client local 모드는 query_points_groups의 prefetch 안 point id를 지원하지 않음 → 그 조합은 remote/numpy에서만)
+    """
+    if not settings.COMPACT_VECTOR:
+        return {}
+    coarse = query
+    if isinstance(query, (list, np.ndarray)):
+        coarse = _projector().transform(query)[0].tolist()
+    return {
+        "using": FULL_VECTOR,
+        "prefetch": models.Prefetch(
+            query=coarse, using=COMPACT_VECTOR, filter=filters, limit=_candidates(top_k),
+            params=models.SearchParams(hnsw_ef=ef) if ef else None,
+        ),
+    }
+
+def _candidates(top_k: int) -> int:
+    return max(top_k, math.ceil(top_k * settings.COMPACT_OVERSAMPLE))
+
+def _plan(filters: models.Filter, top_k: int, collection_name: str) -> query_planner.QueryPlan:
+    """쿼리 플래너(infra/query_planner.py) 호출. 압축 레이아웃이면 ef 기준은 prefetch 후보 수."""
+    compact = bool(settings.COMPACT_VECTOR)
+    return query_planner.plan(client, collection_name, filters, _candidates(top_k) if compact else top_k, compact)
+
+def _plan_kwargs(plan: query_planner.QueryPlan, query, filters: models.Filter, top_k: int, params_key: str = "search_params") -> dict:
+    """
+    계획 → query_points 인자 (using / prefetch / 검색 파라미터). QueryRequest(배치)는 params_key="params".
+    - exact  : SearchParams(exact=True), 압축 레이아웃이면 prefetch 없이 full 벡터로
+    - hnsw   : SearchParams(hnsw_ef=ef)
+    - rescore: compact 후보(prefetch, hnsw_ef=ef) → full 재정렬
+    """
+    if plan.kind == "exact":
+        kw = {params_key: models.SearchParams(exact=True)}
+        if settings.COMPACT_VECTOR:
+            kw["using"] = FULL_VECTOR
+        return kw
+    if plan.kind == "rescore":
+        return _two_stage(query, filters, top_k, plan.ef)
+    return {params_key: models.SearchParams(hnsw_ef=plan.ef)} if plan.ef else {}
+
+def _search_kwargs(query, filters: models.Filter, top_k: int, collection_name: str) -> dict:
+    return _plan_kwargs(_plan(filters, top_k, collection_name), query, filters, top_k)
+
 def get_collection_info(collection_name: str = settings.QDRANT_COLLECTION):
     """컬렉션 메타 정보를 조회."""
     return client.get_collection(collection_name=collection_name)
 
 def delete_collection(collection_name: str = settings.QDRANT_COLLECTION):
-    """컬렉션 삭제(테스트용)."""
+    """컬렉션 삭제(테스트용). 중복 별칭 컬렉션도 함께 삭제."""
+    query_planner.invalidate(collection_name)
+    client.delete_collection(collection_name=dup_alias_collection(collection_name))
     return client.delete_collection(collection_name=collection_name)
 
-def scroll_points(collection_name: str, flt: models.Filter | None = None, limit: int = 100, with_payload: bool = True):
-    """필터로 포인트 스크롤 조회(테스트 편의용)."""
+def scroll_points(collection_name: str, flt: models.Filter | None = None, limit: int = 100, with_payload: bool = True, offset=None, with_vectors: bool = False):
+    """필터로 포인트 스크롤 조회. 다음 페이지는 반환된 next_offset을 offset으로 넘겨 이어서 조회."""
     points, next_offset = client.scroll(
         collection_name=collection_name,
         scroll_filter=flt,
         limit=limit,
+        offset=offset,
         with_payload=with_payload,
+        with_vectors=with_vectors,
     )
     return points, next_offset
 
@@ -48,12 +155,10 @@ def initialize_qdrant(collection_name: str = settings.QDRANT_COLLECTION):
         print(f"Collection '{collection_name}'이 이미 존재합니다.")
     except Exception:
         print(f"Collection '{collection_name}'을 찾을 수 없어 새로 생성합니다.")
+        query_planner.invalidate(collection_name)   # 같은 이름으로 다시 만든 경우 이전 카운트 추정치 버림
         client.create_collection(
             collection_name=collection_name,
-            vectors_config=models.VectorParams(
-                size=VECTOR_SIZE,
-                distance=DISTANCE_METRIC # 코사인 유사도
-            )
+            vectors_config=vectors_config(),  # 코사인 유사도 (압축 레이아웃이면 full + compact)
         )
         print("Collection 생성 완료")
 
@@ -64,6 +169,23 @@ def initialize_qdrant(collection_name: str = settings.QDRANT_COLLECTION):
             field_name="category", # 예시를 들자면 "제품 불만", "기능 문의" 등 빠르게 조회해야 하는 필드들
             field_schema=models.PayloadSchemaType.KEYWORD
         )
+        # 중복 클러스터 접기(group_by) 용
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name="dup_cluster_id",
+            field_schema=models.PayloadSchemaType.INTEGER
+        )
+        # 토픽 클러스터 집계(facet) 및 기간 필터용
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name="cluster_id",
+            field_schema=models.PayloadSchemaType.INTEGER
+        )
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name="updated_at",
+            field_schema=models.PayloadSchemaType.DATETIME
+        )
         # 아래와 같이 추가로 인덱스 여러개 생성 가능
         # field_name에 들어가는 문자열은 나중에 Qdrant에 저장할 데이터(Payload)의 'Key' 이름과 정확히 일치해야 한다.
         # client.create_payload_index(
@@ -77,16 +199,239 @@ def initialize_qdrant(collection_name: str = settings.QDRANT_COLLECTION):
 # points 리스트의 각 원소는 models.PointStruct 타입
 def upsert_points(points: list[models.PointStruct], collection_name: str = settings.QDRANT_COLLECTION):
     """여러 데이터 포인트를 Qdrant에 저장(upsert)합니다"""
+    with metrics.stage(metrics.QDRANT_SECONDS, op="upsert"):
+        client.upsert(
+            collection_name=collection_name,
+            points=points,
+            wait=True, # 작업이 완료될 때까지 기다리기
+        )
+    if metrics.enabled():
+        metrics.QDRANT_POINTS.inc(len(points), op="upsert")
+        metrics.QDRANT_BYTES.inc(_estimate_bytes(points), op="upsert")
+
+def _estimate_bytes(points: list[models.PointStruct]) -> int:
+    """요청 크기 추정치: float32 벡터 + payload JSON 길이 (메트릭 켜져 있을 때만 계산)."""
+    total = 0
+    for p in points:
+        vecs = p.vector.values() if isinstance(p.vector, dict) else [p.vector]
+        total += sum(4 * len(v) for v in vecs if isinstance(v, list))
+        total += len(json.dumps(p.payload or {}, ensure_ascii=False, default=str).encode("utf-8"))
+    return total
+
+def delete_points(ids: list[int], collection_name: str = settings.QDRANT_COLLECTION):
+    """id 목록의 포인트 삭제 (없는 id는 무시됨)."""
+    with metrics.stage(metrics.QDRANT_SECONDS, op="delete"):
+        client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=ids),
+            wait=True,
+        )
+
+def _query(query, filters: models.Filter, top_k: int, collapse: bool, collection_name: str, op: str = "search"):
+    """
+    query_points 공통 경로.
+    collapse=True면 dup_cluster_id로 그룹핑해 그룹당 최고 점수 1건만 반환.
+    (중복 행은 적재 때 이미 삭제되므로, 여기서 접히는 것은 ingest가 DEDUP_COLLAPSE_THRESHOLD로 묶은 느슨한 근접 중복.
+     dup_cluster_id가 없는 포인트는 그룹 검색에서 빠지므로, 중복 제거 적재 이후 데이터에서 사용)
+    """
+    with metrics.stage(metrics.QDRANT_SECONDS, op=op):
+        if not collapse:
+            hits = client.query_points(
+                collection_name=collection_name,
+                query=query,
+                query_filter=filters,
+                limit=top_k,
+                **_search_kwargs(query, filters, top_k, collection_name),
+            ).points
+        else:
+            groups = client.query_points_groups(
+                collection_name=collection_name,
+                query=query,
+                query_filter=filters,
+                group_by="dup_cluster_id",
+                limit=top_k,
+                group_size=1,
+                **_search_kwargs(query, filters, top_k, collection_name),
+            ).groups
+            hits = [g.hits[0] for g in groups if g.hits]
+    metrics.QDRANT_POINTS.inc(len(hits), op=op)
+    return hits
+
+def search_points(query_vector: list[float], filters: models.Filter = None, top_k: int = 5, collection_name: str = settings.QDRANT_COLLECTION, collapse: bool = False):
+    return _query(query_vector, filters, top_k, collapse, collection_name, op="search")
+
+# 저장된 벡터 기반 검색 ("이것과 비슷한 피드백")
+# 이미 Qdrant에 있는 포인트의 벡터를 서버 쪽에서 그대로 사용하므로 임베딩 모델을 거치지 않는다.
+# 쿼리로 쓴 포인트 자신은 결과에서 자동으로 제외된다.
+def search_similar(point_id: int, filters: models.Filter = None, top_k: int = 5, collection_name: str = settings.QDRANT_COLLECTION, collapse: bool = False):
+    """point id(= pg_id)의 저장 벡터로 유사 포인트 검색."""
+    return _query(point_id, filters, top_k, collapse, collection_name, op="similar")
+
+def search_similar_batch(point_ids: list[int], filters: models.Filter = None, top_k: int = 5, collection_name: str = settings.QDRANT_COLLECTION):
+    """여러 point id에 대한 유사 검색을 한 번의 왕복(query_batch_points)으로 처리. 입력 순서대로 결과 반환."""
+    plan = _plan(filters, top_k, collection_name)
+    requests = [
+        models.QueryRequest(query=pid, filter=filters, limit=top_k, with_payload=True,
+                            **_plan_kwargs(plan, pid, filters, top_k, "params"))
+        for pid in point_ids
+    ]
+    with metrics.stage(metrics.QDRANT_SECONDS, op="similar_batch"):
+        responses = client.query_batch_points(collection_name=collection_name, requests=requests)
+    metrics.QDRANT_POINTS.inc(sum(len(r.points) for r in responses), op="similar_batch")
+    return [r.points for r in responses]
+
+def search_batch(query_vectors: list[list[float]], filters: models.Filter = None, top_k: int = 5, collection_name: str = settings.QDRANT_COLLECTION):
+    """여러 쿼리 벡터를 한 번의 왕복(query_batch_points)으로 검색. 입력 순서대로 결과 반환."""
+    plan = _plan(filters, top_k, collection_name)
+    requests = [
+        models.QueryRequest(query=v, filter=filters, limit=top_k, with_payload=True,
+                            **_plan_kwargs(plan, v, filters, top_k, "params"))
+        for v in query_vectors
+    ]
+    with metrics.stage(metrics.QDRANT_SECONDS, op="search_batch"):
+        responses = client.query_batch_points(collection_name=collection_name, requests=requests)
+    metrics.QDRANT_POINTS.inc(sum(len(r.points) for r in responses), op="search_batch")
+    return [r.points for r in responses]
+
+def iter_points(collection_name: str = settings.QDRANT_COLLECTION, flt: models.Filter | None = None, page_size: int = 1000,
+                with_payload=True, with_vectors=False):
+    """필터에 맞는 포인트 전체를 scroll 페이지 단위로 흘려보냄 (한 번에 한 페이지만 메모리에 있음)."""
+    offset = None
+    while True:
+        with metrics.stage(metrics.QDRANT_SECONDS, op="scroll"):
+            points, offset = client.scroll(
+                collection_name=collection_name, scroll_filter=flt, limit=page_size, offset=offset,
+                with_payload=with_payload, with_vectors=with_vectors,
+            )
+        yield from points
+        if offset is None or not points:
+            return
+
+def iter_query_points(query_vector: list[float], filters: models.Filter = None, limit: int = 10000, score_threshold: float | None = None,
+                      page_size: int = 1000, collection_name: str = settings.QDRANT_COLLECTION, with_payload=True, with_vectors=False):
+    """
+    유사도 순 상위 limit개(또는 score_threshold 이상)를 page_size씩 offset 페이지로 흘려보냄.
+    offset이 커질수록 페이지 비용이 늘어나므로 limit은 수만 건 이내로 제한해서 사용.
+    """
+    sent = 0
+    while sent < limit:
+        n = min(page_size, limit - sent)
+        with metrics.stage(metrics.QDRANT_SECONDS, op="export_query"):
+            points = client.query_points(
+                collection_name=collection_name, query=query_vector, query_filter=filters, limit=n, offset=sent,
+                score_threshold=score_threshold, with_payload=with_payload, with_vectors=with_vectors,
+                **_search_kwargs(query_vector, filters, sent + n, collection_name),
+            ).points
+        yield from points
+        sent += len(points)
+        if len(points) < n:
+            return
+
+def recommend_points(positive: list[int], negative: list[int] | None = None, filters: models.Filter = None, top_k: int = 5, collection_name: str = settings.QDRANT_COLLECTION):
+    """positive/negative 예시 포인트로 추천 검색(서버 측 recommend). 예시 포인트는 결과에서 제외된다."""
+    query = models.RecommendQuery(recommend=models.RecommendInput(positive=positive, negative=negative or []))
+    with metrics.stage(metrics.QDRANT_SECONDS, op="recommend"):
+        hits = client.query_points(
+            collection_name=collection_name,
+            query=query,
+            query_filter=filters,
+            limit=top_k,
+            **_search_kwargs(query, filters, top_k, collection_name),
+        ).points
+    metrics.QDRANT_POINTS.inc(len(hits), op="recommend")
+    return hits
+
+def nearest_existing(query_vectors: list[list[float]], before_id: int, collection_name: str = settings.QDRANT_COLLECTION):
+    """
+    각 벡터의 최근접 기존 포인트 1건 (pg_id < before_id 인 것만, 없으면 None, payload는 dup_cluster_id만).
+    ingest에서 벡터 유사도 기반 근접 중복 판정 / collapse 그룹 지정에 사용. 한 번의 왕복으로 배치 처리.
+    """
+    flt = models.Filter(must=[models.FieldCondition(key="pg_id", range=models.Range(lt=before_id))])
+    plan = _plan(flt, 1, collection_name)
+    requests = [models.QueryRequest(query=v, filter=flt, limit=1, with_payload=["dup_cluster_id"], **_plan_kwargs(plan, v, flt, 1, "params"))
+                for v in query_vectors]
+    with metrics.stage(metrics.QDRANT_SECONDS, op="nearest_existing"):
+        responses = client.query_batch_points(collection_name=collection_name, requests=requests)
+    return [r.points[0] if r.points else None for r in responses]
+
+# 중복 제거로 삭제된 포인트 → 대표 포인트 별칭 (pg_id로 유사 검색할 때 대표로 연결)
+# 대표 payload에 멤버 전체를 넣으면 템플릿성 문의에서 끝없이 커지므로, 별도 컬렉션에 중복 id당 작은 포인터 포인트 하나씩 둔다.
+DUP_ALIAS_SUFFIX = "__dup_alias"
+
+def dup_alias_collection(collection_name: str = settings.QDRANT_COLLECTION) -> str:
+    return f"{collection_name}{DUP_ALIAS_SUFFIX}"
+
+def upsert_dup_aliases(rep_by_id: dict[int, int], collection_name: str = settings.QDRANT_COLLECTION):
+    """중복 id → 대표 id 기록 (포인트 id = 중복 pg_id, 1차원 더미 벡터 + payload rep_id)."""
+    if not rep_by_id:
+        return
+    alias = dup_alias_collection(collection_name)
+    if not client.collection_exists(alias):
+        client.create_collection(alias, vectors_config=models.VectorParams(size=1, distance=models.Distance.DOT))
     client.upsert(
+        collection_name=alias,
+        points=[models.PointStruct(id=dup, vector=[1.0], payload={"rep_id": rep}) for dup, rep in rep_by_id.items()],
+        wait=True,
+    )
+
+def resolve_point_ids(ids: list[int], collection_name: str = settings.QDRANT_COLLECTION) -> list[int]:
+    """
+    컬렉션에 없는 id를 중복 별칭으로 대표 id에 매핑 (있는 id와 별칭도 없는 id는 그대로).
+    유사 검색이 point not found로 실패했을 때만 호출하므로 정상 경로에는 왕복이 추가되지 않는다.
+    """
+    if not ids:
+        return []
+    found = {int(r.id) for r in client.retrieve(collection_name, ids=ids, with_payload=False)}
+    missing = [i for i in ids if i not in found]
+    alias = dup_alias_collection(collection_name)
+    if not missing or not client.collection_exists(alias):
+        return list(ids)
+    rep_of = {int(r.id): int(r.payload["rep_id"]) for r in client.retrieve(alias, ids=missing, with_payload=True)}
+    return [rep_of.get(i, i) for i in ids]
+
+def retrieve_payload_fields(ids: list[int], keys: list[str], collection_name: str = settings.QDRANT_COLLECTION) -> dict[int, dict]:
+    """
+    이미 저장된 포인트들의 payload 중 keys만 조회 (값이 있는 포인트만 반환).
+    upsert는 payload 전체를 덮어쓰므로, 다른 잡이 기록한 필드(cluster_id 등)를 재적재 때 보존하는 용도.
+    """
+    if not ids:
+        return {}
+    records = client.retrieve(collection_name, ids=ids, with_payload=list(keys), with_vectors=False)
+    return {int(r.id): r.payload for r in records if r.payload}
+
+def set_payloads(payload_by_id: dict[int, dict], collection_name: str = settings.QDRANT_COLLECTION):
+    """포인트별로 다른 payload 일부를 한 번의 왕복(batch_update_points)으로 갱신 (지정한 키만 덮어씀)."""
+    if not payload_by_id:
+        return
+    client.batch_update_points(
         collection_name=collection_name,
-        points=points,
-        wait=True, # 작업이 완료될 때까지 기다리기
+        update_operations=[
+            models.SetPayloadOperation(set_payload=models.SetPayload(payload=payload, points=[pid]))
+            for pid, payload in payload_by_id.items()
+        ],
+        wait=True,
     )
 
-def search_points(query_vector: list[float], filters: models.Filter = None, top_k: int = 5, collection_name: str = settings.QDRANT_COLLECTION):
-    return client.query_points(
+def set_payload_by_value(key: str, ids_by_value: dict, collection_name: str = settings.QDRANT_COLLECTION, chunk: int = 1000):
+    """
+    같은 값을 가질 포인트들을 묶어서 payload[key]=value 설정 (예: cluster_id → 포인트 id 목록).
+    값마다 SetPayload 연산 하나, chunk 개 id씩 잘라서 batch_update_points 한 번에 전송.
+    """
+    ops = [
+        models.SetPayloadOperation(set_payload=models.SetPayload(payload={key: value}, points=ids[i:i + chunk]))
+        for value, ids in ids_by_value.items()
+        for i in range(0, len(ids), chunk)
+    ]
+    for i in range(0, len(ops), 64):
+        client.batch_update_points(collection_name=collection_name, update_operations=ops[i:i + 64], wait=True)
+
+def facet_counts(key: str, filters: models.Filter = None, limit: int = 10, exact: bool = False, collection_name: str = settings.QDRANT_COLLECTION):
+    """payload key 값별 포인트 수 (상위 limit개). key에 payload index가 있어야 한다."""
+    hits = client.facet(
         collection_name=collection_name,
-        query=query_vector,
-        query_filter=filters,
-        limit=top_k
-    ).points
+        key=key,
+        facet_filter=filters,
+        limit=limit,
+        exact=exact,
+    ).hits
+    return [(h.value, h.count) for h in hits]
@@ -0,0 +1,102 @@
+# infra/query_planner.py
+"""
+필터 검색 실행 계획 (정확 검색 vs HNSW ef 조정 vs compact 후보 + full 재정렬).
+
+필터에 맞는 포인트 수를 count(exact=False)로 추정해 (payload index가 있으면 인덱스 카디널리티로 바로 계산됨)
+컬렉션/필터별로 PLANNER_CACHE_TTL초 동안 캐시하고, 추정치에 따라 계획을 고른다.
+
+- exact  : 추정 건수 <= PLANNER_EXACT_THRESHOLD
+           → 매칭 포인트 몇 개만 전수 비교 (HNSW 필터 탐색보다 빠르고 recall 1.0)
+           압축 레이아웃이면 prefetch 없이 full 벡터로 바로 정확 검색
+- hnsw   : 단일 벡터 레이아웃. hnsw_ef = clamp(limit * PLANNER_EF_PER_K, PLANNER_EF_MIN, PLANNER_EF_MAX),
+           선택도가 PLANNER_SELECTIVE_RATIO 미만이면 2배 (어느 경우에도 PLANNER_EF_MAX를 넘지 않음.
+           limit이 ef보다 크면 Qdrant가 내부에서 max(ef, limit)로 탐색하므로 export 큰 페이지도 HNSW 그대로)
+           (필터 HNSW 탐색은 조건에 안 맞는 이웃을 건너뛰므로 탐색 폭을 넓혀야 recall 유지)
+- rescore: 압축 레이아웃. compact HNSW(같은 ef 규칙, 후보 수 기준)로 후보 → full 벡터 재정렬
+
+PLANNER_ENABLED=false(기본값)면 추정 없이 기존 동작(기본 ef의 hnsw / 압축 레이아웃이면 rescore)을 그대로 쓴다.
+numpy/local 백엔드는 항상 정확 검색이라 계획은 기록만 되고 결과는 같다.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import threading
+import time
+
+from qdrant_client import models
+
+from core import metrics
+from core.config import settings
+
+CACHE_MAX = 4096   # 기간 필터 조합이 많아도 캐시가 무한히 커지지 않도록 (넘치면 비움)
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    kind: str              # "exact" | "hnsw" | "rescore"
+    estimate: int          # 필터에 맞는 포인트 수 추정치 (필터 없으면 전체 수)
+    total: int             # 컬렉션 전체 포인트 수 추정치
+    ef: Optional[int] = None   # hnsw/rescore 탐색 폭 (None이면 서버 기본값)
+
+    @property
+    def selectivity(self) -> float:
+        return self.estimate / self.total if self.total else 0.0
+
+    def describe(self) -> str:
+        ef = f" ef={self.ef}" if self.ef else ""
+        if self.estimate < 0:   # PLANNER_ENABLED=false (추정 안 함)
+            return f"{self.kind}{ef} (planner off)"
+        return f"{self.kind}{ef} est={self.estimate}/{self.total} ({self.selectivity:.2%})"
+
+
+_counts: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_lock = threading.Lock()
+
+def estimate_count(client, collection_name: str, flt: Optional[models.Filter]) -> int:
+    """필터에 맞는 포인트 수 추정치 (컬렉션+필터 JSON 키로 PLANNER_CACHE_TTL초 캐시)."""
+    key = (collection_name, flt.model_dump_json(exclude_none=True) if flt is not None else "")
+    now = time.monotonic()
+    hit = _counts.get(key)
+    if hit is not None and now - hit[0] < settings.PLANNER_CACHE_TTL:
+        return hit[1]
+    with metrics.stage(metrics.QDRANT_SECONDS, op="count_estimate"):
+        n = client.count(collection_name=collection_name, count_filter=flt, exact=False).count
+    with _lock:
+        if len(_counts) >= CACHE_MAX:
+            _counts.clear()
+        _counts[key] = (now, n)
+    return n
+
+def invalidate(collection_name: Optional[str] = None) -> None:
+    """카운트 캐시 비우기 (대량 적재/삭제 직후 바로 반영하고 싶을 때, 테스트용)."""
+    with _lock:
+        if collection_name is None:
+            _counts.clear()
+        else:
+            for key in [k for k in _counts if k[0] == collection_name]:
+                del _counts[key]
+
+
+def hnsw_ef(limit: int, selectivity: float) -> int:
+    ef = max(settings.PLANNER_EF_MIN, limit * settings.PLANNER_EF_PER_K)
+    if selectivity < settings.PLANNER_SELECTIVE_RATIO:
+        ef *= 2
+    return min(ef, settings.PLANNER_EF_MAX)
+
+def plan(client, collection_name: str, flt: Optional[models.Filter], limit: int, compact: bool = False) -> QueryPlan:
+    """
+    limit: 최종 반환 건수 (compact면 prefetch 후보 수를 넘긴다 → ef도 후보 수 기준).
+    """
+    approx = "rescore" if compact else "hnsw"
+    if not settings.PLANNER_ENABLED:
+        return QueryPlan(approx, -1, -1)
+    total = estimate_count(client, collection_name, None)
+    estimate = total if flt is None else estimate_count(client, collection_name, flt)
+    if estimate <= settings.PLANNER_EXACT_THRESHOLD:
+        p = QueryPlan("exact", estimate, total)
+    else:
+        p = QueryPlan(approx, estimate, total, hnsw_ef(limit, estimate / total if total else 0.0))
+    metrics.QUERY_PLANS.inc(plan=p.kind)
+    if settings.PLANNER_LOG:
+        print(f"[planner] {collection_name} limit={limit} → {p.describe()}")
+    return p
@@ -0,0 +1,5 @@
+import os
+
+# 테스트 기본 벡터 저장소는 NumPy 브루트포스 백엔드 (Qdrant Cloud 없이 빠르고 결정적으로 실행)
+# 실제 Qdrant로 돌리려면: QDRANT_BACKEND=remote python -m pytest
+os.environ.setdefault("QDRANT_BACKEND", "numpy")
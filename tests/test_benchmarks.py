@@ -0,0 +1,30 @@
+import numpy as np
+
+from benchmarks.suite import compare, gate
+from benchmarks.synthetic import HashingEmbedder, feedback_rows
+
+def _res(**values):
+    better = {"qps": "higher", "p99_ms": "lower", "recall": "higher"}
+    return {"results": {k: {"value": v, "unit": "", "better": better[k]} for k, v in values.items()}}
+
+def test_compare_flags_regressions_by_direction():
+    base = _res(qps=100.0, p99_ms=10.0, recall=0.95)
+    cur = _res(qps=85.0, p99_ms=10.5, recall=0.96)
+    status = {r["name"]: r["status"] for r in compare(base, cur, threshold=0.1)}
+    assert status == {"qps": "regression", "p99_ms": "ok", "recall": "ok"}
+    # 지표별 허용치 / 지연 증가도 회귀
+    status = {r["name"]: r["status"] for r in compare(base, _res(qps=85.0, p99_ms=20.0), 0.1, {"qps": 0.2})}
+    assert status == {"qps": "ok", "p99_ms": "regression", "recall": "missing"}
+
+def test_gate_fails_on_missing_metrics_unless_allowed():
+    rows = compare(_res(qps=100.0, recall=0.95), _res(qps=100.0), threshold=0.1)
+    assert gate(rows) == ["recall (missing)"]   # 측정이 빠진 채로 통과하지 않음
+    assert gate(rows, allow_missing=True) == []
+
+def test_synthetic_data_is_deterministic_and_embeddable():
+    a, b = feedback_rows(200, seed=3), feedback_rows(200, seed=3)
+    assert [r["body"] for r in a] == [r["body"] for r in b]
+    emb = HashingEmbedder(dim=256).encode([a[0]["body"], a[0]["body"] + "!", a[1]["body"]])
+    assert np.allclose(np.linalg.norm(emb, axis=1), 1.0, atol=1e-5)
+    # 문장부호만 다른 문장은 거의 같은 벡터
+    assert emb[0] @ emb[1] > 0.99
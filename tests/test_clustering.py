@@ -0,0 +1,76 @@
+import numpy as np
+
+from workers.clustering import MiniBatchKMeans, keywords, label_clusters
+
+
+def _blobs(n_per: int = 200, dim: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = np.eye(dim, dtype=np.float32)[:3] * 3
+    topics = np.repeat(np.arange(3), n_per)
+    x = centers[topics] + 0.3 * rng.standard_normal((len(topics), dim)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True), topics
+
+def test_minibatch_kmeans_separates_topics():
+    """잘 분리된 3개 토픽은 각각 하나의 클러스터로 묶여야 함"""
+    x, topics = _blobs()
+    km = MiniBatchKMeans(n_clusters=3, batch_size=128).fit(x)
+    labels, scores = km.predict(x)
+    for t in range(3):
+        assert len(set(labels[topics == t])) == 1
+    assert len(set(labels)) == 3
+    assert np.allclose(np.linalg.norm(km.centroids, axis=1), 1.0, atol=1e-5)
+    assert scores.min() > 0.5
+
+def test_incremental_assignment_keeps_centroids():
+    """증분 실행: 저장된 센트로이드 상태로 새 점을 같은 토픽 클러스터에 할당"""
+    x, topics = _blobs()
+    km = MiniBatchKMeans(n_clusters=3, batch_size=128).fit(x)
+    restored = MiniBatchKMeans.from_state(km.centroids, km.counts)
+    new_x, new_topics = _blobs(n_per=20, seed=1)
+    before, _ = restored.predict(new_x)
+    restored.partial_fit(new_x)
+    after, _ = restored.predict(new_x)
+    assert (before == after).all()
+    assert (before == km.predict(new_x)[0]).all()
+    assert restored.counts.sum() == km.counts.sum() + len(new_x)
+
+def test_label_clusters():
+    titles = ["배송 지연 문의", "배송 지연 너무 늦음", "결제 오류", "결제 실패 오류"]
+    labels = np.array([0, 0, 1, 1])
+    scores = np.array([0.9, 0.8, 0.7, 0.95], dtype=np.float32)
+    info = label_clusters(labels, scores, titles, ids=[10, 11, 12, 13], n_clusters=2, n_repr=1)
+    assert info[0]["size"] == 2 and info[0]["label"].startswith("배송 / 지연")
+    assert info[1]["representatives"] == [{"id": 13, "title": "결제 실패 오류"}]
+    assert keywords(["문의 관련", "문의"]) == []
+
+def test_reingest_keeps_cluster_id(monkeypatch):
+    """ingest 재실행(payload 전체 upsert)이 topic_cluster가 기록한 cluster_id를 지우지 않는다"""
+    import contextlib
+    import datetime as dt
+    import io
+
+    from benchmarks.synthetic import FakePG
+    from core.config import settings
+    from infra import qdrant
+    from workers import ingest_pg_to_qdrant, topic_cluster
+
+    rng = np.random.default_rng(0)
+    vecs = {i: rng.standard_normal(qdrant.VECTOR_SIZE).tolist() for i in (1, 2, 3)}
+    embed = lambda texts: [vecs[int(t.split()[-1])] for t in texts]
+    rows = [{"id": i, "title": "문의", "body": f"내용 {i}", "category": "앱", "updated_at": dt.datetime(2024, 5, i)}
+            for i in (1, 2, 3)]
+    monkeypatch.setattr(settings, "DEDUP_NEAR_THRESHOLD", None)
+    monkeypatch.setattr(settings, "DEDUP_VECTOR_THRESHOLD", None)
+    name = "test_reingest_cluster_id"   # 전용 컬렉션 (QDRANT_BACKEND=remote여도 운영 컬렉션을 건드리지 않음)
+    qdrant.delete_collection(name)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest_pg_to_qdrant.run(conn=FakePG(rows), embed=embed, collection_name=name)
+            topic_cluster.write_cluster_ids(np.array([1, 2]), np.array([7, 8]), collection_name=name)
+            rows[0]["title"] = "수정된 문의"
+            ingest_pg_to_qdrant.run(conn=FakePG(rows), embed=embed, collection_name=name)
+        got = {p.id: p.payload for p in qdrant.client.retrieve(name, ids=[1, 2, 3])}
+        assert (got[1]["title"], got[1]["cluster_id"], got[2]["cluster_id"]) == ("수정된 문의", 7, 8)
+        assert "cluster_id" not in got[3]   # 아직 할당 안 된 포인트는 그대로 증분 대상
+    finally:
+        qdrant.delete_collection(name)
@@ -0,0 +1,63 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from core.config import settings
+from infra import qdrant
+from workers.compact import CompactProjector, model_path, get_projector, set_projector
+
+@pytest.fixture
+def compact_layout(tmp_path):
+    saved = (settings.COMPACT_VECTOR, settings.COMPACT_DIM, settings.COMPACT_MODEL_DIR, settings.COMPACT_OVERSAMPLE,
+             settings.PLANNER_EXACT_THRESHOLD)
+    settings.COMPACT_VECTOR, settings.COMPACT_DIM, settings.COMPACT_MODEL_DIR = "pca", 64, str(tmp_path)
+    settings.PLANNER_EXACT_THRESHOLD = 0   # 작은 테스트 컬렉션도 정확 검색 대신 2단계 경로를 타도록
+    set_projector(None)
+    yield
+    (settings.COMPACT_VECTOR, settings.COMPACT_DIM, settings.COMPACT_MODEL_DIR, settings.COMPACT_OVERSAMPLE,
+     settings.PLANNER_EXACT_THRESHOLD) = saved
+    set_projector(None)
+
+def _low_rank(n, rank=32, seed=0):
+    """임베딩처럼 실제 분산이 일부 축에 몰린 데이터."""
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal((n, rank)) @ rng.standard_normal((rank, qdrant.VECTOR_SIZE))
+    x += 0.05 * rng.standard_normal(x.shape)
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+def test_projector_save_load_and_version_check(compact_layout):
+    x = _low_rank(500)
+    p = CompactProjector.fit_pca(x, 64)
+    assert p.explained > 0.95
+    p.save(model_path())
+    loaded = get_projector()
+    assert np.allclose(loaded.transform(x[:5]), p.transform(x[:5]), atol=1e-5)
+
+    set_projector(None)
+    settings.EMBEDDING_VERSION, prev = "other-model", settings.EMBEDDING_VERSION
+    try:
+        with pytest.raises(FileNotFoundError):   # 다른 임베딩 버전의 모델은 찾지 않음
+            get_projector()
+    finally:
+        settings.EMBEDDING_VERSION = prev
+
+def test_two_stage_search_matches_exact(compact_layout):
+    x = _low_rank(2000)
+    set_projector(CompactProjector.fit_pca(x, 64))
+    name = "compact_test"
+    qdrant.client.delete_collection(name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        qdrant.initialize_qdrant(name)
+    try:
+        qdrant.client.upload_collection(name, vectors=qdrant.storage_vectors(x), ids=range(1, len(x) + 1))
+        for qi in (3, 50, 999):
+            q = x[qi] + 0.02 * np.random.default_rng(qi).standard_normal(x.shape[1]).astype(np.float32)
+            exact = (np.argsort(-(x @ q))[:10] + 1).tolist()
+            hits = qdrant.search_points(q.tolist(), top_k=10, collection_name=name)
+            assert [h.id for h in hits] == exact
+            # 점수는 compact가 아니라 full 벡터 코사인
+            assert abs(hits[0].score - float(x[exact[0] - 1] @ q / np.linalg.norm(q))) < 1e-4
+    finally:
+        qdrant.client.delete_collection(name)
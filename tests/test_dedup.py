@@ -0,0 +1,119 @@
+from workers.dedup import Deduper, MinHasher, estimate_jaccard, normalize_for_hash, text_hash
+
+
+def test_normalize_and_hash():
+    """공백/구두점/대소문자 차이는 같은 해시로 취급"""
+    assert normalize_for_hash("  배송이   너무 늦어요!!  ") == "배송이 너무 늦어요"
+    assert text_hash("배송이 너무 늦어요!!") == text_hash("배송이  너무 늦어요 ~")
+    assert text_hash("배송이 너무 늦어요") != text_hash("배송이 너무 빨라요")
+
+def test_minhash_jaccard_estimate():
+    """거의 같은 문장은 높게, 다른 문장은 낮게 추정"""
+    h = MinHasher(num_perm=128)
+    a = h.signature("앱 업데이트 이후 로그인이 계속 풀려요. 확인 부탁드립니다.")
+    b = h.signature("앱 업데이트 이후 로그인이 계속 풀려요. 확인 부탁드려요.")
+    c = h.signature("배송 기사님이 너무 친절하셨어요")
+    assert estimate_jaccard(a, b) > 0.7
+    assert estimate_jaccard(a, c) < 0.2
+
+def test_deduper_clusters():
+    """완전 중복/근접 중복은 첫 행(대표) 클러스터로 묶이고 통계에 반영"""
+    d = Deduper(near_threshold=0.7)
+    base = "결제 오류가 발생했습니다. 카드 결제 시 계속 실패하고 있어요. 빠른 확인 부탁드립니다."
+    assert d.check(1, base) == (None, None)
+    assert d.check(2, base + "!!") == (1, "exact")
+    assert d.check(3, base.replace("부탁드립니다", "부탁드려요")) == (1, "near")
+    assert d.check(4, "배송이 늦어요") == (None, None)
+
+    d.merge(4, 1)  # 임베딩 이후 벡터 유사도로 병합된 경우
+    assert d.check(5, "배송이 늦어요") == (1, "exact")
+
+    assert d.clusters == {1: [1, 2, 3, 4, 5]}
+    assert (d.stats.rows, d.stats.exact, d.stats.near, d.stats.vector) == (5, 2, 1, 1)
+
+def test_ingest_dup_aliases_and_in_batch_vector_merge(monkeypatch):
+    """중복 행은 삭제되지만 별칭으로 대표에 연결되고, 같은 배치 안의 벡터 근접 중복도 병합된다"""
+    import contextlib
+    import datetime as dt
+    import io
+
+    import numpy as np
+    from fastapi.testclient import TestClient
+
+    from apps.api.main import app
+    from benchmarks.synthetic import FakePG
+    from core.config import settings
+    from infra import qdrant
+    from workers import ingest_pg_to_qdrant
+
+    rng = np.random.default_rng(0)
+    login, other = rng.standard_normal((2, qdrant.VECTOR_SIZE))
+    # "로그인"이 들어간 문장은 모두 같은 벡터 → 텍스트는 달라도 벡터 유사도로만 중복 판정되는 경우
+    embed = lambda texts: [(login if "로그인" in t else other).tolist() for t in texts]
+    now = dt.datetime(2024, 5, 1)
+    rows = [
+        {"id": i, "title": "문의", "body": body, "category": "앱", "updated_at": now}
+        for i, body in [(1, "로그인 오류가 납니다"), (2, "로그인 오류가 납니다!!"), (3, "로그인이 자꾸 풀려요"),
+                        (4, "배송이 늦어요")]
+    ]
+    monkeypatch.setattr(settings, "DEDUP_NEAR_THRESHOLD", None)
+    monkeypatch.setattr(settings, "DEDUP_VECTOR_THRESHOLD", 0.99)
+    monkeypatch.setattr(ingest_pg_to_qdrant, "DUP_MEMBERS_MAX", 2)
+    # 전용 컬렉션 (QDRANT_BACKEND=remote로 돌려도 운영 컬렉션을 건드리지 않도록), 라우터도 이 컬렉션을 보게 함
+    name = "test_dedup_aliases"
+    monkeypatch.setattr(settings, "QDRANT_COLLECTION", name)
+    qdrant.delete_collection(name)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest_pg_to_qdrant.run(conn=FakePG(rows), embed=embed, collection_name=name)
+        rep = qdrant.client.retrieve(name, ids=[1, 2, 3, 4])
+        assert [p.id for p in rep] == [1, 4]
+        assert (rep[0].payload["dup_members"], rep[0].payload["dup_count"]) == ([1, 2], 3)   # 멤버 목록은 상한까지만
+
+        assert qdrant.resolve_point_ids([2, 3, 4, 99], collection_name=name) == [1, 1, 4, 99]
+        api = TestClient(app)
+        assert api.get("/search/similar/3").json()["hits"][0]["id"] == 4   # 삭제된 중복 id도 대표로 검색
+        assert api.get("/search/similar/99").status_code == 404
+    finally:
+        qdrant.delete_collection(name)
+
+
+def test_collapse_merges_loose_near_duplicates(monkeypatch):
+    """삭제할 만큼은 아닌 근접 중복은 따로 저장되지만 같은 dup_cluster_id → collapse=true면 그룹당 1건"""
+    import contextlib
+    import datetime as dt
+    import io
+
+    import numpy as np
+
+    from benchmarks.synthetic import FakePG
+    from core.config import settings
+    from infra import qdrant
+    from workers import ingest_pg_to_qdrant
+
+    rng = np.random.default_rng(1)
+    base, other = rng.standard_normal((2, qdrant.VECTOR_SIZE))
+    # 1~3: base 주변(서로 코사인 ~0.96), 4: 무관한 벡터
+    vecs = {i: base + 0.2 * rng.standard_normal(qdrant.VECTOR_SIZE) for i in (1, 2, 3)}
+    vecs[4] = other
+    embed = lambda texts: [vecs[int(t.split()[-1])].tolist() for t in texts]
+    rows = [{"id": i, "title": "문의", "body": f"내용 {i}", "category": "앱", "updated_at": dt.datetime(2024, 5, 1)}
+            for i in (1, 2, 3, 4)]
+    monkeypatch.setattr(settings, "DEDUP_NEAR_THRESHOLD", None)
+    monkeypatch.setattr(settings, "DEDUP_VECTOR_THRESHOLD", 0.99)
+    monkeypatch.setattr(settings, "DEDUP_COLLAPSE_THRESHOLD", 0.9)
+    monkeypatch.setattr(ingest_pg_to_qdrant, "BATCH", 2)   # 이전 배치 포인트와 같은 배치 앞선 행 둘 다 거치도록
+    name = "test_dedup_collapse"
+    qdrant.delete_collection(name)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest_pg_to_qdrant.run(conn=FakePG(rows), embed=embed, collection_name=name)
+        stored = {p.id: p.payload["dup_cluster_id"] for p in qdrant.client.retrieve(name, ids=[1, 2, 3, 4])}
+        assert stored == {1: 1, 2: 1, 3: 1, 4: 4}   # 벡터는 4개 모두 저장
+
+        plain = qdrant.search_points(base.tolist(), top_k=3, collection_name=name)
+        collapsed = qdrant.search_points(base.tolist(), top_k=3, collection_name=name, collapse=True)
+        assert sorted(p.id for p in plain) == [1, 2, 3]
+        assert [p.id for p in collapsed][1:] == [4] and collapsed[0].id in (1, 2, 3)
+    finally:
+        qdrant.delete_collection(name)
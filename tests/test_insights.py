@@ -0,0 +1,16 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+
+
+@pytest.mark.parametrize("params", [
+    {"date_from": "bad"},
+    {"date_to": "2024-13-01"},
+    {"date_from": "2024-06-01", "date_to": "2024-05-01"},
+    {"date_from": "1000-01-01", "date_to": "2024-05-01", "bucket": "month"},   # 기간 상한
+    {"date_from": "2023-01-01", "date_to": "2024-05-01", "bucket": "day"},     # 버킷 수 상한
+])
+def test_topic_trends_rejects_bad_or_huge_ranges(params):
+    """잘못된 날짜/너무 긴 기간은 facet 집계 전에 422"""
+    assert TestClient(app).get("/insights/topics", params=params).status_code == 422
@@ -0,0 +1,83 @@
+import pytest
+
+from core import metrics
+
+
+@pytest.fixture
+def on():
+    prev = metrics.enabled()
+    metrics.enable(True)
+    metrics.reset()
+    yield
+    metrics.reset()
+    metrics.enable(prev)
+
+def test_disabled_records_nothing():
+    prev = metrics.enabled()
+    metrics.enable(False)
+    try:
+        metrics.reset()
+        with metrics.stage(metrics.QDRANT_SECONDS, op="search"):
+            pass
+        metrics.QDRANT_POINTS.inc(5, op="search")
+        assert metrics.QDRANT_SECONDS.count(op="search") == 0
+        assert metrics.QDRANT_POINTS.value(op="search") == 0
+    finally:
+        metrics.enable(prev)
+
+def test_histogram_and_counter_render(on):
+    h = metrics.EMBED_BATCH_SIZE
+    for v in (1, 3, 3, 5000):
+        h.observe(v)
+    metrics.QDRANT_POINTS.inc(3, op='up"sert')
+    text = metrics.render()
+    # 누적 버킷: le=1 → 1, le=4 → 3, +Inf → 4
+    assert 'feedback_embed_batch_size_bucket{le="1"} 1' in text
+    assert 'feedback_embed_batch_size_bucket{le="4"} 3' in text
+    assert 'feedback_embed_batch_size_bucket{le="+Inf"} 4' in text
+    assert "feedback_embed_batch_size_count 4" in text
+    assert 'feedback_qdrant_points_total{op="up\\"sert"} 3' in text
+    assert "# TYPE feedback_qdrant_op_seconds histogram" in text
+
+def test_stage_times_qdrant_wrapper(on):
+    from qdrant_client import models
+    from infra import qdrant
+
+    name = "metrics_test"
+    qdrant.client.create_collection(name, vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE))
+    try:
+        qdrant.upsert_points([models.PointStruct(id=1, vector=[1.0, 0, 0, 0], payload={"t": "가"}),
+                              models.PointStruct(id=2, vector=[0.9, 0.1, 0, 0], payload={})], collection_name=name)
+        qdrant.search_points([1.0, 0, 0, 0], top_k=3, collection_name=name)
+        qdrant.search_similar_batch([1, 2], top_k=3, collection_name=name)
+        qdrant.recommend_points([1], top_k=3, collection_name=name)
+    finally:
+        qdrant.client.delete_collection(name)
+    assert metrics.QDRANT_SECONDS.count(op="upsert") == 1
+    assert metrics.QDRANT_SECONDS.count(op="search") == 1
+    assert metrics.QDRANT_POINTS.value(op="upsert") == 2
+    assert metrics.QDRANT_POINTS.value(op="similar_batch") == 2   # 각 id가 서로를 1건씩
+    assert metrics.QDRANT_POINTS.value(op="recommend") == 1
+    assert metrics.QDRANT_BYTES.value(op="upsert") > 16
+
+def test_metrics_endpoint_and_route_label(on):
+    """요청 지연은 라우트 템플릿 라벨로 기록되고 /metrics에 노출, 처리 안 된 예외도 500으로 기록"""
+    from fastapi.testclient import TestClient
+    from apps.api.main import app
+
+    @app.get("/_boom/{tag}/detail", include_in_schema=False)
+    def boom(tag: str):
+        raise RuntimeError("boom")
+    try:
+        api = TestClient(app, raise_server_exceptions=False)
+        api.get("/health")
+        # 경로 값이 다른 세그먼트와 같아도("detail") 템플릿 그대로
+        assert api.get("/_boom/detail/detail").status_code == 500
+        api.get("/no/such/path")
+        text = api.get("/metrics").text
+    finally:
+        app.router.routes.pop()
+    assert metrics.API_REQUEST_SECONDS.count(method="GET", route="/health", status=200) == 1
+    assert metrics.API_REQUEST_SECONDS.count(method="GET", route="/_boom/{tag}/detail", status=500) == 1
+    assert metrics.API_REQUEST_SECONDS.count(method="GET", route="unmatched", status=404) == 1
+    assert 'feedback_api_request_seconds_count{method="GET",route="/health",status="200"} 1' in text
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient, models
+
+from infra.numpy_store import NumpyVectorStore
+
+# NumPy 백엔드가 qdrant-client 로컬 모드(정확 검색)와 같은 결과를 내는지 비교
+COLLECTION = "parity"
+DIM = 32
+N = 500
+
+@pytest.fixture(scope="module")
+def stores():
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((N, DIM)).astype(np.float32)
+    points = [
+        models.PointStruct(
+            id=i + 1,
+            vector=vecs[i].tolist(),
+            payload={
+                "category": ["A", "B", "C"][i % 3],
+                "score": float(i % 50),
+                "updated_at": f"2024-05-{1 + i % 28:02d} 10:00:00+09:00",
+                "dup_cluster_id": (i + 1) // 3,
+                "tags": ["x"] if i % 7 == 0 else [],
+            },
+        )
+        for i in range(N)
+    ]
+    out = []
+    for store in (NumpyVectorStore(search_block=128), QdrantClient(location=":memory:")):
+        store.create_collection(COLLECTION, vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE))
+        store.upsert(COLLECTION, points=points)
+        out.append(store)
+    return out, rng
+
+FILTERS = [
+    None,
+    models.Filter(must=[models.FieldCondition(key="category", match=models.MatchValue(value="B"))]),
+    models.Filter(must=[models.FieldCondition(key="score", range=models.Range(gte=10, lt=20))]),
+    models.Filter(
+        must=[models.FieldCondition(key="updated_at", range=models.DatetimeRange(gte="2024-05-10", lte="2024-05-12T00:00:00Z"))],
+        must_not=[models.FieldCondition(key="category", match=models.MatchAny(any=["A"]))],
+    ),
+    models.Filter(should=[
+        models.HasIdCondition(has_id=[1, 2, 3, 400]),
+        models.FieldCondition(key="tags", match=models.MatchValue(value="x")),
+    ]),
+    models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="tags"))]),
+]
+
+@pytest.mark.parametrize("flt", FILTERS)
+def test_query_and_count_match_qdrant(stores, flt):
+    (np_store, qd), rng = stores
+    q = rng.standard_normal(DIM).tolist()
+    a = np_store.query_points(COLLECTION, query=q, query_filter=flt, limit=10)
+    b = qd.query_points(COLLECTION, query=q, query_filter=flt, limit=10)
+    assert [p.id for p in a.points] == [p.id for p in b.points]
+    assert np.allclose([p.score for p in a.points], [p.score for p in b.points], atol=1e-4)
+    assert np_store.count(COLLECTION, count_filter=flt).count == qd.count(COLLECTION, count_filter=flt).count
+
+def test_query_by_id_recommend_and_batch(stores):
+    (np_store, qd), rng = stores
+    for s in (np_store, qd):
+        assert 7 not in [p.id for p in s.query_points(COLLECTION, query=7, limit=5).points]
+    rec = models.RecommendQuery(recommend=models.RecommendInput(positive=[5, 6], negative=[9]))
+    assert [p.id for p in np_store.query_points(COLLECTION, query=rec, limit=5).points] == \
+           [p.id for p in qd.query_points(COLLECTION, query=rec, limit=5).points]
+
+    reqs = [models.QueryRequest(query=rng.standard_normal(DIM).tolist(), limit=3) for _ in range(4)]
+    reqs.append(models.QueryRequest(query=11, limit=3, filter=FILTERS[1]))
+    a = np_store.query_batch_points(COLLECTION, requests=reqs)
+    b = qd.query_batch_points(COLLECTION, requests=reqs)
+    assert [[p.id for p in r.points] for r in a] == [[p.id for p in r.points] for r in b]
+
+    with pytest.raises(ValueError):
+        np_store.query_points(COLLECTION, query=99999, limit=1)
+
+def test_scroll_groups_and_facet(stores):
+    (np_store, qd), rng = stores
+    flt = FILTERS[1]
+    def all_ids(s):
+        ids, offset = [], None
+        while True:
+            page, offset = s.scroll(COLLECTION, scroll_filter=flt, limit=37, offset=offset)
+            ids += [p.id for p in page]
+            if offset is None:
+                return ids
+    assert all_ids(np_store) == all_ids(qd)
+
+    q = rng.standard_normal(DIM).tolist()
+    ga = np_store.query_points_groups(COLLECTION, query=q, group_by="dup_cluster_id", limit=5, group_size=1).groups
+    gb = qd.query_points_groups(COLLECTION, query=q, group_by="dup_cluster_id", limit=5, group_size=1).groups
+    assert [(g.id, g.hits[0].id) for g in ga] == [(g.id, g.hits[0].id) for g in gb]
+
+    fa = np_store.facet(COLLECTION, key="category", facet_filter=FILTERS[2], limit=10).hits
+    fb = qd.facet(COLLECTION, key="category", facet_filter=FILTERS[2], limit=10).hits
+    assert sorted((h.value, h.count) for h in fa) == sorted((h.value, h.count) for h in fb)
+
+def test_writes_update_filters():
+    """delete / set_payload 이후 컬럼 캐시가 무효화되어 필터 결과에 반영되는지"""
+    s = NumpyVectorStore()
+    s.create_collection("w", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    s.upsert("w", points=[models.PointStruct(id=i, vector=[1.0, float(i)], payload={"c": "A"}) for i in range(1, 6)])
+    only_b = models.Filter(must=[models.FieldCondition(key="c", match=models.MatchValue(value="B"))])
+    assert s.count("w", count_filter=only_b).count == 0
+    s.set_payload("w", payload={"c": "B"}, points=[2, 4])
+    assert s.count("w", count_filter=only_b).count == 2
+    s.delete("w", points_selector=models.PointIdsList(points=[2, 1]))
+    assert s.count("w").count == 3
+    assert [r.id for r in s.retrieve("w", ids=[1, 3, 4, 5])] == [3, 4, 5]
+    assert [p.id for p in s.query_points("w", query=[1.0, 5.0], query_filter=only_b, limit=3).points] == [4]
+
+def test_named_vectors_and_prefetch_match_qdrant():
+    """full + compact 이름 있는 벡터, compact prefetch → full 재정렬 (2단계 검색 경로)"""
+    rng = np.random.default_rng(1)
+    full = rng.standard_normal((300, DIM)).astype(np.float32)
+    small = full[:, :8]
+    cfg = {"full": models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+           "compact": models.VectorParams(size=8, distance=models.Distance.COSINE)}
+    res = []
+    for s in (NumpyVectorStore(), QdrantClient(location=":memory:")):
+        s.create_collection("nv", vectors_config=cfg)
+        s.upload_collection("nv", vectors={"full": full[:200], "compact": small[:200]}, ids=range(1, 201))
+        s.upsert("nv", points=[models.PointStruct(id=i + 1, vector={"full": full[i].tolist(), "compact": small[i].tolist()},
+                                                  payload={"c": i % 2}) for i in range(200, 300)])
+        q = full[7] + 0.1
+        pf = models.Prefetch(query=q[:8].tolist(), using="compact", limit=30)
+        two = s.query_points("nv", query=q.tolist(), using="full", prefetch=pf, limit=5).points
+        by_id = s.query_points("nv", query=7, using="full",
+                               prefetch=models.Prefetch(query=7, using="compact", limit=30), limit=5).points
+        rec = s.retrieve("nv", ids=[3], with_vectors=True)[0].vector
+        res.append(([p.id for p in two], [p.id for p in by_id], sorted(rec), s.count("nv").count))
+    assert res[0][:2] == res[1][:2]
+    assert res[0][2] == res[1][2] == ["compact", "full"]
+    assert res[0][3] == res[1][3] == 300
@@ -49,4 +49,31 @@ def test_qdrant_search_and_filter():
     filtered_results = qdrant.search_points(query_vector=query_vector, filters=filter_b, top_k=1, collection_name=TEST_COLLECTION_NAME)
 
     assert filtered_results[0].id == 2
-    print("필터링 검색 테스트")
\ No newline at end of file
+    print("필터링 검색 테스트")
+
+
+def test_qdrant_search_similar():
+    """저장 벡터 기반 유사 검색(임베딩 없이 point id로 검색) 테스트"""
+    # 쿼리로 쓴 포인트 자신은 결과에서 제외된다
+    results = qdrant.search_similar(1, top_k=5, collection_name=TEST_COLLECTION_NAME)
+    assert [p.id for p in results] == [2]
+
+    # 텍스트 검색과 동일한 필터 적용 (category A는 자기 자신뿐 → 결과 없음)
+    filter_a = models.Filter(must=[models.FieldCondition(key="category", match=models.MatchValue(value="A"))])
+    assert qdrant.search_similar(1, filters=filter_a, top_k=5, collection_name=TEST_COLLECTION_NAME) == []
+
+    batch = qdrant.search_similar_batch([1, 2], top_k=1, collection_name=TEST_COLLECTION_NAME)
+    assert [[p.id for p in pts] for pts in batch] == [[2], [1]]
+    print("유사 검색 테스트 통과")
+
+def test_qdrant_search_batch_and_iter():
+    """배치 검색은 개별 검색과 같은 결과, iter_* 는 페이지 경계와 무관하게 전체를 순서대로 흘려보냄"""
+    queries = [np.random.rand(1024).tolist() for _ in range(3)]
+    batch = qdrant.search_batch(queries, top_k=2, collection_name=TEST_COLLECTION_NAME)
+    single = [qdrant.search_points(q, top_k=2, collection_name=TEST_COLLECTION_NAME) for q in queries]
+    assert [[p.id for p in pts] for pts in batch] == [[p.id for p in pts] for pts in single]
+
+    assert sorted(p.id for p in qdrant.iter_points(TEST_COLLECTION_NAME, page_size=1)) == [1, 2]
+    ranked = list(qdrant.iter_query_points(queries[0], page_size=1, collection_name=TEST_COLLECTION_NAME))
+    assert [p.id for p in ranked] == [p.id for p in single[0]]
+    print("배치 검색/스트리밍 테스트 통과")
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from core.config import settings
+from infra import qdrant, query_planner
+from infra.numpy_store import NumpyVectorStore
+
+COLLECTION = "planner_test"
+
+def _cat(value):
+    return models.Filter(must=[models.FieldCondition(key="category", match=models.MatchValue(value=value))])
+
+@pytest.fixture
+def store():
+    # 전체 10000건: common 9000 / mid 900 / rare 100
+    s = NumpyVectorStore()
+    s.create_collection(COLLECTION, vectors_config=models.VectorParams(size=8, distance=models.Distance.COSINE))
+    cats = ["common"] * 9000 + ["mid"] * 900 + ["rare"] * 100
+    s.upload_collection(COLLECTION, vectors=np.random.default_rng(0).standard_normal((len(cats), 8)).astype(np.float32),
+                        payload=({"category": c} for c in cats), ids=range(1, len(cats) + 1))
+    saved = (settings.PLANNER_ENABLED, settings.PLANNER_EXACT_THRESHOLD)
+    settings.PLANNER_ENABLED, settings.PLANNER_EXACT_THRESHOLD = True, 500
+    query_planner.invalidate()
+    yield s
+    settings.PLANNER_ENABLED, settings.PLANNER_EXACT_THRESHOLD = saved
+    query_planner.invalidate()
+
+def test_plan_by_filter_selectivity(store):
+    rare = query_planner.plan(store, COLLECTION, _cat("rare"), 10)
+    assert (rare.kind, rare.estimate, rare.total) == ("exact", 100, 10000)
+
+    broad = query_planner.plan(store, COLLECTION, None, 10)
+    assert broad.kind == "hnsw" and broad.ef == settings.PLANNER_EF_MIN
+    # 정확 검색 기준보다는 많지만 선택도 10% 미만 → ef 2배, 큰 top_k는 ef도 커짐
+    assert query_planner.plan(store, COLLECTION, _cat("mid"), 10).ef == 2 * settings.PLANNER_EF_MIN
+    assert query_planner.plan(store, COLLECTION, _cat("common"), 100).ef == 100 * settings.PLANNER_EF_PER_K
+    # 압축 레이아웃은 exact가 아니면 rescore
+    assert query_planner.plan(store, COLLECTION, _cat("common"), 40, compact=True).kind == "rescore"
+    # limit이 커도(export 페이지 sent + n 등) 정확 검색으로 바꾸지 않고 ef만 PLANNER_EF_MAX로 상한
+    big = query_planner.plan(store, COLLECTION, _cat("common"), 5 * settings.PLANNER_EF_MAX)
+    assert (big.kind, big.ef) == ("hnsw", settings.PLANNER_EF_MAX)
+
+    settings.PLANNER_ENABLED = False
+    assert query_planner.plan(store, COLLECTION, _cat("rare"), 10) == query_planner.QueryPlan("hnsw", -1, -1)
+
+def test_count_estimate_is_cached_until_invalidated(store):
+    assert query_planner.estimate_count(store, COLLECTION, _cat("rare")) == 100
+    store.delete(COLLECTION, points_selector=models.PointIdsList(points=list(range(9901, 9951))))
+    assert query_planner.estimate_count(store, COLLECTION, _cat("rare")) == 100   # TTL 동안은 캐시값
+    query_planner.invalidate(COLLECTION)
+    assert query_planner.estimate_count(store, COLLECTION, _cat("rare")) == 50
+
+def test_exact_plan_skips_compact_prefetch(monkeypatch):
+    monkeypatch.setattr(settings, "COMPACT_VECTOR", "pca")
+    kw = qdrant._plan_kwargs(query_planner.QueryPlan("exact", 10, 1000), [0.0] * qdrant.VECTOR_SIZE, None, 5)
+    assert kw == {"search_params": models.SearchParams(exact=True), "using": qdrant.FULL_VECTOR}
+    kw = qdrant._plan_kwargs(query_planner.QueryPlan("hnsw", 5000, 10000, ef=256), [0.0], None, 5, "params")
+    assert kw == {"params": models.SearchParams(hnsw_ef=256)}
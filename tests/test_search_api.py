@@ -0,0 +1,50 @@
+from qdrant_client import models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from apps.api.routers.search import _not_found_kind
+
+
+def _remote(status: int, error: str) -> UnexpectedResponse:
+    return UnexpectedResponse(status, "", f'{{"status":{{"error":"{error}"}}}}'.encode(), None)
+
+def test_only_not_found_errors_map_to_404():
+    """not found만 404 대상, 필터 오류/서버 오류는 None (그대로 raise)"""
+    assert _not_found_kind(ValueError("Point 5 is not found in the collection")) == "point"
+    assert _not_found_kind(ValueError("Collection nope not found")) == "collection"
+    assert _not_found_kind(_remote(404, "Not found: No point with id 5 found")) == "point"
+    assert _not_found_kind(_remote(404, "Not found: Collection `nope` doesn't exist!")) == "collection"
+    assert _not_found_kind(_remote(400, "Bad request: Index required but not found for \"category\"")) is None
+    assert _not_found_kind(_remote(503, "Service Unavailable")) is None
+    assert _not_found_kind(ValueError("Wrong input: Vector with name `compact` is not configured")) is None
+
+def test_similar_missing_id_and_missing_collection(monkeypatch):
+    """없는 id → 404 point, 컬렉션 자체가 없으면 별칭 조회 없이 404 collection (500 아님)"""
+    import contextlib
+    import io
+
+    from fastapi.testclient import TestClient
+
+    from apps.api.main import app
+    from core.config import settings
+    from infra import qdrant
+
+    name = "test_search_api"
+    monkeypatch.setattr(settings, "QDRANT_COLLECTION", name)
+    api = TestClient(app)
+    qdrant.delete_collection(name)
+    try:
+        r = api.get("/search/similar/5")
+        assert r.status_code == 404 and r.json()["detail"].startswith("collection not found")
+        assert api.post("/search/similar/batch", json={"ids": [5]}).status_code == 404
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            qdrant.initialize_qdrant(name)
+        qdrant.upsert_points([models.PointStruct(id=1, vector=qdrant.point_vectors([[1.0] * qdrant.VECTOR_SIZE])[0],
+                                                 payload={"pg_id": 1, "dup_cluster_id": 1})], collection_name=name)
+        r = api.get("/search/similar/5")
+        assert r.status_code == 404 and r.json()["detail"].startswith("point not found")
+        r = api.post("/search/similar/recommend", json={"positive": [1], "negative": [5]})
+        assert r.status_code == 404 and r.json()["detail"].startswith("point not found")
+        assert api.get("/search/similar/1").json()["hits"] == []
+    finally:
+        qdrant.delete_collection(name)
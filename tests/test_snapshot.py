@@ -0,0 +1,68 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from infra import qdrant
+from infra.minio import LocalObjectStore
+from workers.snapshot import download_snapshot, export_snapshot, load_snapshot, restore_snapshot, upload_snapshot
+
+SRC = "snapshot_src"
+DST = "snapshot_dst"
+N = 300
+
+@pytest.fixture
+def source_collection():
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((N, qdrant.VECTOR_SIZE)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        qdrant.initialize_qdrant(SRC)
+    qdrant.upsert_points([
+        models.PointStruct(id=i + 1, vector=vecs[i].tolist(), payload={"pg_id": i + 1, "category": ["A", "B"][i % 2]})
+        for i in range(N)
+    ], collection_name=SRC)
+    yield vecs
+    qdrant.delete_collection(SRC)
+    qdrant.delete_collection(DST)
+
+def test_export_upload_download_restore_roundtrip(source_collection, tmp_path):
+    """export → memmap 로드 → 로컬 저장소 업/다운로드 → 재적재 후 개수/벡터/payload가 원본과 같음"""
+    vecs = source_collection
+    with contextlib.redirect_stdout(io.StringIO()):
+        export_snapshot(tmp_path / "snap", SRC, page_size=64)   # 여러 페이지로 나눠 스크롤
+    snap = load_snapshot(tmp_path / "snap")
+    assert len(snap) == N and snap.manifest["dim"] == qdrant.VECTOR_SIZE
+    # 복사본이 아니라 파일에 매핑된 배열
+    assert isinstance(snap.vectors, np.memmap) and isinstance(snap.ids, np.memmap)
+    assert np.allclose(snap.vectors[np.argsort(snap.ids)], vecs, atol=1e-6)
+
+    store = LocalObjectStore(root=tmp_path / "store")
+    with contextlib.redirect_stdout(io.StringIO()):
+        prefix = upload_snapshot(tmp_path / "snap", store=store)
+        download_snapshot(prefix, tmp_path / "down", store=store)
+        assert restore_snapshot(tmp_path / "down", DST, batch_size=100) == N
+
+    assert qdrant.client.count(DST, exact=True).count == N
+    restored = sorted(qdrant.client.retrieve(DST, ids=list(range(1, N + 1)), with_vectors=True), key=lambda p: p.id)
+    assert np.allclose(np.asarray([qdrant.full_vector(p) for p in restored]), vecs, atol=1e-6)
+    assert [p.payload["category"] for p in restored[:4]] == ["A", "B", "A", "B"]
+
+def test_restore_rejects_dimension_mismatch(source_collection, tmp_path, monkeypatch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        export_snapshot(tmp_path / "snap", SRC)
+    monkeypatch.setattr(qdrant, "VECTOR_SIZE", 768)
+    with pytest.raises(ValueError):
+        restore_snapshot(tmp_path / "snap", DST)
+
+def test_object_store_fails_when_minio_endpoint_unusable(monkeypatch):
+    """MINIO_ENDPOINT가 있는데 클라이언트가 없으면 로컬 디렉터리로 조용히 대체하지 않는다"""
+    from core.config import settings
+    from infra import minio
+
+    monkeypatch.setattr(settings, "MINIO_ENDPOINT", "minio.invalid:9000")
+    monkeypatch.setattr(minio, "client", None)
+    with pytest.raises(ValueError):
+        minio.get_object_store()
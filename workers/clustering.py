@@ -0,0 +1,152 @@
+# workers/clustering.py
+"""
+임베딩 벡터용 구면(spherical) mini-batch k-means (numpy만 사용).
+
+임베딩이 L2 정규화되어 있다고 가정하므로 거리 대신 내적(= 코사인 유사도)으로 할당하고,
+센트로이드도 매 갱신 후 다시 정규화한다. 대량 할당은 블록 단위 행렬곱으로 처리한다.
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import re
+
+import numpy as np
+
+# 할당 시 한 번에 곱하는 행 수 (block x k float32 점수 행렬만 메모리에 올라감)
+ASSIGN_BLOCK = 8192
+
+_TOKEN_RE = re.compile(r"[0-9A-Za-z가-힣]{2,}")
+# 라벨 키워드에서 뺄 흔한 표현
+STOPWORDS = {"문의", "관련", "요청", "확인", "부탁드립니다", "합니다", "있어요", "없어요", "너무", "계속"}
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    n = np.linalg.norm(x, axis=1, keepdims=True)
+    n[n == 0] = 1.0
+    return x / n
+
+def assign(x: np.ndarray, centroids: np.ndarray, block: int = ASSIGN_BLOCK) -> Tuple[np.ndarray, np.ndarray]:
+    """각 행의 최근접 센트로이드 (labels int32, cosine score float32). x는 memmap이어도 블록씩만 읽는다."""
+    n = len(x)
+    labels = np.empty(n, dtype=np.int32)
+    scores = np.empty(n, dtype=np.float32)
+    ct = np.ascontiguousarray(centroids.T, dtype=np.float32)
+    for s in range(0, n, block):
+        sims = np.asarray(x[s:s + block], dtype=np.float32) @ ct
+        idx = sims.argmax(axis=1)
+        labels[s:s + block] = idx
+        scores[s:s + block] = sims[np.arange(len(idx)), idx]
+    return labels, scores
+
+
+class MiniBatchKMeans:
+    """
+    Sculley(2010) 방식 mini-batch k-means, 코사인 버전.
+    - fit: k-means++ 초기화(샘플) 후 미니배치 반복
+    - partial_fit: 새 데이터로 기존 센트로이드를 조금씩 이동 (증분 실행용)
+    """
+    def __init__(self, n_clusters: int, batch_size: int = 2048, max_iter: int = 100,
+                 tol: float = 1e-4, init_sample: int = 20000, seed: int = 0):
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.tol = tol
+        self.init_sample = init_sample
+        self.rng = np.random.default_rng(seed)
+        self.centroids: Optional[np.ndarray] = None   # (k, d) float32
+        self.counts: Optional[np.ndarray] = None      # (k,) 센트로이드별 누적 할당 수 (학습률 1/count)
+
+    def _init_centroids(self, x: np.ndarray) -> np.ndarray:
+        """
+        greedy k-means++ (코사인 거리 1 - sim) 샘플 초기화.
+        매 단계 후보 2+log(k)개 중 전체 거리 합을 가장 줄이는 점을 골라, 한 토픽에 센트로이드가 몰리는 것을 줄인다.
+        """
+        n = len(x)
+        idx = self.rng.choice(n, size=min(n, self.init_sample), replace=False)
+        sample = np.asarray(x[np.sort(idx)], dtype=np.float32)
+        k = min(self.n_clusters, len(sample))
+        trials = 2 + int(np.log(k))
+        centers = [sample[self.rng.integers(len(sample))]]
+        dist = np.clip(1.0 - sample @ centers[0], 0.0, None)
+        for _ in range(1, k):
+            total = dist.sum()
+            p = dist / total if total > 0 else None
+            cand = self.rng.choice(len(sample), size=trials, p=p)
+            cand_dist = np.minimum(dist[None, :], np.clip(1.0 - sample[cand] @ sample.T, 0.0, None))
+            best = int(cand_dist.sum(axis=1).argmin())
+            centers.append(sample[cand[best]])
+            dist = cand_dist[best]
+        return _normalize(np.stack(centers).astype(np.float32))
+
+    def _step(self, batch: np.ndarray) -> float:
+        labels, _ = assign(batch, self.centroids)
+        old = self.centroids.copy()
+        # 센트로이드별 배치 평균으로 이동: c <- (1-η)c + η·mean(batch), η = m / 누적 count
+        onehot = np.zeros((len(batch), len(self.centroids)), dtype=np.float32)
+        onehot[np.arange(len(batch)), labels] = 1.0
+        sums = onehot.T @ batch
+        m = np.bincount(labels, minlength=len(self.centroids)).astype(np.float32)
+        self.counts += m.astype(np.int64)
+        hit = m > 0
+        eta = (m[hit] / self.counts[hit])[:, None]
+        self.centroids[hit] = (1 - eta) * self.centroids[hit] + eta * (sums[hit] / m[hit][:, None])
+        self.centroids = _normalize(self.centroids)
+        return float(np.abs(self.centroids - old).max())
+
+    def fit(self, x: np.ndarray) -> "MiniBatchKMeans":
+        self.centroids = self._init_centroids(x)
+        self.counts = np.zeros(len(self.centroids), dtype=np.int64)
+        n = len(x)
+        for _ in range(self.max_iter):
+            idx = np.sort(self.rng.choice(n, size=min(n, self.batch_size), replace=False))
+            shift = self._step(np.asarray(x[idx], dtype=np.float32))
+            if shift < self.tol:
+                break
+        return self
+
+    def partial_fit(self, x: np.ndarray) -> "MiniBatchKMeans":
+        assert self.centroids is not None, "fit 또는 load 이후에만 partial_fit 가능합니다."
+        for s in range(0, len(x), self.batch_size):
+            self._step(np.asarray(x[s:s + self.batch_size], dtype=np.float32))
+        return self
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return assign(x, self.centroids)
+
+    @classmethod
+    def from_state(cls, centroids: np.ndarray, counts: np.ndarray, **kwargs) -> "MiniBatchKMeans":
+        km = cls(n_clusters=len(centroids), **kwargs)
+        km.centroids = np.asarray(centroids, dtype=np.float32).copy()
+        km.counts = np.asarray(counts, dtype=np.int64).copy()
+        return km
+
+
+def keywords(titles: Sequence[str], top_n: int = 5) -> List[str]:
+    """제목들에서 자주 나온 토큰(2글자 이상, 숫자만인 토큰·불용어 제외)."""
+    cnt = Counter(
+        t for title in titles for t in _TOKEN_RE.findall(title or "")
+        if t not in STOPWORDS and not t.isdigit()
+    )
+    return [w for w, _ in cnt.most_common(top_n)]
+
+def label_clusters(labels: np.ndarray, scores: np.ndarray, titles: Sequence[str], ids: Sequence[int],
+                   n_clusters: int, n_repr: int = 5) -> Dict[int, Dict]:
+    """
+    클러스터별 라벨 정보: 크기, 대표 제목(센트로이드에 가장 가까운 n_repr건), 키워드, 라벨 문자열.
+    """
+    out: Dict[int, Dict] = {}
+    # 클러스터 오름차순, 같은 클러스터 안에서는 점수 내림차순 → 클러스터별 앞쪽이 대표
+    order = np.lexsort((-scores, labels))
+    bounds = np.searchsorted(labels[order], np.arange(n_clusters + 1))
+    for c in range(n_clusters):
+        members = order[bounds[c]:bounds[c + 1]]
+        reps = members[:n_repr]
+        kws = keywords([titles[i] for i in members[:200]])
+        rep_titles = [titles[i] for i in reps]
+        out[c] = {
+            "size": int(len(members)),
+            "label": " / ".join(kws[:3]) if kws else (rep_titles[0] if rep_titles else ""),
+            "keywords": kws,
+            "representatives": [{"id": int(ids[i]), "title": titles[i]} for i in reps],
+        }
+    return out
@@ -0,0 +1,144 @@
+# workers/compact.py
+"""
+압축(저차원) 벡터 투영 — 2단계 검색(compact ANN 후보 → full 1024차원 재정렬)용.
+
+- pca: 코퍼스 샘플로 학습한 PCA 상위 COMPACT_DIM개 축에 투영 후 L2 정규화.
+       모델은 EMBEDDING_VERSION별 파일로 저장되어, 임베딩 모델이 바뀌면 다시 학습해야 로드된다.
+- truncate: 앞쪽 COMPACT_DIM차원만 잘라 L2 정규화 (Matryoshka 학습 모델 전용 —
+            KURE-v1은 Matryoshka 학습 모델이 아니라서 pca를 권장)
+
+전환 절차 (기존 단일 벡터 컬렉션 → full + compact 이름 있는 벡터):
+    python -m workers.snapshot export --out snapshots/feedback_current
+    python -m workers.compact fit --snapshot snapshots/feedback_current --dim 256
+    COMPACT_VECTOR=pca python -m workers.snapshot restore --src snapshots/feedback_current --collection feedback_compact
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import threading
+
+import numpy as np
+
+from core.config import settings
+
+FIT_SAMPLE = 50_000   # PCA 공분산 추정에 쓸 최대 샘플 수 (1024x1024 공분산이라 이 정도면 충분)
+
+
+@dataclass
+class CompactProjector:
+    mode: str                              # "pca" | "truncate"
+    dim: int
+    embedding_version: str
+    mean: Optional[np.ndarray] = None      # (d,)   pca 전용
+    components: Optional[np.ndarray] = None  # (d, dim) pca 전용, 열이 주성분
+    explained: float = 1.0                 # 보존된 분산 비율 (pca)
+
+    def transform(self, x) -> np.ndarray:
+        """(n, d) 또는 (d,) → (n, dim) 단위 벡터 float32."""
+        x = np.atleast_2d(np.asarray(x, dtype=np.float32))
+        if self.mode == "pca":
+            y = (x - self.mean) @ self.components
+        elif self.mode == "truncate":
+            y = x[:, : self.dim].copy()
+        else:
+            raise ValueError(f"알 수 없는 COMPACT_VECTOR 모드: {self.mode}")
+        y /= np.maximum(np.linalg.norm(y, axis=1, keepdims=True), 1e-12)
+        return y.astype(np.float32, copy=False)
+
+    @classmethod
+    def fit_pca(cls, x: np.ndarray, dim: int, embedding_version: str = settings.EMBEDDING_VERSION,
+                sample: int = FIT_SAMPLE, seed: int = 0) -> "CompactProjector":
+        """공분산 고유분해로 상위 dim개 주성분 (d=1024라 SVD보다 eigh가 빠르고 메모리도 d x d만 필요)."""
+        n = len(x)
+        if n > sample:
+            idx = np.sort(np.random.default_rng(seed).choice(n, size=sample, replace=False))
+            x = x[idx]
+        x = np.asarray(x, dtype=np.float64)
+        mean = x.mean(axis=0)
+        xc = x - mean
+        cov = xc.T @ xc / max(len(xc) - 1, 1)
+        evals, evecs = np.linalg.eigh(cov)               # 오름차순
+        order = np.argsort(evals)[::-1][:dim]
+        explained = float(evals[order].sum() / max(evals.sum(), 1e-12))
+        return cls("pca", dim, embedding_version, mean.astype(np.float32),
+                   evecs[:, order].astype(np.float32), explained)
+
+    @classmethod
+    def truncation(cls, dim: int, embedding_version: str = settings.EMBEDDING_VERSION) -> "CompactProjector":
+        return cls("truncate", dim, embedding_version)
+
+    # --- 저장/로드 ---
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"mode": self.mode, "dim": self.dim, "embedding_version": self.embedding_version, "explained": self.explained}
+        np.savez(path, mean=self.mean, components=self.components, meta=json.dumps(meta))
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompactProjector":
+        with np.load(path) as f:
+            meta = json.loads(str(f["meta"]))
+            return cls(meta["mode"], meta["dim"], meta["embedding_version"], f["mean"], f["components"], meta["explained"])
+
+
+def model_path(dim: Optional[int] = None, embedding_version: Optional[str] = None, model_dir: Optional[str] = None) -> Path:
+    """models/compact/<EMBEDDING_VERSION>-pca<dim>.npz (인자가 없으면 현재 설정값)."""
+    dim = dim or settings.COMPACT_DIM
+    embedding_version = embedding_version or settings.EMBEDDING_VERSION
+    return Path(model_dir or settings.COMPACT_MODEL_DIR) / f"{embedding_version}-pca{dim}.npz"
+
+
+_projector: Optional[CompactProjector] = None
+_lock = threading.Lock()
+
+def get_projector() -> CompactProjector:
+    """설정(COMPACT_VECTOR/COMPACT_DIM/EMBEDDING_VERSION)에 맞는 투영기를 한 번만 로드."""
+    global _projector
+    if _projector is None:
+        with _lock:
+            if _projector is None:
+                if settings.COMPACT_VECTOR == "truncate":
+                    _projector = CompactProjector.truncation(settings.COMPACT_DIM)
+                elif settings.COMPACT_VECTOR == "pca":
+                    path = model_path()
+                    if not path.exists():
+                        raise FileNotFoundError(
+                            f"PCA 모델이 없습니다: {path} (python -m workers.compact fit 으로 먼저 학습)"
+                        )
+                    p = CompactProjector.load(path)
+                    if p.embedding_version != settings.EMBEDDING_VERSION or p.dim != settings.COMPACT_DIM:
+                        raise ValueError(f"PCA 모델 버전/차원 불일치: {p.embedding_version}/{p.dim}")
+                    _projector = p
+                else:
+                    raise ValueError(f"COMPACT_VECTOR가 설정되지 않았습니다: {settings.COMPACT_VECTOR}")
+    return _projector
+
+def set_projector(p: Optional[CompactProjector]) -> None:
+    """투영기를 직접 지정 (벤치마크/테스트에서 설정을 바꿔 가며 비교할 때). None이면 다음 호출에서 다시 로드."""
+    global _projector
+    _projector = p
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    fit = sub.add_parser("fit", help="스냅샷 벡터로 PCA 학습 후 models/compact/<버전>-pca<dim>.npz 저장")
+    fit.add_argument("--snapshot", required=True, help="workers.snapshot으로 내보낸 디렉터리")
+    fit.add_argument("--dim", type=int, default=settings.COMPACT_DIM)
+    fit.add_argument("--sample", type=int, default=FIT_SAMPLE)
+    args = ap.parse_args()
+
+    from workers.snapshot import load_snapshot
+    snap = load_snapshot(args.snapshot)
+    p = CompactProjector.fit_pca(snap.vectors, args.dim, sample=args.sample)
+    path = p.save(model_path(args.dim))
+    print(f"PCA {snap.vectors.shape[1]} → {args.dim}: 분산 보존 {p.explained:.3f}, "
+          f"샘플 {min(len(snap), args.sample)}건 → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# workers/dedup.py
+"""
+적재(ingest) 단계 중복 제거 유틸.
+
+- 완전 중복: 정규화 텍스트 해시가 같으면 같은 클러스터 (LLM/임베딩 호출 자체를 건너뜀)
+- 근접 중복: 문자 3-gram MinHash + LSH 밴딩으로 후보를 찾고, 추정 Jaccard가 임계값 이상이면 같은 클러스터
+
+클러스터 대표(rep)는 처음 등장한 행(가장 작은 id)이며, 대표만 벡터로 저장하고
+나머지는 대표 포인트 payload의 dup_members(앞쪽 일부)/dup_count와 중복 별칭 컬렉션(중복 id → 대표 id)에 기록한다.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+# 한글/영문/숫자만 남김 (이모지·구두점·특수문자 차이는 중복 판정에서 무시)
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣ㄱ-ㅎㅏ-ㅣ ]+")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_for_hash(text: str) -> str:
+    """중복 판정용 정규화: NFKC → 소문자 → 특수문자 제거 → 공백 축약."""
+    t = unicodedata.normalize("NFKC", text or "").lower()
+    t = _NON_WORD_RE.sub(" ", t)
+    return _WS_RE.sub(" ", t).strip()
+
+def text_hash(text: str) -> str:
+    """정규화 텍스트의 SHA-1 해시 (완전 중복 키)."""
+    return hashlib.sha1(normalize_for_hash(text).encode("utf-8")).hexdigest()
+
+def shingles(text: str, k: int = 3) -> List[int]:
+    """정규화 텍스트의 문자 k-gram → 32bit 해시 목록. 한국어는 띄어쓰기 편차가 커서 공백을 제거하고 자른다."""
+    t = normalize_for_hash(text).replace(" ", "")
+    if len(t) <= k:
+        grams = {t}
+    else:
+        grams = {t[i:i + k] for i in range(len(t) - k + 1)}
+    return [zlib.crc32(g.encode("utf-8")) for g in grams]
+
+
+class MinHasher:
+    """
+    (a*x + b) mod p 형태의 해시 순열 num_perm개로 MinHash 시그니처 생성.
+    seed가 같으면 시그니처가 같으므로 실행 간 비교가 가능하다.
+    """
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        # a, b < 2^31 → shingle(32bit) * a + b 가 uint64를 넘지 않음
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hv = np.asarray(shingles(text), dtype=np.uint64)
+        # (shingle 수, num_perm) 한 번에 계산 후 열 방향 최소값
+        ph = (hv[:, None] * self._a[None, :] + self._b[None, :]) % np.uint64(_MERSENNE_PRIME)
+        return (ph & np.uint64(_MAX_HASH)).min(axis=0).astype(np.uint32)
+
+
+def estimate_jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """두 MinHash 시그니처의 일치 비율 = Jaccard 유사도 추정치."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class NearDupIndex:
+    """
+    MinHash LSH 인덱스 (대표 문서만 등록).
+    bands * rows == num_perm. 기본 16x4 → Jaccard 약 0.5부터 후보로 잡히고,
+    실제 판정은 추정 Jaccard >= threshold 로 한다.
+    """
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        assert num_perm % bands == 0, "num_perm은 bands의 배수여야 합니다."
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self._buckets: List[Dict[bytes, List[int]]] = [dict() for _ in range(bands)]
+        self._sigs: Dict[int, np.ndarray] = {}
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, sig: np.ndarray) -> Optional[int]:
+        """임계값 이상인 대표 중 가장 유사한 key 반환 (없으면 None)."""
+        candidates = set()
+        for band, key in zip(self._buckets, self._band_keys(sig)):
+            candidates.update(band.get(key, ()))
+        best, best_sim = None, self.threshold
+        for c in candidates:
+            sim = estimate_jaccard(sig, self._sigs[c])
+            if sim >= best_sim:
+                best, best_sim = c, sim
+        return best
+
+    def add(self, key: int, sig: np.ndarray) -> None:
+        self._sigs[key] = sig
+        for band, bkey in zip(self._buckets, self._band_keys(sig)):
+            band.setdefault(bkey, []).append(key)
+
+
+@dataclass
+class DedupStats:
+    rows: int = 0
+    exact: int = 0          # 해시 일치로 건너뛴 행
+    near: int = 0           # MinHash로 건너뛴 행
+    vector: int = 0         # 임베딩 후 벡터 유사도로 병합된 행
+    embedded: int = 0       # 실제 임베딩한 텍스트 수
+    embed_seconds: float = 0.0
+
+    @property
+    def skipped_before_embed(self) -> int:
+        return self.exact + self.near
+
+    @property
+    def ratio(self) -> float:
+        """전체 행 대비 벡터로 저장되지 않은 행 비율."""
+        return (self.exact + self.near + self.vector) / self.rows if self.rows else 0.0
+
+    @property
+    def embed_seconds_saved(self) -> float:
+        """건너뛴 행 수 × 실측 평균 임베딩 시간 (추정치)."""
+        if not self.embedded:
+            return 0.0
+        return self.skipped_before_embed * (self.embed_seconds / self.embedded)
+
+    def summary(self) -> str:
+        return (
+            f"dedup: rows={self.rows} exact={self.exact} near={self.near} vector={self.vector} "
+            f"ratio={self.ratio:.1%} embedded={self.embedded} "
+            f"embed_time={self.embed_seconds:.1f}s saved~{self.embed_seconds_saved:.1f}s"
+        )
+
+
+@dataclass
+class Deduper:
+    """
+    한 번의 ingest 실행 동안 상태를 유지하는 중복 판정기.
+    id 오름차순으로 호출된다고 가정한다 (가장 먼저 본 행이 대표).
+    """
+    near_threshold: Optional[float] = 0.9   # None이면 근접 중복 판정 끔
+    stats: DedupStats = field(default_factory=DedupStats)
+    clusters: Dict[int, List[int]] = field(default_factory=dict)   # rep id → 멤버 id (rep 포함)
+
+    def __post_init__(self):
+        self._by_hash: Dict[str, int] = {}
+        self._merged_into: Dict[int, int] = {}   # merge()로 흡수된 옛 대표 → 새 대표
+        self._near = NearDupIndex(threshold=self.near_threshold) if self.near_threshold else None
+
+    def check(self, row_id: int, text: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        행을 등록하고 (대표 id, 판정 종류) 반환.
+        새 대표이면 (None, None), 중복이면 (rep_id, 'exact' | 'near').
+        """
+        self.stats.rows += 1
+        h = text_hash(text)
+        rep = self._resolve(self._by_hash.get(h))
+        if rep is not None:
+            self.stats.exact += 1
+            self.clusters[rep].append(row_id)
+            return rep, "exact"
+
+        sig = None
+        if self._near is not None:
+            sig = self._near.hasher.signature(text)
+            rep = self._resolve(self._near.query(sig))
+            if rep is not None:
+                self.stats.near += 1
+                self._by_hash[h] = rep
+                self.clusters[rep].append(row_id)
+                return rep, "near"
+
+        self._by_hash[h] = row_id
+        self.clusters[row_id] = [row_id]
+        if sig is not None:
+            self._near.add(row_id, sig)
+        return None, None
+
+    def representative(self, rep: int) -> int:
+        """check()/merge()가 돌려준 대표 id → 이후 merge()로 다른 클러스터에 흡수됐으면 그 대표까지 따라간 현재 대표 id."""
+        return self._resolve(rep)
+
+    def _resolve(self, rep: Optional[int]) -> Optional[int]:
+        while rep is not None and rep in self._merged_into:
+            rep = self._merged_into[rep]
+        return rep
+
+    def merge(self, row_id: int, rep: int) -> None:
+        """임베딩 이후(벡터 유사도) 중복 판정된 행을 rep 클러스터로 옮김."""
+        rep = self._resolve(rep)
+        self.stats.vector += 1
+        members = self.clusters.pop(row_id, [row_id])
+        self.clusters.setdefault(rep, [rep]).extend(members)
+        self._merged_into[row_id] = rep
@@ -50,10 +50,14 @@
 
 
 from __future__ import annotations
-from typing import List, Iterable, Optional
-from sentence_transformers import SentenceTransformer
+from typing import TYPE_CHECKING, List, Iterable, Optional
 import threading
 
+from core import metrics
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 # 모델 로드를 한 번만 수행하기 위한 락
 __model_lock = threading.Lock()
 __model: Optional[SentenceTransformer] = None
@@ -66,6 +70,8 @@ def _get_model() -> SentenceTransformer:
     if __model is None:
         with __model_lock:
             if __model is None:
+                # 모델을 실제로 쓸 때만 import (스텁 임베더로 도는 오프라인 벤치마크/테스트는 설치 없이 import 가능)
+                from sentence_transformers import SentenceTransformer
                 m = SentenceTransformer("nlpai-lab/KURE-v1")
                 # 긴 입력이 잘리는 문제를 줄이기 위한 설정(필요 시 조정)
                 # KURE 계열 max_seq_length 기본은 256~512 수준일 수 있음
@@ -80,7 +86,11 @@ def embed_one(text: str) -> List[float]:
     코사인 유사도 사용을 가정하므로 정규화(normalize_embeddings=True) 적용.
     """
     model = _get_model()
-    vec = model.encode([text], normalize_embeddings=True)[0]
+    with metrics.stage(metrics.EMBED_SECONDS, fn="embed_one"):
+        vec = model.encode([text], normalize_embeddings=True)[0]
+    if metrics.enabled():
+        metrics.EMBED_TEXTS.inc(1)
+        metrics.EMBED_TOKENS.inc(_count_tokens(model, [text]))
     return vec.tolist()
 
 def embed_batch(texts: Iterable[str]) -> List[List[float]]:
@@ -93,10 +103,23 @@ def embed_batch(texts: Iterable[str]) -> List[List[float]]:
     if not texts_list:
         return []
     model = _get_model()
-    vecs = model.encode(texts_list, normalize_embeddings=True)
+    with metrics.stage(metrics.EMBED_SECONDS, fn="embed_batch"):
+        vecs = model.encode(texts_list, normalize_embeddings=True)
+    if metrics.enabled():
+        metrics.EMBED_BATCH_SIZE.observe(len(texts_list))
+        metrics.EMBED_TEXTS.inc(len(texts_list))
+        metrics.EMBED_TOKENS.inc(_count_tokens(model, texts_list))
     # sentence-transformers는 ndarray 반환 → Python list로 변환
     return [v.tolist() for v in vecs]
 
+def _count_tokens(model: SentenceTransformer, texts: List[str]) -> int:
+    """
+    메트릭용 토큰 수 (max_seq_length에서 잘린 뒤 기준).
+    토크나이저를 한 번 더 돌리므로 METRICS_ENABLED일 때만 호출한다.
+    """
+    ids = model.tokenizer(texts, truncation=True, max_length=model.max_seq_length)["input_ids"]
+    return sum(len(x) for x in ids)
+
 # 선택: 길이 파라미터/디바이스 변경 헬퍼 (필요할 때만 사용)
 def configure(max_seq_length: Optional[int] = None, device: Optional[str] = None) -> None:
     """
@@ -96,13 +96,18 @@
 
 from __future__ import annotations
 from typing import List, Dict, Tuple
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import time
+import numpy as np
 
 from qdrant_client import models
 from workers.embedder import embed_batch
 from core.config import settings
-from infra.qdrant import initialize_qdrant, upsert_points
+from infra.qdrant import (
+    initialize_qdrant, upsert_points, delete_points, nearest_existing, set_payloads, point_vectors, upsert_dup_aliases,
+    retrieve_payload_fields,
+)
+from workers.dedup import Deduper
+from core import metrics
 
 
 # ----- PostgreSQL 접속 정보 -----
@@ -132,6 +137,13 @@ SQL_PUT_LLM  = "INSERT INTO public.llm_outputs (source_id, normalized, llm_versi
 # 배치 크기
 BATCH = 256
 
+# 다른 잡이 기록하는 payload 필드 — 재적재(upsert는 payload 전체 교체) 때 기존 값을 읽어 그대로 유지
+# (cluster_id: workers/topic_cluster.py. 지우면 다음 증분 실행이 전체를 다시 할당하고 센트로이드 카운트가 중복 누적됨)
+PRESERVED_FIELDS = ["cluster_id"]
+
+# 대표 payload에 남길 중복 멤버 id 최대 개수 (전체 수는 dup_count, 전체 매핑은 중복 별칭 컬렉션)
+DUP_MEMBERS_MAX = 50
+
 # ---- (임시) LLM 호출 스텁 ----
 # 실제로는 workers/llm_extractor.py의 함수를 불러 LLM 호출/스키마 검증을 수행하면 됨.
 # 여기서는 파이프라인을 맞추기 위해 title+body를 그대로 normalized로 반환.
@@ -162,32 +174,101 @@ def choose_text_for_embedding(cur, row: Dict) -> Tuple[str, str, str | None]:
         cur.execute(SQL_PUT_LLM, (row["id"], normalized, llm_ver))
         return normalized, "llm", llm_ver
     
-def run():
+def cluster_payload(deduper: Deduper | None, rep_id: int) -> Dict:
+    """대표 포인트에 붙일 중복 클러스터 payload (dup_members는 앞쪽 DUP_MEMBERS_MAX개까지만)."""
+    members = deduper.clusters.get(rep_id, [rep_id]) if deduper else [rep_id]
+    return {"dup_members": members[:DUP_MEMBERS_MAX], "dup_count": len(members)}
+
+def collapse_groups(ids: List[int], vecs: List[List[float]], nearest: List, threshold: float | None) -> List[int]:
+    """
+    저장할 각 포인트의 dup_cluster_id (검색 collapse=true의 그룹 키).
+    이전 배치의 최근접 포인트나 같은 배치의 앞선 행과 코사인 >= threshold면 그 포인트의 그룹을 물려받고, 아니면 자기 id.
+    """
+    groups = list(ids)
+    if threshold is None:
+        return groups
+    for i, hit in enumerate(nearest):
+        if hit is not None and hit.score >= threshold:
+            groups[i] = int((hit.payload or {}).get("dup_cluster_id", hit.id))
+    for i, j in enumerate(merge_within_batch(vecs, threshold)):
+        if j is not None and groups[i] == ids[i]:
+            groups[i] = groups[j]
+    return groups
+
+def merge_within_batch(vecs: List[List[float]], threshold: float) -> List[int | None]:
+    """
+    같은 배치 안의 벡터 근접 중복: 각 행에 대해 앞선 (병합되지 않은) 행 중 코사인 >= threshold인 가장 가까운 행의 인덱스.
+    nearest_existing은 이전 배치에 저장된 포인트만 보므로 배치 내부는 여기서 따로 비교한다.
+    """
+    if not vecs:
+        return []
+    x = np.asarray(vecs, dtype=np.float32)
+    x /= np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+    sims = x @ x.T
+    out: List[int | None] = [None] * len(x)
+    kept: List[int] = []
+    for i in range(len(x)):
+        if kept:
+            j = int(np.argmax(sims[i, kept]))
+            if sims[i, kept[j]] >= threshold:
+                out[i] = kept[j]
+                continue
+        kept.append(i)
+    return out
+
+def run(conn=None, embed=embed_batch, collection_name: str = settings.QDRANT_COLLECTION):
+    """
+    search_corpus 전체를 id 순으로 읽어 Qdrant에 적재.
+    conn/embed/collection_name은 오프라인 벤치마크(benchmarks/suite.py)에서 가짜 DB·스텁 임베더를 넣을 때 사용.
+    """
     # 0) Qdrant 컬렉션 보장
-    initialize_qdrant(settings.QDRANT_COLLECTION)
+    initialize_qdrant(collection_name)
 
     # 1) PG 연결
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    print("PostgreSQL 연결 성공")
+    own_conn = conn is None
+    if own_conn:
+        # 실제 DB에 붙을 때만 import (conn을 넘기는 오프라인 벤치마크는 psycopg2 없이 실행)
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+        conn = psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
+        print("PostgreSQL 연결 성공")
+    cur = conn.cursor()
+
+    # 중복 제거 상태는 한 번의 실행(id 오름차순 전체 스캔) 동안 유지
+    deduper = Deduper(near_threshold=settings.DEDUP_NEAR_THRESHOLD) if settings.DEDUP_ENABLED else None
 
     try:
         last_id = 0
         total = 0
+        # 이전 배치에 저장된 대표 중 이번 배치에서 멤버가 늘어난 것들 (set_payload로 갱신)
+        touched_reps: set[int] = set()
 
         while True:
-            cur.execute(SQL_FETCH, (last_id, BATCH))
-            rows = cur.fetchall()
+            with metrics.stage(metrics.INGEST_STAGE_SECONDS, stage="pg_fetch"):
+                cur.execute(SQL_FETCH, (last_id, BATCH))
+                rows = cur.fetchall()
             if not rows:
                 break
+            batch_ids = {int(r["id"]) for r in rows}
 
             # 규칙에 맞춰 임베딩 입력 텍스트/메타 결정
             texts: List[str] = []
             metas: List[Dict] = []
+            dup_rep: Dict[int, int] = {}   # 이번 배치 중복 id → 판정 시점의 대표 id
             for r in rows:
-                text, source_flag, llm_ver = choose_text_for_embedding(cur, r)
-                # llm_outputs INSERT 반영
-                conn.commit()
+                # 2) 중복 판정: 중복이면 LLM/임베딩/저장 모두 생략하고 대표 클러스터에만 기록
+                if deduper is not None:
+                    rep, _kind = deduper.check(int(r["id"]), f"{r['title']}\n{r['body']}")
+                    if rep is not None:
+                        dup_rep[int(r["id"])] = rep
+                        if rep not in batch_ids:
+                            touched_reps.add(rep)
+                        continue
+
+                with metrics.stage(metrics.INGEST_STAGE_SECONDS, stage="llm"):
+                    text, source_flag, llm_ver = choose_text_for_embedding(cur, r)
+                    # llm_outputs INSERT 반영
+                    conn.commit()
 
                 texts.append(text)
                 metas.append({
@@ -197,15 +278,52 @@ def run():
                     "updated_at": str(r.get("updated_at")),
                     "source": source_flag,
                     "llm_version": llm_ver,
-                    "embedding_version": "kure-v1",
+                    "embedding_version": settings.EMBEDDING_VERSION,
                 })
 
-            # 3) 임베딩
-            vecs = embed_batch(texts)
+            # 3) 임베딩 (대표만)
+            t0 = time.perf_counter()
+            with metrics.stage(metrics.INGEST_STAGE_SECONDS, stage="embed"):
+                vecs = embed(texts)
+            if deduper is not None:
+                deduper.stats.embedded += len(texts)
+                deduper.stats.embed_seconds += time.perf_counter() - t0
+
+            # 3-1) 이전 배치에 저장된 최근접 포인트 (벡터 근접 중복 병합 / collapse 그룹에 사용, 배치당 왕복 1번)
+            vector_threshold = settings.DEDUP_VECTOR_THRESHOLD if deduper is not None else None
+            nearest = [None] * len(vecs)
+            if vecs and (vector_threshold is not None or settings.DEDUP_COLLAPSE_THRESHOLD is not None):
+                nearest = nearest_existing(vecs, before_id=rows[0]["id"], collection_name=collection_name)
+
+            # 3-2) (옵션) 이미 저장된 포인트와 벡터 유사도가 임계값 이상이면 그 클러스터로 병합
+            if vector_threshold is not None and vecs:
+                keep = []
+                for meta, vec, hit in zip(metas, vecs, nearest):
+                    if hit is not None and hit.score >= vector_threshold:
+                        deduper.merge(meta["id"], int(hit.id))
+                        dup_rep[meta["id"]] = int(hit.id)
+                        touched_reps.add(int(hit.id))
+                    else:
+                        keep.append((meta, vec, hit))
+
+                # 같은 배치 안에서 앞선 행과 근접한 행도 병합
+                into = merge_within_batch([v for _, v, _ in keep], vector_threshold)
+                for (meta, _, _), j in zip(keep, into):
+                    if j is not None:
+                        deduper.merge(meta["id"], keep[j][0]["id"])
+                        dup_rep[meta["id"]] = keep[j][0]["id"]
+                keep = [k for k, j in zip(keep, into) if j is None]
+                metas = [m for m, _, _ in keep]
+                vecs = [v for _, v, _ in keep]
+                nearest = [h for _, _, h in keep]
+
+            # 3-3) collapse 그룹: 삭제할 만큼은 아니지만 비슷한 포인트끼리 같은 dup_cluster_id
+            groups = collapse_groups([m["id"] for m in metas], vecs, nearest, settings.DEDUP_COLLAPSE_THRESHOLD)
 
             # 4) Qdrant 포인트 구성
+            preserved = retrieve_payload_fields([m["id"] for m in metas], PRESERVED_FIELDS, collection_name=collection_name)
             points: List[models.PointStruct] = []
-            for meta, vec in zip(metas, vecs):
+            for meta, vec, group in zip(metas, point_vectors(vecs), groups):   # 압축 레이아웃이면 {full, compact}
                 points.append(
                     models.PointStruct(
                         id=meta["id"],          # 동일 id에 upsert → 이후 실행에서 DB버전으로 덮어씀
@@ -218,23 +336,46 @@ def run():
                             "source": meta["source"],                   # 'llm' or 'db'
                             "llm_version": meta["llm_version"],
                             "embedding_version": meta["embedding_version"],
+                            "dup_cluster_id": group,
+                            **cluster_payload(deduper, meta["id"]),
+                            **preserved.get(meta["id"], {}),
                         },
                     )
                 )
 
             # 5) 업서트
-            upsert_points(points, collection_name=settings.QDRANT_COLLECTION)
+            if points:
+                with metrics.stage(metrics.INGEST_STAGE_SECONDS, stage="upsert"):
+                    upsert_points(points, collection_name=collection_name)
+
+            # 6) 중복 정리: 이전 실행에서 따로 저장됐던 중복 포인트 삭제 + 이전 배치 대표의 멤버 갱신
+            # 삭제된 중복 id로도 유사 검색이 되도록 대표 id 별칭 기록 (merge로 대표가 바뀐 경우까지 따라감)
+            if dup_rep:
+                delete_points(list(dup_rep), collection_name=collection_name)
+                upsert_dup_aliases({d: deduper.representative(r) for d, r in dup_rep.items()}, collection_name=collection_name)
+            set_payloads(
+                {rep: cluster_payload(deduper, rep) for rep in touched_reps},
+                collection_name=collection_name,
+            )
+            touched_reps.clear()
 
             last_id = rows[-1]["id"]
             total += len(rows)
+            metrics.INGEST_ROWS.inc(len(points), result="indexed")
+            metrics.INGEST_ROWS.inc(len(dup_rep), result="duplicate")
             print(f"indexed so far: {total}")
+            metrics.maybe_dump()
 
         print(f"done. total indexed: {total}")
+        if deduper is not None:
+            print(deduper.stats.summary())
+        metrics.maybe_dump(force=True)
 
     finally:
         cur.close()
-        conn.close()
-        print("PostgreSQL 연결 종료")
+        if own_conn:
+            conn.close()
+            print("PostgreSQL 연결 종료")
 
 
 if __name__ == "__main__":
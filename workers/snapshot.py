@@ -0,0 +1,240 @@
+# workers/snapshot.py
+"""
+Qdrant 컬렉션 오프라인 스냅샷 (분석 잡/재적재용).
+
+스냅샷 디렉터리 구성:
+    manifest.json     컬렉션/차원/거리/개수/생성시각
+    ids.npy           int64 (n,)
+    vectors.npy       float32 (n, dim), C-contiguous → np.load(mmap_mode="r")로 복사 없이 로드
+    payloads.parquet  id + 주요 payload 컬럼 + payload_json(원본 전체)
+
+실행:
+    python -m workers.snapshot export  --out snapshots/feedback_current [--upload]
+    python -m workers.snapshot restore --src snapshots/feedback_current --collection feedback_restore
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import argparse
+import json
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.config import settings
+from infra import qdrant
+from infra.minio import get_object_store
+
+# 스크롤 페이지 크기 (기본 scroll_points의 100건보다 훨씬 크게 → 왕복 수 감소)
+SCROLL_PAGE = 2048
+# 재적재 시 upsert 배치 크기
+RESTORE_BATCH = 1024
+
+MANIFEST = "manifest.json"
+IDS_FILE = "ids.npy"
+VECTORS_FILE = "vectors.npy"
+PAYLOADS_FILE = "payloads.parquet"
+SNAPSHOT_FILES = [MANIFEST, IDS_FILE, VECTORS_FILE, PAYLOADS_FILE]
+
+# 분석에서 자주 쓰는 payload 필드는 별도 컬럼으로 (나머지는 payload_json에 보존)
+PAYLOAD_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("pg_id", pa.int64()),
+    ("title", pa.string()),
+    ("category", pa.string()),
+    ("updated_at", pa.string()),
+    ("source", pa.string()),
+    ("llm_version", pa.string()),
+    ("embedding_version", pa.string()),
+    ("dup_cluster_id", pa.int64()),
+    ("payload_json", pa.string()),
+])
+
+
+def _payload_table(ids: List[int], payloads: List[Dict]) -> pa.Table:
+    cols = {"id": ids}
+    for f in PAYLOAD_SCHEMA.names[1:-1]:
+        cols[f] = [p.get(f) for p in payloads]
+    cols["payload_json"] = [json.dumps(p, ensure_ascii=False, default=str) for p in payloads]
+    return pa.table(cols, schema=PAYLOAD_SCHEMA)
+
+def _vector_params(collection_name: str):
+    """원본(1024차원) 벡터 설정. 압축 레이아웃 컬렉션이면 full 벡터 쪽 (compact는 복원 시 다시 투영)."""
+    params = qdrant.get_collection_info(collection_name).config.params.vectors
+    return params[qdrant.FULL_VECTOR] if isinstance(params, dict) else params
+
+
+def export_snapshot(out_dir: str | Path, collection_name: str = settings.QDRANT_COLLECTION, page_size: int = SCROLL_PAGE) -> Dict:
+    """
+    컬렉션을 스크롤하며 벡터는 .npy memmap에, payload는 Parquet row group으로 바로 기록.
+    페이지 단위로만 메모리에 올리므로 컬렉션 크기와 무관하게 메모리 사용량이 일정하다.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+
+    params = _vector_params(collection_name)
+    dim = params.size
+    # 시작 시점 개수로 파일 크기를 고정 (이후 추가된 포인트는 이번 스냅샷에 포함하지 않음)
+    expected = qdrant.client.count(collection_name=collection_name, exact=True).count
+
+    ids_mm = np.lib.format.open_memmap(out / IDS_FILE, mode="w+", dtype=np.int64, shape=(expected,))
+    vec_mm = np.lib.format.open_memmap(out / VECTORS_FILE, mode="w+", dtype=np.float32, shape=(expected, dim))
+    writer = pq.ParquetWriter(out / PAYLOADS_FILE, PAYLOAD_SCHEMA)
+
+    n = 0
+    offset = None
+    try:
+        while n < expected:
+            points, offset = qdrant.scroll_points(
+                collection_name, limit=min(page_size, expected - n), offset=offset, with_vectors=True
+            )
+            if not points:
+                break
+            k = len(points)
+            ids = [int(p.id) for p in points]
+            ids_mm[n:n + k] = ids
+            vec_mm[n:n + k] = np.asarray([qdrant.full_vector(p) for p in points], dtype=np.float32)
+            writer.write_table(_payload_table(ids, [p.payload or {} for p in points]))
+            n += k
+            if offset is None:
+                break
+    finally:
+        writer.close()
+        ids_mm.flush()
+        vec_mm.flush()
+        del ids_mm, vec_mm
+
+    manifest = {
+        "collection": collection_name,
+        "count": n,  # 스크롤 도중 삭제가 있으면 expected보다 작을 수 있음 → 로더가 [:count]로 자름
+        "dim": dim,
+        "distance": str(params.distance.value if hasattr(params.distance, "value") else params.distance),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "files": SNAPSHOT_FILES,
+    }
+    (out / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"snapshot exported: {n} points, dim={dim} → {out} ({time.perf_counter() - t0:.1f}s)")
+    return manifest
+
+
+@dataclass
+class Snapshot:
+    manifest: Dict
+    ids: np.ndarray        # memmap (읽기 전용)
+    vectors: np.ndarray    # memmap (읽기 전용), float32 (n, dim)
+    payload_path: Path
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def payloads(self, columns: Optional[List[str]] = None) -> pa.Table:
+        """Parquet payload를 (필요한 컬럼만) 읽어 Arrow Table로 반환."""
+        return pq.read_table(self.payload_path, columns=columns)
+
+    def iter_payloads(self, batch_size: int = RESTORE_BATCH) -> Iterator[Dict]:
+        """원본 payload dict를 순서대로 스트리밍 (전체를 메모리에 올리지 않음)."""
+        for batch in pq.ParquetFile(self.payload_path).iter_batches(batch_size=batch_size, columns=["payload_json"]):
+            for s in batch.column(0).to_pylist():
+                yield json.loads(s)
+
+
+def load_snapshot(snapshot_dir: str | Path) -> Snapshot:
+    """스냅샷을 memmap으로 로드 (벡터 데이터 복사 없음)."""
+    src = Path(snapshot_dir)
+    manifest = json.loads((src / MANIFEST).read_text(encoding="utf-8"))
+    n = manifest["count"]
+    ids = np.load(src / IDS_FILE, mmap_mode="r")[:n]
+    vectors = np.load(src / VECTORS_FILE, mmap_mode="r")[:n]
+    return Snapshot(manifest=manifest, ids=ids, vectors=vectors, payload_path=src / PAYLOADS_FILE)
+
+
+def upload_snapshot(snapshot_dir: str | Path, prefix: Optional[str] = None, store=None) -> str:
+    """스냅샷 파일들을 MinIO(또는 로컬 대체 저장소)에 멀티파트 업로드. 업로드한 prefix 반환."""
+    src = Path(snapshot_dir)
+    manifest = json.loads((src / MANIFEST).read_text(encoding="utf-8"))
+    if prefix is None:
+        stamp = manifest["created_at"].replace(":", "").replace("-", "")[:15]
+        prefix = f"snapshots/{manifest['collection']}/{stamp}"
+    store = store or get_object_store()
+    # manifest를 마지막에 올려서, manifest가 보이면 나머지 파일은 완성된 상태가 되도록 함
+    for name in [IDS_FILE, VECTORS_FILE, PAYLOADS_FILE, MANIFEST]:
+        store.upload_file(f"{prefix}/{name}", src / name)
+    print(f"snapshot uploaded → {prefix}")
+    return prefix
+
+def download_snapshot(prefix: str, out_dir: str | Path, store=None) -> Path:
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    store = store or get_object_store()
+    for name in SNAPSHOT_FILES:
+        store.download_file(f"{prefix}/{name}", out / name)
+    return out
+
+
+def _iter_vectors(vectors: np.ndarray, batch_size: int):
+    """
+    압축 레이아웃이 아니면 memmap 그대로, 압축 레이아웃이면 배치 단위로 compact를 투영해
+    포인트별 {full, compact} 벡터를 흘려보낸다 (전체 투영 결과를 메모리에 두지 않음).
+    """
+    if not settings.COMPACT_VECTOR:
+        return vectors
+    def gen():
+        for s in range(0, len(vectors), batch_size):
+            stored = qdrant.storage_vectors(vectors[s:s + batch_size])
+            for i in range(len(stored[qdrant.FULL_VECTOR])):
+                yield {name: v[i].tolist() for name, v in stored.items()}
+    return gen()
+
+def restore_snapshot(snapshot_dir: str | Path, collection_name: str, batch_size: int = RESTORE_BATCH) -> int:
+    """
+    스냅샷 벡터/페이로드로 컬렉션을 재구성 (임베딩 모델 호출 없음).
+    memmap을 배치 단위로 잘라 업로드하므로 전체 벡터를 메모리에 올리지 않는다.
+    """
+    snap = load_snapshot(snapshot_dir)
+    if snap.manifest["dim"] != qdrant.VECTOR_SIZE:
+        raise ValueError(f"스냅샷 차원({snap.manifest['dim']})이 VECTOR_SIZE({qdrant.VECTOR_SIZE})와 다릅니다.")
+    qdrant.initialize_qdrant(collection_name)
+    t0 = time.perf_counter()
+    qdrant.client.upload_collection(
+        collection_name=collection_name,
+        vectors=_iter_vectors(snap.vectors, batch_size),
+        payload=snap.iter_payloads(batch_size),
+        ids=(int(i) for i in snap.ids),
+        batch_size=batch_size,
+        wait=True,
+    )
+    print(f"snapshot restored: {len(snap)} points → '{collection_name}' ({time.perf_counter() - t0:.1f}s)")
+    return len(snap)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export")
+    ex.add_argument("--collection", default=settings.QDRANT_COLLECTION)
+    ex.add_argument("--out", required=True)
+    ex.add_argument("--page-size", type=int, default=SCROLL_PAGE)
+    ex.add_argument("--upload", action="store_true", help="내보낸 뒤 MinIO로 업로드")
+    rs = sub.add_parser("restore")
+    rs.add_argument("--src", required=True, help="로컬 스냅샷 디렉터리")
+    rs.add_argument("--prefix", help="지정하면 MinIO에서 먼저 내려받음")
+    rs.add_argument("--collection", required=True)
+    args = ap.parse_args()
+
+    if args.cmd == "export":
+        export_snapshot(args.out, args.collection, page_size=args.page_size)
+        if args.upload:
+            upload_snapshot(args.out)
+    else:
+        if args.prefix:
+            download_snapshot(args.prefix, args.src)
+        restore_snapshot(args.src, args.collection)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# workers/topic_cluster.py
+"""
+저장된 임베딩으로 토픽 클러스터링 → Qdrant payload에 cluster_id 기록.
+
+- 전체 실행: 스냅샷(연속 float32 memmap)으로 벡터를 읽어 mini-batch k-means 학습,
+             대표 제목으로 라벨링, cluster_id를 묶음 set_payload로 기록, 모델 저장
+- 증분 실행: cluster_id가 없는 포인트만 스크롤해 기존 센트로이드에 할당 (+ 센트로이드 미세 갱신)
+
+실행:
+    python -m workers.topic_cluster full [--k 30] [--snapshot snapshots/feedback_current]
+    python -m workers.topic_cluster incremental
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import argparse
+import json
+import tempfile
+import time
+
+import numpy as np
+from qdrant_client import models
+
+from core.config import settings
+from infra import qdrant
+from workers.clustering import MiniBatchKMeans, label_clusters
+from workers.snapshot import SCROLL_PAGE, export_snapshot, load_snapshot
+
+CENTROIDS_FILE = "centroids.npy"
+COUNTS_FILE = "counts.npy"
+CLUSTERS_FILE = "clusters.json"
+
+
+# ------------------------------------------------------------
+# 모델 저장/로드
+# ------------------------------------------------------------
+def save_model(km: MiniBatchKMeans, clusters: Dict[int, Dict], meta: Dict, model_dir: str | Path = settings.CLUSTER_MODEL_DIR) -> None:
+    out = Path(model_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / CENTROIDS_FILE, km.centroids)
+    np.save(out / COUNTS_FILE, km.counts)
+    doc = {"meta": meta, "clusters": {str(c): info for c, info in clusters.items()}}
+    (out / CLUSTERS_FILE).write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def load_clusters(model_dir: str | Path = settings.CLUSTER_MODEL_DIR) -> Tuple[Dict, Dict[int, Dict]]:
+    """(meta, {cluster_id: 라벨 정보}) 반환. 모델이 없으면 ({}, {})."""
+    path = Path(model_dir) / CLUSTERS_FILE
+    if not path.exists():
+        return {}, {}
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    return doc["meta"], {int(c): info for c, info in doc["clusters"].items()}
+
+def load_model(model_dir: str | Path = settings.CLUSTER_MODEL_DIR) -> Tuple[MiniBatchKMeans, Dict, Dict[int, Dict]]:
+    src = Path(model_dir)
+    km = MiniBatchKMeans.from_state(np.load(src / CENTROIDS_FILE), np.load(src / COUNTS_FILE))
+    meta, clusters = load_clusters(src)
+    return km, meta, clusters
+
+
+# ------------------------------------------------------------
+# Qdrant 기록
+# ------------------------------------------------------------
+def write_cluster_ids(ids: np.ndarray, labels: np.ndarray, collection_name: str) -> None:
+    """cluster_id별로 포인트 id를 묶어 set_payload (포인트 수가 아니라 클러스터 수만큼의 연산)."""
+    ids_by_value = {int(c): ids[labels == c].tolist() for c in np.unique(labels)}
+    qdrant.set_payload_by_value("cluster_id", ids_by_value, collection_name=collection_name)
+
+# 토픽 추이(/insights/topics)에 필요한 payload 인덱스: cluster_id facet + updated_at 기간 필터
+CLUSTER_INDEXES = {
+    "cluster_id": models.PayloadSchemaType.INTEGER,
+    "updated_at": models.PayloadSchemaType.DATETIME,
+}
+
+def ensure_cluster_index(collection_name: str) -> None:
+    """
+    기존 컬렉션에도 cluster_id / updated_at 인덱스 보장 (initialize_qdrant는 새 컬렉션에만 만들기 때문).
+    이미 있으면 무시됨.
+    """
+    for field, schema in CLUSTER_INDEXES.items():
+        qdrant.client.create_payload_index(collection_name=collection_name, field_name=field, field_schema=schema)
+
+
+# ------------------------------------------------------------
+# 실행
+# ------------------------------------------------------------
+def run_full(k: int = settings.TOPIC_CLUSTERS, snapshot_dir: Optional[str] = None,
+             collection_name: str = settings.QDRANT_COLLECTION, model_dir: str = settings.CLUSTER_MODEL_DIR) -> Dict[int, Dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        if snapshot_dir is None:
+            snapshot_dir = str(Path(tmp) / "snapshot")
+            export_snapshot(snapshot_dir, collection_name)
+        snap = load_snapshot(snapshot_dir)
+        print(f"vectors loaded: {snap.vectors.shape}")
+
+        t0 = time.perf_counter()
+        km = MiniBatchKMeans(n_clusters=k).fit(snap.vectors)
+        labels, scores = km.predict(snap.vectors)
+        print(f"clustering done: k={len(km.centroids)} ({time.perf_counter() - t0:.1f}s)")
+
+        titles = snap.payloads(["title"]).column("title").to_pylist()
+        clusters = label_clusters(labels, scores, titles, snap.ids, n_clusters=len(km.centroids))
+
+        ensure_cluster_index(collection_name)
+        write_cluster_ids(np.asarray(snap.ids), labels, collection_name)
+
+    now = datetime.now(timezone.utc).isoformat()
+    meta = {"collection": collection_name, "k": len(km.centroids), "embedding_version": settings.EMBEDDING_VERSION,
+            "created_at": now, "updated_at": now, "points": int(len(labels))}
+    save_model(km, clusters, meta, model_dir)
+    for c, info in sorted(clusters.items(), key=lambda kv: -kv[1]["size"])[:10]:
+        print(f"  cluster {c:>3}  size={info['size']:<6} {info['label']}")
+    return clusters
+
+def run_incremental(collection_name: str = settings.QDRANT_COLLECTION, model_dir: str = settings.CLUSTER_MODEL_DIR,
+                    page_size: int = SCROLL_PAGE) -> int:
+    """cluster_id가 없는 포인트만 기존 센트로이드에 할당. 처리한 포인트 수 반환."""
+    km, meta, clusters = load_model(model_dir)
+    ensure_cluster_index(collection_name)
+    no_cluster = models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="cluster_id"))])
+
+    total = 0
+    offset = None
+    while True:
+        points, offset = qdrant.scroll_points(
+            collection_name, flt=no_cluster, limit=page_size, offset=offset, with_payload=False, with_vectors=True
+        )
+        if not points:
+            break
+        ids = np.asarray([int(p.id) for p in points], dtype=np.int64)
+        x = np.asarray([qdrant.full_vector(p) for p in points], dtype=np.float32)
+        labels, _ = km.predict(x)
+        km.partial_fit(x)    # 새 데이터 쪽으로 센트로이드를 조금씩 이동
+        write_cluster_ids(ids, labels, collection_name)
+        for c, n in zip(*np.unique(labels, return_counts=True)):
+            clusters.setdefault(int(c), {"size": 0, "label": "", "keywords": [], "representatives": []})
+            clusters[int(c)]["size"] += int(n)
+        total += len(points)
+        print(f"assigned so far: {total}")
+        if offset is None:
+            break
+
+    meta["updated_at"] = datetime.now(timezone.utc).isoformat()
+    meta["points"] = int(meta.get("points", 0)) + total
+    save_model(km, clusters, meta, model_dir)
+    print(f"done. newly assigned: {total}")
+    return total
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    full = sub.add_parser("full")
+    full.add_argument("--k", type=int, default=settings.TOPIC_CLUSTERS)
+    full.add_argument("--snapshot", help="이미 내보낸 스냅샷 디렉터리 (없으면 새로 export)")
+    full.add_argument("--collection", default=settings.QDRANT_COLLECTION)
+    inc = sub.add_parser("incremental")
+    inc.add_argument("--collection", default=settings.QDRANT_COLLECTION)
+    args = ap.parse_args()
+
+    if args.cmd == "full":
+        run_full(args.k, args.snapshot, args.collection)
+    else:
+        run_incremental(args.collection)
+
+
+if __name__ == "__main__":
+    main()